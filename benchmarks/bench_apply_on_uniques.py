@@ -0,0 +1,89 @@
+"""
+Compares the formatters on per-row Series.apply with utils.apply_on_uniques.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_apply_on_uniques.py [row_count]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from app.core import fam_formatter, tm_formatter, utils
+
+def per_row_apply(column: pd.Series, function) -> pd.Series:
+    """The previous implementation of every formatter."""
+    return column.apply(function)
+
+def build_columns(row_count: int, seed: int = 0) -> dict:
+    """Delivery-like columns: a few hundred to a few thousand distinct values, some missing."""
+    rng = np.random.default_rng(seed)
+
+    def pick(values, missing_share: float = 0.05) -> pd.Series:
+        values = np.asarray(values, dtype=object)
+        column = values[rng.integers(0, len(values), row_count)]
+        column[rng.random(row_count) < missing_share] = None
+        return pd.Series(column)
+
+    streets = [f"{name}strasse {number}{suffix}" for name in ["Haupt", "Bahnhof", "Linden", "Kirch", "Garten"]
+               for number in range(1, 200) for suffix in ["", "a", "b"]]
+
+    return {
+        "doctor_title": pick(["Dr. med.", "Prof. Dr.", "Dr. Dr.", "PD Dr. med.", "", "Dipl.-Med."]),
+        "first_name": pick([f"vorname{index}" for index in range(2_000)]),
+        "street": pick(streets),
+        "city": pick([f"stadt {index}" for index in range(1_500)]),
+        "postcode": pick([f"{index:05d}" for index in range(1_000, 9_000)]),
+        "pharmacy_name": pick([f"Apotheke {index} e.K. Inh. Muster" for index in range(3_000)]),
+        "am_name": pick([f"wirkstoff {index} mg" for index in range(800)]),
+    }
+
+FORMATTERS = {
+    "doctor_title": fam_formatter.validate_doctor_title_column,
+    "first_name": utils.format_and_clean_name_column,
+    "street": utils.validate_street_column,
+    "city": utils.validate_city_column,
+    "postcode": utils.validate_plz_column,
+    "pharmacy_name": fam_formatter.format_pharmacy_name_column,
+    "am_name": tm_formatter.validate_tm_medicine_name_column,
+}
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    columns = build_columns(row_count)
+
+    print(f"rows: {row_count:,}")
+
+    total_apply = total_uniques = 0.0
+
+    for column_name, formatter in FORMATTERS.items():
+        column = columns[column_name]
+
+        uniques_seconds, uniques_result = measure(lambda: formatter(column))
+
+        apply_on_uniques = utils.apply_on_uniques
+        utils.apply_on_uniques = per_row_apply
+        try:
+            apply_seconds, apply_result = measure(lambda: formatter(column))
+        finally:
+            utils.apply_on_uniques = apply_on_uniques
+
+        pd.testing.assert_series_equal(uniques_result, apply_result)
+
+        total_apply += apply_seconds
+        total_uniques += uniques_seconds
+        print(
+            f"{column_name:<15} distinct: {column.nunique():>6,}   Series.apply: {apply_seconds:6.3f}s   "
+            f"apply_on_uniques: {uniques_seconds:6.3f}s ({apply_seconds / uniques_seconds:5.1f}x)"
+        )
+
+    print(f"{'total':<31} Series.apply: {total_apply:6.3f}s   apply_on_uniques: {total_uniques:6.3f}s "
+          f"({total_apply / total_uniques:5.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares KVResolver.check_bsnr_consistency with a per-row check through the lookup dicts.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_bsnr_consistency.py [row_count]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from app.core.KVResolver import get_kv_resolver
+
+def per_row_district_matches(kv_resolver, bs_nrs: pd.Series, kv_districts: pd.Series) -> list:
+    """BSNR prefix against the KV district name, one row at a time."""
+    results = []
+    for bs_nr, kv_district in zip(bs_nrs, kv_districts):
+        bsnr_code = kv_resolver.BSNR_PREFIX_TO_KV_CODE.get(str(bs_nr).zfill(9)[:2]) if pd.notna(bs_nr) else None
+        district_code = kv_resolver.KV_NAME_TO_CODE_MAP.get(kv_district)
+        results.append(pd.NA if bsnr_code is None or district_code is None else bsnr_code == district_code)
+    return results
+
+def build_columns(kv_resolver, row_count: int, seed: int = 0) -> tuple:
+    """BSNRs as text drawn from a pool of practices, KV districts by name and known postcodes."""
+    rng = np.random.default_rng(seed)
+
+    # A FAM delivery names far fewer practices than prescriptions.
+    prefixes = list(kv_resolver.BSNR_PREFIX_TO_KV_CODE.keys()) + ["99"]
+    practices = np.array(
+        [f"{prefixes[prefix]}{number:07d}" for prefix, number in
+         zip(rng.integers(0, len(prefixes), 50_000), rng.integers(0, 10_000_000, 50_000))],
+        dtype=object
+    )
+    bs_nrs = practices[rng.integers(0, len(practices), row_count)]
+    bs_nrs[rng.random(row_count) < 0.02] = None
+
+    names = np.array(list(kv_resolver.KV_NAME_TO_CODE_MAP.keys()) + [None], dtype=object)
+    kv_districts = names[rng.integers(0, len(names), row_count)]
+
+    known_postcodes = np.flatnonzero(kv_resolver.plz_kv_index[:-1])
+    postcodes = pd.Series(known_postcodes[rng.integers(0, len(known_postcodes), row_count)]).astype(str).str.zfill(5)
+
+    return pd.Series(bs_nrs), postcodes, pd.Series(kv_districts)
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    kv_resolver = get_kv_resolver()
+    bs_nrs, postcodes, kv_districts = build_columns(kv_resolver, row_count)
+
+    vectorized_seconds, consistency = measure(
+        lambda: kv_resolver.check_bsnr_consistency(bs_nrs, postcodes, kv_districts)
+    )
+    per_row_seconds, per_row_result = measure(lambda: per_row_district_matches(kv_resolver, bs_nrs, kv_districts))
+
+    assert consistency["district_matches"].tolist() == per_row_result
+
+    print(f"rows: {row_count:,}")
+    print(
+        f"per row (district only): {per_row_seconds:6.3f}s   "
+        f"vectorized (district and PLZ): {vectorized_seconds:6.3f}s ({per_row_seconds / vectorized_seconds:5.1f}x)"
+    )
+    print(f"district mismatches: {int((~consistency['district_matches'].fillna(True)).sum()):,}   "
+          f"PLZ mismatches: {int((~consistency['plz_matches'].fillna(True)).sum()):,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compares process_charges_and_positions with the previous per-group implementation
+on a synthetic TM sheet.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_charges_positions.py [prescription_count]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from app.core import utils
+
+def per_group_process_charges_and_positions(tm_df: pd.DataFrame) -> pd.DataFrame:
+    """The previous implementation."""
+    def _calculate_charges_for_group(group: pd.DataFrame) -> pd.DataFrame:
+        pzn_list = group['pzn'].tolist()
+        block_length = 0
+
+        if len(pzn_list) < 2:
+            block_length = 1
+        else:
+            first_pzn = pzn_list[0]
+            try:
+                next_occurrence_index = pzn_list[1:].index(first_pzn)
+                block_length = next_occurrence_index + 1
+            except ValueError:
+                block_length = len(pzn_list)
+
+        indices = np.arange(len(group))
+        group['charge_nr'] = (indices // block_length) + 1
+        return group
+
+    df = tm_df.copy()
+
+    processed_groups = []
+    for name, group in df.groupby('vo_id'):
+        processed_group = _calculate_charges_for_group(group.copy())
+        processed_groups.append(processed_group)
+
+    if not processed_groups:
+        return pd.DataFrame(columns=df.columns)
+
+    df = pd.concat(processed_groups)
+
+    df.drop_duplicates(subset=['vo_id', 'charge_nr', 'pzn'], keep='first', inplace=True)
+
+    df['position'] = df.groupby(['vo_id', 'charge_nr']).cumcount() + 1
+
+    return df
+
+def build_tm_sheet(prescription_count: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Parenteral prescriptions of 1-8 ingredients in 1-5 charges each, in random vo_id order.
+    Some charges repeat an ingredient, some end early, and some rows have no vo_id.
+    """
+    rng = np.random.default_rng(seed)
+    pzn_pool = np.array([f"{number:08d}" for number in rng.integers(1_000_000, 20_000_000, 3_000)], dtype=object)
+
+    ingredient_counts = rng.integers(1, 9, prescription_count)
+    charge_counts = rng.integers(1, 6, prescription_count)
+    vo_numbers = rng.permutation(prescription_count)
+
+    vo_ids, pzns = [], []
+    for vo_number, ingredient_count, charge_count in zip(vo_numbers, ingredient_counts, charge_counts):
+        ingredients = list(rng.choice(pzn_pool, ingredient_count, replace=False))
+        if ingredient_count > 2 and rng.random() < 0.1:
+            ingredients.insert(2, ingredients[1])
+        rows = ingredients * charge_count
+        if rng.random() < 0.1:
+            rows = rows[:-1]
+        vo_ids.extend([f"VO{vo_number:09d}"] * len(rows))
+        pzns.extend(rows)
+
+    tm_df = pd.DataFrame({
+        "vo_id": pd.Series(vo_ids, dtype=object),
+        "charge_nr": 0,
+        "position": 0,
+        "pzn": pd.Series(pzns, dtype=object),
+        "am_name": "Glucose 5%",
+    })
+    tm_df.loc[rng.random(len(tm_df)) < 0.001, "vo_id"] = None
+
+    return tm_df
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    prescription_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    tm_df = build_tm_sheet(prescription_count)
+
+    vectorized_seconds, vectorized_result = measure(lambda: utils.process_charges_and_positions(tm_df))
+    per_group_seconds, per_group_result = measure(lambda: per_group_process_charges_and_positions(tm_df))
+
+    pd.testing.assert_frame_equal(vectorized_result, per_group_result)
+
+    print(f"prescriptions: {prescription_count:,}   rows: {len(tm_df):,}")
+    print(
+        f"per group: {per_group_seconds:7.3f}s   vectorized: {vectorized_seconds:6.3f}s "
+        f"({per_group_seconds / vectorized_seconds:5.1f}x)"
+    )
+
+if __name__ == "__main__":
+    main()
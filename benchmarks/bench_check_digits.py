@@ -0,0 +1,50 @@
+"""
+Times the PZN and LANR check-digit validation on a FAM-sized frame.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_check_digits.py [row_count]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from app.core import utils
+from app.core.data_rejection import REJECTION_CRITERIA_CHECK_DIGITS_FAM
+
+def build_frame(row_count: int, seed: int = 0) -> pd.DataFrame:
+    """PZNs as text with leading zeros and LANRs as text, both with a share of missing values."""
+    rng = np.random.default_rng(seed)
+
+    pzns = np.array([f"{number:08d}" for number in rng.integers(1, 20_000_000, 50_000)], dtype=object)
+    lanrs = np.array([f"{number:09d}" for number in rng.integers(1, 999_999_999, 100_000)], dtype=object)
+
+    frame = pd.DataFrame({
+        "pzn": pzns[rng.integers(0, len(pzns), row_count)],
+        "lanr": lanrs[rng.integers(0, len(lanrs), row_count)],
+    })
+    frame.loc[rng.random(row_count) < 0.02, "lanr"] = None
+
+    return frame
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    frame = build_frame(row_count)
+
+    print(f"rows: {row_count:,}")
+
+    for column_name, check in (("pzn", utils.check_pzn_check_digits), ("lanr", utils.check_lanr_check_digits)):
+        seconds, result = measure(lambda: check(frame[column_name]))
+        print(f"{column_name:<5} {seconds:6.3f}s   valid: {result.sum():>9,}   invalid: {(~result).sum():>9,}")
+
+    for reason, condition_func in REJECTION_CRITERIA_CHECK_DIGITS_FAM.items():
+        seconds, mask = measure(lambda: condition_func(frame))
+        print(f"{reason:<36} {seconds:6.3f}s   rejected: {mask.sum():>9,}")
+
+if __name__ == "__main__":
+    main()
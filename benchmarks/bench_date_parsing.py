@@ -0,0 +1,73 @@
+"""
+Compares validate_prescription_date_column with the previous implementation,
+which tried dd.mm.yyyy and then inferred every other row with dateutil.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_date_parsing.py [row_count]
+"""
+import sys
+import time
+import warnings
+import numpy as np
+import pandas as pd
+
+from app.core import fam_formatter
+
+def previous_validate_prescription_date_column(date_column: pd.Series) -> pd.Series:
+    """The previous implementation."""
+    parsed_dates = pd.to_datetime(date_column, format='%d.%m.%Y', errors='coerce')
+
+    failed_mask = parsed_dates.isna()
+    if failed_mask.any():
+        parsed_dates.loc[failed_mask] = pd.to_datetime(
+            date_column[failed_mask], errors='coerce', dayfirst=True
+        )
+
+    today = pd.Timestamp.now()
+    two_years_ago = today - pd.DateOffset(years=2)
+    parsed_dates.loc[(parsed_dates < two_years_ago) | (parsed_dates > today)] = pd.NaT
+
+    formatted_dates = parsed_dates.dt.strftime('%d.%m.%Y')
+
+    return formatted_dates.where(pd.notna(formatted_dates), None)
+
+def build_columns(row_count: int, seed: int = 0) -> dict:
+    """Prescription dates of the last three years, in one format and in a mix of formats."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp.now().normalize() - pd.to_timedelta(rng.integers(0, 3 * 365, row_count), unit="D")
+
+    dotted = pd.Series(dates.strftime("%d.%m.%Y"), dtype=object)
+    dotted[rng.random(row_count) < 0.02] = None
+
+    formats = rng.choice(["%d.%m.%Y", "%Y%m%d", "%Y-%m-%d %H:%M:%S", "%d.%m.%y"], row_count, p=[0.6, 0.2, 0.15, 0.05])
+    mixed = pd.Series([date.strftime(date_format) for date, date_format in zip(dates, formats)], dtype=object)
+    mixed[rng.random(row_count) < 0.01] = "k.A."
+
+    return {"dd.mm.yyyy": dotted, "mixed": mixed}
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    columns = build_columns(row_count)
+
+    print(f"rows: {row_count:,}")
+
+    for column_name, column in columns.items():
+        engine_seconds, engine_result = measure(lambda: fam_formatter.validate_prescription_date_column(column))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            previous_seconds, previous_result = measure(lambda: previous_validate_prescription_date_column(column))
+
+        pd.testing.assert_series_equal(engine_result, previous_result)
+
+        print(
+            f"{column_name:<11} previous: {previous_seconds:7.3f}s   "
+            f"format groups: {engine_seconds:6.3f}s ({previous_seconds / engine_seconds:6.1f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares KeywordStripper with the previous alternation of all keywords in list order.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_keyword_stripper.py [distinct_count]
+"""
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from app.core import fam_formatter, utils
+
+def alternation_strip(values: list, keywords: list) -> list:
+    """The previous matching: one alternation in list order, run per value."""
+    pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+    return [" ".join(re.sub(pattern, '', value, flags=re.IGNORECASE).split()).strip(' ,-') for value in values]
+
+def build_values(keywords: list, distinct_count: int, seed: int = 0) -> list:
+    """Names with one or two keywords mixed in, as in the pharmacy and BS name columns."""
+    rng = np.random.default_rng(seed)
+    words = ["Apotheke", "am", "Markt", "Stern", "Praxis", "Gemeinschaft", "Nord", "Süd", "Zentrum", "Linden"]
+
+    return [
+        " ".join(list(rng.choice(words, 3)) + list(rng.choice(keywords, rng.integers(1, 3)))) + f" {index}"
+        for index in range(distinct_count)
+    ]
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    distinct_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    # A large list, e.g. legal forms and junk values collected over many deliveries.
+    rng = np.random.default_rng(1)
+    large_keywords = sorted({
+        "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz.- "), rng.integers(4, 12))).strip() + "Kw"
+        for _ in range(2_000)
+    })
+
+    keyword_lists = {
+        "BS_NAME_KEYWORDS": fam_formatter.BS_NAME_KEYWORDS,
+        "PHARMACY_NAME_KEYWORDS": fam_formatter.PHARMACY_NAME_KEYWORDS,
+        "2,000 keywords": large_keywords,
+    }
+
+    print(f"distinct values: {distinct_count:,}")
+
+    for list_name, keywords in keyword_lists.items():
+        values = build_values(keywords, distinct_count)
+        stripper = utils.KeywordStripper(keywords)
+
+        trie_seconds, _ = measure(lambda: [stripper.strip(value) for value in values])
+        alternation_seconds, _ = measure(lambda: alternation_strip(values, keywords))
+
+        print(
+            f"{list_name:<24} alternation: {alternation_seconds:6.3f}s   "
+            f"trie: {trie_seconds:6.3f}s ({alternation_seconds / trie_seconds:5.1f}x)"
+        )
+
+    column = pd.Series(build_values(fam_formatter.BS_NAME_KEYWORDS, 5_000)).sample(1_000_000, replace=True, random_state=0)
+    column_seconds, _ = measure(lambda: fam_formatter.format_bs_name_column(column))
+    print(f"format_bs_name_column, 1,000,000 rows / 5,000 distinct: {column_seconds:6.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares the dict-based KV resolution with the array index of KVResolver.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_kv_resolver.py [row_count]
+"""
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from app.core.KVResolver import KVResolver
+
+ASSET_PATH = Path(__file__).resolve().parent.parent / "assets" / "plz_kv_mapping.xlsx"
+
+def resolve_with_dict(kv_resolver: KVResolver, arzt_postcode_column: pd.Series, kv_district_column: pd.Series) -> pd.Series:
+    """The previous implementation: Series.map on the name dict and the PLZ dict."""
+    resolved_series = kv_district_column.map(kv_resolver.KV_NAME_TO_CODE_MAP)
+    fallback_series = arzt_postcode_column.map(kv_resolver.plz_to_kv_code_map)
+    return resolved_series.fillna(fallback_series)
+
+def build_input(kv_resolver: KVResolver, row_count: int, seed: int = 0):
+    """Random postcodes (mostly known ones) and KV names, a third of them missing."""
+    rng = np.random.default_rng(seed)
+
+    known_postcodes = np.array(list(kv_resolver.plz_to_kv_code_map.keys()), dtype=object)
+    postcodes = known_postcodes[rng.integers(0, len(known_postcodes), row_count)]
+    unknown = rng.random(row_count) < 0.05
+    postcodes[unknown] = rng.integers(0, 100_000, unknown.sum()).astype(str)
+
+    names = np.array(list(kv_resolver.KV_NAME_TO_CODE_MAP.keys()) + ["Oberpfalz"], dtype=object)
+    kv_districts = names[rng.integers(0, len(names), row_count)]
+    kv_districts[rng.random(row_count) < 0.33] = None
+
+    return pd.Series(postcodes), pd.Series(kv_districts)
+
+def measure(function, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    kv_resolver = KVResolver(ASSET_PATH)
+    postcodes, kv_districts = build_input(kv_resolver, row_count)
+
+    dict_result = resolve_with_dict(kv_resolver, postcodes, kv_districts)
+    array_result = kv_resolver.resolve_kv_column(postcodes, kv_districts)
+    pd.testing.assert_series_equal(dict_result.astype(object), array_result, check_names=False)
+
+    print(f"rows: {row_count:,}")
+
+    # The dict is keyed by text, so for integer postcodes it gets the text column (conversion not timed).
+    inputs = {
+        "text": (postcodes, kv_districts, postcodes),
+        "categorical": (postcodes.astype("category"), kv_districts.astype("category"), postcodes.astype("category")),
+        "integer": (postcodes.astype(np.int64), kv_districts, postcodes),
+    }
+
+    for input_name, (postcode_column, kv_district_column, dict_postcode_column) in inputs.items():
+        dict_seconds = measure(lambda: resolve_with_dict(kv_resolver, dict_postcode_column, kv_district_column))
+        array_seconds = measure(lambda: kv_resolver.resolve_kv_column(postcode_column, kv_district_column))
+
+        print(
+            f"{input_name:<12} dict path: {dict_seconds:.3f}s   "
+            f"array index: {array_seconds:.3f}s ({dict_seconds / array_seconds:.1f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compares validate_medicine_price_column with the previous per-row implementation.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_medicine_price.py [row_count]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from app.core import fam_formatter
+
+def per_row_validate_medicine_price(medicine_price: pd.Series) -> pd.Series:
+    """The previous implementation."""
+    def validate_medicine_price(medicine_price):
+        if pd.isna(medicine_price):
+            return None
+
+        price_str = str(medicine_price).replace('€', '').strip()
+        price_str = price_str.replace('.', '').replace(',', '.')
+
+        try:
+            price_float = float(price_str)
+            return price_float if price_float > 0 else None
+        except (ValueError, TypeError):
+            return None
+
+    return medicine_price.apply(validate_medicine_price)
+
+def build_columns(row_count: int, seed: int = 0) -> dict:
+    """Price columns as text from a CSV/text import and as numbers from read_excel(decimal=',')."""
+    rng = np.random.default_rng(seed)
+
+    cents = rng.integers(-500, 2_000_000, row_count)
+    text = np.array([f"{cent / 100:,.2f}".replace(",", "#").replace(".", ",").replace("#", ".") for cent in cents],
+                    dtype=object)
+    text[rng.random(row_count) < 0.1] += " €"
+    text[rng.random(row_count) < 0.02] = None
+    text[rng.random(row_count) < 0.01] = "k.A."
+
+    numbers = cents / 100
+    numbers[rng.random(row_count) < 0.02] = np.nan
+
+    return {"text": pd.Series(text), "numeric": pd.Series(numbers)}
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    columns = build_columns(row_count)
+
+    print(f"rows: {row_count:,}")
+
+    for column_name, column in columns.items():
+        vectorized_seconds, vectorized_result = measure(lambda: fam_formatter.validate_medicine_price_column(column))
+        per_row_seconds, per_row_result = measure(lambda: per_row_validate_medicine_price(column))
+
+        # The per-row version read numbers through str() and dropped their decimal point.
+        if column_name == "text":
+            pd.testing.assert_series_equal(vectorized_result, per_row_result)
+
+        print(
+            f"{column_name:<8} distinct: {column.nunique():>9,}   per row: {per_row_seconds:6.3f}s   "
+            f"vectorized: {vectorized_seconds:6.3f}s ({per_row_seconds / vectorized_seconds:5.1f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
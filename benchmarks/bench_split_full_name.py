@@ -0,0 +1,94 @@
+"""
+Compares split_full_name_column with applying the previous split_full_name, which ran HumanName on every row.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_split_full_name.py [row_count]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from nameparser import HumanName
+
+from app.core import fam_formatter
+
+def per_row_split_full_name(full_name) -> dict:
+    """The previous split_full_name: every name that is no organization goes through HumanName."""
+    result = {"title": "", "first_name": "", "last_name": ""}
+
+    if pd.isna(full_name) or not str(full_name).strip():
+        return result
+
+    name_str = " ".join(str(full_name).split())
+
+    if any(keyword in name_str.lower() for keyword in fam_formatter.ORGANIZATION_KEYWORDS):
+        return {"title": None, "first_name": None, "last_name": None}
+
+    title_parts = []
+    name_words = []
+    parsing_title = True
+    for word in name_str.split():
+        if word.lower().replace('.', '') in fam_formatter.TITLE_KEYWORDS and parsing_title:
+            title_parts.append(word)
+        else:
+            parsing_title = False
+            name_words.append(word)
+
+    title = " ".join(title_parts)
+    remaining_name = " ".join(name_words)
+
+    if not title and len(name_words) == 2 and ',' not in name_str:
+        remaining_name = name_words[0] + ", " + name_words[1]
+
+    if not remaining_name:
+        result["title"] = title
+        return result
+
+    name = HumanName(remaining_name)
+    return {"title": title, "first_name": " ".join([name.first, name.middle]).strip(), "last_name": name.last}
+
+def build_column(row_count: int, distinct_count: int = 10_000, seed: int = 0) -> pd.Series:
+    """Doctor names in the shapes of the FAM deliveries, drawn from a pool of distinct names."""
+    rng = np.random.default_rng(seed)
+
+    first_names = ["Anna", "Hans", "Jürgen", "Karl-Heinz", "Özlem", "Maria", "Peter", "Ulrike", "Omar", "Eva"]
+    last_names = ["Müller", "Schmidt", "Zech", "Meyer", "Yilmaz", "Nguyen", "Koch", "Bauer", "Weber", "de Vries"]
+    titles = ["", "", "Dr.", "Dr. med.", "Prof. Dr."]
+
+    names = []
+    for _ in range(distinct_count):
+        first = " ".join(rng.choice(first_names, rng.integers(1, 3)))
+        last = rng.choice(last_names) + rng.choice(["", "er", "mann", "-Lange", "-Weiß"])
+        title = rng.choice(titles)
+        shape = rng.integers(0, 3)
+        name = f"{last}, {first}" if shape == 0 else f"{first} {last}" if shape == 1 else f"{last} {first}"
+        if rng.random() < 0.2:
+            name = name.upper()
+        names.append(f"{title} {name}".strip())
+
+    names = np.array(names + ["Praxis Dr. Weber", None], dtype=object)
+    return pd.Series(names[rng.integers(0, len(names), row_count)])
+
+def measure(function) -> tuple:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    # The per-row version needs about half a millisecond per row.
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    full_names = build_column(row_count)
+
+    batch_seconds, batch_result = measure(lambda: fam_formatter.split_full_name_column(full_names))
+    per_row_seconds, per_row_result = measure(lambda: full_names.apply(per_row_split_full_name).apply(pd.Series))
+
+    pd.testing.assert_frame_equal(batch_result, per_row_result[batch_result.columns].astype(object))
+
+    print(f"rows: {row_count:,}   distinct: {full_names.nunique():,}")
+    print(
+        f"per row: {per_row_seconds:6.3f}s   "
+        f"batch: {batch_seconds:6.3f}s ({per_row_seconds / batch_seconds:5.1f}x)"
+    )
+
+if __name__ == "__main__":
+    main()
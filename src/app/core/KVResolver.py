@@ -1,9 +1,136 @@
+import hashlib
+import os
+import threading
+import zipfile
+from pathlib import Path
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, Optional, Tuple, Union
+
+from app.core import utils
+
+# German postcodes are at most five digits, so every PLZ is a slot in a dense array.
+PLZ_SLOTS = 100_000
+
+DEFAULT_ASSET_PATH = Path(__file__).resolve().parents[3] / "assets" / "plz_kv_mapping.xlsx"
+
+# A BSNR has nine digits, the first two name the KV.
+BSNR_DIGITS = 9
+BSNR_PREFIX_SLOTS = 100
+
+# Prefix lengths tried, longest first, for postcodes that are not in the mapping.
+PLZ_PREFIX_DEPTHS = (4, 3)
+
+# How a KV code was found, see KVResolver.resolve_kv_details.
+KV_SOURCE_NAME = "name"
+KV_SOURCE_PLZ = "plz"
+KV_SOURCE_PLZ_PREFIX = "plz_prefix"
+
+COMPILED_MAPPING_SUFFIX = ".compiled.npz"
+# Bump when the arrays written by KVResolver._compile_mapping change.
+COMPILED_MAPPING_VERSION = 1
+
+def postcodes_to_int(postcode_column: pd.Series) -> np.ndarray:
+    """
+    Converts a column of postcodes into integers for array lookups.
+
+    Text values count if they consist of one to five digits (surrounding
+    whitespace and leading zeros are fine, "06618" becomes 6618). Numbers
+    count if they are integral and below 100000. The conversion runs once
+    per distinct value.
+
+    Args:
+        postcode_column: Postcodes as text or numbers.
+
+    Returns:
+        An int64 array aligned with the column, with -1 for missing or invalid values.
+    """
+    if pd.api.types.is_numeric_dtype(postcode_column) and not pd.api.types.is_bool_dtype(postcode_column):
+        return _valid_postcode_numbers(postcode_column.to_numpy(dtype=float, na_value=np.nan))
+
+    codes, uniques = pd.factorize(postcode_column)
+    unique_text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    is_postcode = unique_text.str.fullmatch(r"\d{1,5}").to_numpy(dtype=bool)
+
+    unique_postcodes = np.full(len(unique_text), -1, dtype=np.int64)
+    unique_postcodes[is_postcode] = unique_text[is_postcode].to_numpy().astype(np.int64)
+
+    # Missing values have code -1 and pick up the appended -1.
+    return np.append(unique_postcodes, -1)[codes]
+
+def _valid_postcode_numbers(values: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        valid = (values >= 0) & (values < PLZ_SLOTS) & (values == np.floor(values))
+
+    return np.where(valid, values, -1).astype(np.int64)
+
+def asset_content_hash(asset_path: Union[str, Path]) -> str:
+    """Returns the SHA-256 hex digest of an asset file."""
+    with open(asset_path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def compiled_mapping_path(asset_path: Union[str, Path], suffix: str = COMPILED_MAPPING_SUFFIX) -> Path:
+    """Returns where the compiled form of a mapping asset is kept, e.g. plz_kv_mapping.compiled.npz."""
+    asset_path = Path(asset_path)
+    return asset_path.with_name(asset_path.stem + suffix)
+
+def load_compiled_mapping(
+    compiled_path: Path,
+    source_hash: str,
+    version: int = COMPILED_MAPPING_VERSION
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Loads a compiled mapping if it was built in this version from the asset content with source_hash.
+
+    Returns:
+        The compiled arrays by name, or None if the file is missing, outdated or unreadable.
+    """
+    try:
+        with np.load(compiled_path, allow_pickle=False) as compiled_file:
+            if int(compiled_file["version"]) != version:
+                return None
+            if str(compiled_file["source_hash"]) != source_hash:
+                return None
+            return {name: compiled_file[name] for name in compiled_file.files}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+def save_compiled_mapping(
+    compiled_path: Path,
+    source_hash: str,
+    compiled_mapping: Dict[str, np.ndarray],
+    version: int = COMPILED_MAPPING_VERSION
+) -> bool:
+    """
+    Writes a compiled mapping next to its asset.
+
+    Returns False if the file cannot be written, e.g. on a read-only asset directory.
+    The resolver then simply parses the asset again next time.
+    """
+    temp_path = compiled_path.with_name(f"{compiled_path.name}.{os.getpid()}.tmp")
+
+    try:
+        with open(temp_path, "wb") as file:
+            np.savez(
+                file,
+                version=np.array(version),
+                source_hash=np.array(source_hash),
+                **compiled_mapping
+            )
+        os.replace(temp_path, compiled_path)
+    except OSError as e:
+        temp_path.unlink(missing_ok=True)
+        print(f"Compiled mapping could not be written to {compiled_path}: {e}")
+        return False
+
+    return True
 
 class KVResolver:
     """
     A performant resolver for KV districts that loads lookup data only once.
+
+    The PLZ mapping is held as a dense array with one slot per possible
+    postcode, so a whole column is resolved with a single NumPy take.
     """
 
     KV_NAME_TO_CODE_MAP: Dict[str, str] = {
@@ -26,42 +153,325 @@ class KVResolver:
         "Nordrhein": "17"
     }
 
-    def __init__(self, asset_path: str):
+    # The first two digits of a BSNR name the KV that issued it. Prefixes of
+    # merged KVs (Rheinland-Pfalz 47-50, Baden-Württemberg 55/60-62) and the
+    # Bavarian districts (63-71) are still found on older BSNRs.
+    BSNR_PREFIX_TO_KV_CODE: Dict[str, str] = {
+        "01": "13",
+        "02": "15",
+        "03": "7",
+        "17": "5",
+        "20": "2",
+        "38": "17",
+        "46": "8",
+        **{str(prefix): "4" for prefix in range(47, 52)},
+        "52": "1",
+        **{str(prefix): "1" for prefix in (55, 60, 61, 62)},
+        **{str(prefix): "6" for prefix in range(63, 72)},
+        "72": "16",
+        "73": "12",
+        "78": "9",
+        "83": "11",
+        "88": "3",
+        "93": "14",
+        "98": "10"
+    }
+
+    def __init__(self, asset_path: str, use_compiled: bool = True):
             """
             Initializes the resolver by loading the PLZ-to-KV mapping from an Excel file.
+
+            The mapping is compiled once into a binary file next to the asset (see
+            compiled_mapping_path). Later resolvers load that file instead of parsing
+            the workbook, as long as the asset content has not changed.
+
+            Args:
+                asset_path: Path to plz_kv_mapping.xlsx.
+                use_compiled: Set to False to always parse the workbook and not write
+                    the compiled file.
             """
             try:
+                source_hash = asset_content_hash(asset_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"KV lookup file not found at: {asset_path}")
 
-                df_lookup = pd.read_excel(asset_path, header=0)
+            compiled_path = compiled_mapping_path(asset_path)
+            compiled_mapping = load_compiled_mapping(compiled_path, source_hash) if use_compiled else None
 
-                df_lookup = df_lookup.iloc[:, [0, 3]]
-                df_lookup.columns = ["plz", "kv_code"] 
+            if compiled_mapping is None:
+                compiled_mapping = self._compile_mapping(asset_path)
+                if use_compiled:
+                    save_compiled_mapping(compiled_path, source_hash, compiled_mapping)
 
-                df_lookup['plz'] = df_lookup['plz'].astype(str)
+            self._set_indexes(compiled_mapping)
 
-                df_lookup['kv_code'] = df_lookup['kv_code'].astype(str)
+    def _compile_mapping(self, asset_path: str) -> Dict[str, np.ndarray]:
+        """
+        Reads the mapping workbook into the arrays behind the resolver.
 
-                df_lookup.drop_duplicates(subset='plz', keep='first', inplace=True)
+        plz_kv_index holds, per PLZ, the position of its KV code in
+        kv_code_labels, counted from 1; 0 means unknown.
+        """
+        try:
 
-                self.plz_to_kv_code_map = pd.Series(
-                    df_lookup.kv_code.values, 
-                    index=df_lookup.plz
-                ).to_dict()
-                
-            except FileNotFoundError:
-                raise FileNotFoundError(f"KV lookup file not found at: {asset_path}")
-            except IndexError:
-                raise ValueError("The Excel file needs at least 4 columns (PLZ in A, KV-Code in D).")
+            df_lookup = pd.read_excel(asset_path, header=0)
+
+            df_lookup = df_lookup.iloc[:, [0, 3]]
+            df_lookup.columns = ["plz", "kv_code"] 
+
+            df_lookup['plz'] = df_lookup['plz'].astype(str)
+
+            df_lookup['kv_code'] = df_lookup['kv_code'].astype(str)
+
+            df_lookup.drop_duplicates(subset='plz', keep='first', inplace=True)
+            
+        except FileNotFoundError:
+            raise FileNotFoundError(f"KV lookup file not found at: {asset_path}")
+        except IndexError:
+            raise ValueError("The Excel file needs at least 4 columns (PLZ in A, KV-Code in D).")
+
+        postcodes = postcodes_to_int(df_lookup['plz'])
+        valid = postcodes >= 0
+
+        label_positions, labels = pd.factorize(df_lookup['kv_code'].to_numpy()[valid])
+        labels = list(labels) + [code for code in self.KV_NAME_TO_CODE_MAP.values() if code not in set(labels)]
+
+        plz_kv_index = np.zeros(PLZ_SLOTS + 1, dtype=np.int16)
+        plz_kv_index[postcodes[valid]] = label_positions + 1
+
+        return {
+            "plz_kv_index": plz_kv_index,
+            "kv_code_labels": np.array(labels, dtype=str)
+        }
+
+    def _set_indexes(self, compiled_mapping: Dict[str, np.ndarray]):
+        """
+        Sets up the lookups used by resolve_kv_column.
+
+        Both lookups work on positions in kv_code_labels, whose position 0 is the
+        NaN label: plz_kv_index holds the position per PLZ, kv_name_labels per
+        entry of kv_name_index. Each has a trailing 0 slot, so the -1 of an
+        invalid postcode or unknown name also lands on NaN.
+        """
+        labels = compiled_mapping["kv_code_labels"].tolist()
+        label_lookup = {label: position + 1 for position, label in enumerate(labels)}
+
+        self.kv_code_labels = np.array([np.nan] + labels, dtype=object)
+        self.plz_kv_index = compiled_mapping["plz_kv_index"]
+
+        self.kv_name_index = pd.Index(list(self.KV_NAME_TO_CODE_MAP.keys()))
+        self.kv_name_labels = np.array(
+            [label_lookup[code] for code in self.KV_NAME_TO_CODE_MAP.values()] + [0],
+            dtype=np.int16
+        )
+
+        # KV districts given as code (16, "16") and BSNR prefixes, each with a trailing 0 slot.
+        self.kv_number_labels = np.zeros(BSNR_PREFIX_SLOTS + 1, dtype=np.int16)
+        for label, position in label_lookup.items():
+            if label.isdigit() and int(label) < BSNR_PREFIX_SLOTS:
+                self.kv_number_labels[int(label)] = position
+
+        self.bsnr_prefix_labels = np.zeros(BSNR_PREFIX_SLOTS + 1, dtype=np.int16)
+        for prefix, code in self.BSNR_PREFIX_TO_KV_CODE.items():
+            self.bsnr_prefix_labels[int(prefix)] = label_lookup[code]
+
+        known_postcodes = np.flatnonzero(self.plz_kv_index[:PLZ_SLOTS])
+        self.plz_to_kv_code_map = dict(zip(
+            known_postcodes.astype(str).tolist(),
+            self.kv_code_labels[self.plz_kv_index[known_postcodes]].tolist()
+        ))
+
+        self.plz_prefix_indexes = {
+            depth: self._build_prefix_index(known_postcodes, depth) for depth in PLZ_PREFIX_DEPTHS
+        }
+
+    def _build_prefix_index(self, known_postcodes: np.ndarray, depth: int) -> np.ndarray:
+        """
+        Maps every PLZ prefix of the given length to a KV label position.
+
+        A prefix only gets a label if all known postcodes starting with it
+        belong to the same KV, otherwise (or if there are none) it stays 0.
+        Like plz_kv_index it has a trailing 0 slot for invalid postcodes.
+        """
+        divisor = 10 ** (5 - depth)
+        prefixes = known_postcodes // divisor
+        labels = self.plz_kv_index[known_postcodes]
+
+        prefix_slots = PLZ_SLOTS // divisor + 1
+        lowest = np.full(prefix_slots, np.iinfo(np.int16).max, dtype=np.int16)
+        highest = np.zeros(prefix_slots, dtype=np.int16)
+        np.minimum.at(lowest, prefixes, labels)
+        np.maximum.at(highest, prefixes, labels)
+
+        return np.where(lowest == highest, highest, 0).astype(np.int16)
+
+    def lookup_postcodes(self, postcode_column: pd.Series) -> np.ndarray:
+        """
+        Looks up the KV code of every postcode of a column.
+
+        Returns:
+            An object array of KV codes aligned with the column, NaN where the
+            postcode is invalid or not in the mapping.
+        """
+        return self.kv_code_labels[self.plz_kv_index[postcodes_to_int(postcode_column)]]
+
+    def _resolve_labels(
+        self,
+        arzt_postcode_column: pd.Series,
+        kv_district_column: pd.Series,
+        prefix_fallback: bool
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Resolves KV label positions.
+
+        Returns:
+            The resolved label positions, the label positions found by name and
+            by exact PLZ, and the prefix depth per row (0 if no prefix was used).
+        """
+        name_labels = self.kv_name_labels[self.kv_name_index.get_indexer(kv_district_column)]
+        postcodes = postcodes_to_int(arzt_postcode_column)
+        postcode_labels = self.plz_kv_index[postcodes]
+
+        resolved_labels = np.where(name_labels > 0, name_labels, postcode_labels)
+        prefix_depths = np.zeros(len(resolved_labels), dtype=np.int8)
+
+        if prefix_fallback:
+            for depth in PLZ_PREFIX_DEPTHS:
+                unresolved = (resolved_labels == 0) & (postcodes >= 0)
+                if not unresolved.any():
+                    break
 
-    def resolve_kv_column(self, arzt_postcode_column: pd.Series,  kv_district_column: pd.Series) -> pd.Series:
+                prefix_labels = self.plz_prefix_indexes[depth][postcodes[unresolved] // 10 ** (5 - depth)]
+                resolved_labels[unresolved] = prefix_labels
+
+                prefix_depths[np.flatnonzero(unresolved)[prefix_labels > 0]] = depth
+
+        return resolved_labels, name_labels, postcode_labels, prefix_depths
+
+    def resolve_kv_column(
+        self,
+        arzt_postcode_column: pd.Series,
+        kv_district_column: pd.Series,
+        prefix_fallback: bool = False
+    ) -> pd.Series:
         """
         Resolves the KV district using the two-step fallback logic.
+
+        The KV name is looked up first, rows without a known name fall back to
+        the doctor's postcode. Both columns are matched by position.
+
+        With prefix_fallback=True, postcodes that are not in the mapping (new
+        postcodes, typos in the last digits) are resolved by their 4- and then
+        3-digit prefix, if all known postcodes with that prefix share one KV.
+        Use resolve_kv_details to see which rows needed that.
         """
+        resolved_labels, _, _, _ = self._resolve_labels(arzt_postcode_column, kv_district_column, prefix_fallback)
+
+        return pd.Series(
+            self.kv_code_labels[resolved_labels],
+            index=kv_district_column.index,
+            name=kv_district_column.name
+        )
 
-        resolved_series = kv_district_column.map(self.KV_NAME_TO_CODE_MAP)
+    def resolve_kv_details(
+        self,
+        arzt_postcode_column: pd.Series,
+        kv_district_column: pd.Series,
+        prefix_fallback: bool = True
+    ) -> pd.DataFrame:
+        """
+        Resolves the KV district like resolve_kv_column and reports how each row was resolved.
+
+        Returns:
+            A DataFrame with the index of kv_district_column and the columns
+            kv_code, kv_source (KV_SOURCE_NAME, KV_SOURCE_PLZ, KV_SOURCE_PLZ_PREFIX
+            or None if unresolved) and prefix_depth (4 or 3 for prefix matches, NA otherwise).
+        """
+        resolved_labels, name_labels, postcode_labels, prefix_depths = self._resolve_labels(
+            arzt_postcode_column, kv_district_column, prefix_fallback
+        )
+
+        sources = np.select(
+            [name_labels > 0, postcode_labels > 0, prefix_depths > 0],
+            [KV_SOURCE_NAME, KV_SOURCE_PLZ, KV_SOURCE_PLZ_PREFIX],
+            default=None
+        )
+
+        return pd.DataFrame(
+            {
+                "kv_code": self.kv_code_labels[resolved_labels],
+                "kv_source": sources,
+                "prefix_depth": pd.array(np.where(prefix_depths > 0, prefix_depths, None), dtype="Int8")
+            },
+            index=kv_district_column.index
+        )
+
+    def check_bsnr_consistency(
+        self,
+        bs_nr_column: pd.Series,
+        arzt_postcode_column: pd.Series,
+        kv_district_column: pd.Series
+    ) -> pd.DataFrame:
+        """
+        Compares the KV named by the BSNR prefix with the KV district and the KV of the doctor's postcode.
+
+        The KV district may be given by name or by code (16 or "16"). BSNRs
+        are read as numbers of up to nine digits, shorter numbers count as
+        having leading zeros. All three columns are matched by position.
+
+        Returns:
+            A DataFrame with the index of bs_nr_column and the columns
+            bsnr_kv_code, district_kv_code and plz_kv_code (NaN if unknown),
+            plus the boolean columns district_matches and plz_matches, which
+            are NA where either side is unknown.
+        """
+        bsnr_numbers = utils.id_numbers_to_int(bs_nr_column, BSNR_DIGITS)
+        bsnr_labels = self.bsnr_prefix_labels[
+            np.where(bsnr_numbers >= 0, bsnr_numbers // 10 ** (BSNR_DIGITS - 2), -1)
+        ]
+
+        district_labels = self.kv_name_labels[self.kv_name_index.get_indexer(kv_district_column)]
+        district_numbers = utils.parse_integer_column(kv_district_column, minimum=0, maximum=BSNR_PREFIX_SLOTS - 1)
+        district_labels = np.where(
+            district_labels > 0,
+            district_labels,
+            self.kv_number_labels[district_numbers.fillna(-1).to_numpy(dtype=np.int64)]
+        )
+
+        postcode_labels = self.plz_kv_index[postcodes_to_int(arzt_postcode_column)]
+
+        def matches(other_labels: np.ndarray) -> pd.arrays.BooleanArray:
+            result = pd.array(bsnr_labels == other_labels, dtype="boolean")
+            result[(bsnr_labels == 0) | (other_labels == 0)] = pd.NA
+            return result
+
+        return pd.DataFrame(
+            {
+                "bsnr_kv_code": self.kv_code_labels[bsnr_labels],
+                "district_kv_code": self.kv_code_labels[district_labels],
+                "plz_kv_code": self.kv_code_labels[postcode_labels],
+                "district_matches": matches(district_labels),
+                "plz_matches": matches(postcode_labels)
+            },
+            index=bs_nr_column.index
+        )
+
+_resolvers: Dict[Path, KVResolver] = {}
+_resolvers_lock = threading.Lock()
+
+def get_kv_resolver(asset_path: Union[str, Path] = DEFAULT_ASSET_PATH) -> KVResolver:
+    """
+    Returns the process-wide KVResolver for an asset.
+
+    The resolver is created on first use and shared afterwards, so a worker
+    loads the mapping at most once.
+    """
+    resolver_key = Path(asset_path).resolve()
 
-        fallback_series = arzt_postcode_column.map(self.plz_to_kv_code_map)
+    with _resolvers_lock:
+        resolver = _resolvers.get(resolver_key)
+        if resolver is None:
+            resolver = KVResolver(resolver_key)
+            _resolvers[resolver_key] = resolver
 
-        resolved_series.fillna(fallback_series, inplace=True)
-        
-        return resolved_series
+    return resolver
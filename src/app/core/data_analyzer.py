@@ -1,5 +1,8 @@
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from app.core import utils
+from app.core.data_rejection import bsnr_kv_mismatches
 
 def analyze_price_consistency(fam_df: pd.DataFrame, tolerance: float = 0.20) -> str:
     """
@@ -59,39 +62,22 @@ def calculate_total_avk_sum(fam_df: pd.DataFrame, price_type: str) -> float:
 
 def detect_date_format(raw_fam_df: pd.DataFrame) -> str:
     """
-    Detects the format of the 'vo-datum' column from the raw data.
+    Detects the dominant format(s) of the 'vo-datum' column from the raw data, e.g. "dd.mm.yyyy".
+
+    Mixed columns list every dominant format, the most frequent first ("dd.mm.yyyy / yyyymmdd").
     """
     if 'vo-datum' not in raw_fam_df.columns:
         return "N/A - Column 'vo-datum' not found"
 
-    date_sample = raw_fam_df['vo-datum'].dropna().head(50)
-    if date_sample.empty:
+    date_column = raw_fam_df['vo-datum'].dropna()
+    if date_column.empty:
         return "No date entries found"
 
-    first_date_str = str(date_sample.iloc[0])
-
-    if '.' in first_date_str:
-        parts = first_date_str.split(' ')[0].split('.')
-        if len(parts) == 3:
-            if len(parts[2]) == 4:
-                return "dd.mm.yyyy"
-            else:
-                return "dd.mm.yy"
-    elif '-' in first_date_str:
-        parts = first_date_str.split(' ')[0].split('-')
-        if len(parts) == 3:
-            if len(parts[0]) == 4:
-                return "yyyy-mm-dd"
-            else:
-                return "dd-mm-yy"
-
-    try:
-        if len(first_date_str) == 8 and first_date_str.isdigit():
-            return "yyyymmdd"
-    except:
-        pass
-
-    return "Unknown"
+    date_formats = utils.detect_date_formats(date_column)
+    if not date_formats:
+        return "Unknown"
+
+    return " / ".join(date_formats)
 
 def check_void_tm_consistency(fam_df: pd.DataFrame, tm_df: pd.DataFrame) -> str:
     """
@@ -112,17 +98,52 @@ def check_void_tm_consistency(fam_df: pd.DataFrame, tm_df: pd.DataFrame) -> str:
             
     return "Yes"
 
+def count_bsnr_kv_mismatches(
+    raw_fam_df: pd.DataFrame,
+    mismatches: Optional[pd.DataFrame] = None
+) -> Dict[str, Any]:
+    """
+    Counts the FAM rows whose BSNR prefix names another KV than the KV district or the doctor's postcode.
+
+    Args:
+        raw_fam_df: The raw FAM DataFrame.
+        mismatches: Optional result of bsnr_kv_mismatches for raw_fam_df, e.g. the
+            one the rejection criteria were built from; checked here otherwise.
+
+    Returns:
+        The counts under 'district' and 'plz'. Both are an "N/A" note if the
+        columns or the KV mapping are missing.
+    """
+    if not all(col in raw_fam_df.columns for col in ['bsnr', 'arzt-plz', 'kv-bezirk']):
+        return dict.fromkeys(['district', 'plz'], "N/A - Required columns missing")
+
+    if mismatches is None:
+        try:
+            mismatches = bsnr_kv_mismatches(raw_fam_df)
+        except FileNotFoundError:
+            return dict.fromkeys(['district', 'plz'], "N/A - KV mapping not found")
+
+    return {
+        'district': int(mismatches['district_mismatch'].sum()),
+        'plz': int(mismatches['plz_mismatch'].sum())
+    }
+
 def generate_analysis_notes(
     raw_fam_df: pd.DataFrame,
     processed_fam_df: pd.DataFrame,
     raw_tm_df: pd.DataFrame,
-    processed_tm_df: pd.DataFrame
+    processed_tm_df: pd.DataFrame,
+    bsnr_kv_mismatch_df: Optional[pd.DataFrame] = None
 ) -> Dict[str, Any]:
     """
     Runs all analysis functions and returns the results as a dictionary.
+
+    bsnr_kv_mismatch_df is the optional result of bsnr_kv_mismatches for
+    raw_fam_df, so a frame already checked for the rejections is not checked again.
     """
     
     price_type = determine_price_type(processed_fam_df)
+    bsnr_kv_mismatch_counts = count_bsnr_kv_mismatches(raw_fam_df, bsnr_kv_mismatch_df)
     
     notes = {
         "… Versicherten-Pseudonyme stimmen mit Vorgänger-Datensatz überein": "Yes",
@@ -131,6 +152,8 @@ def generate_analysis_notes(
         "avk Summe:": calculate_total_avk_sum(processed_fam_df, price_type),
         "Datumsformat:": detect_date_format(raw_fam_df),
         "VO-ID & TM stimmig?": check_void_tm_consistency(processed_fam_df, processed_tm_df),
+        "BSNR/KV-Bezirk Abweichungen:": bsnr_kv_mismatch_counts['district'],
+        "BSNR/Arzt-PLZ Abweichungen:": bsnr_kv_mismatch_counts['plz'],
         "Anzahl Zeilen FAM original:": len(raw_fam_df),
         "Anzahl Zeilen FAM aufbereitet:": len(processed_fam_df),
         "Anzahl Zeilen TM original:": len(raw_tm_df),
@@ -1,5 +1,8 @@
 import pandas as pd
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+
+from app.core import utils
+from app.core.KVResolver import get_kv_resolver
 
 REJECTION_CRITERIA_FAM = {
     "Essentielle Spalten (patnr, pzn, vo-datum, anzahl) sind unvollständig": 
@@ -14,7 +17,7 @@ REJECTION_CRITERIA_FAM = {
 
 REJECTION_CRITERIA_TM = {
     "Botendienst-PZN (06461110)": 
-        lambda df: df['PZN'].astype(str) == '6461110',
+        lambda df: df['PZN'].astype(str).str.lstrip('0') == '6461110',
 
     "Teilmengenpreis ist ungültig (fehlt oder <= 0)": 
         lambda df: df['partial_quantity_price'].isna(),
@@ -23,6 +26,72 @@ REJECTION_CRITERIA_TM = {
         lambda df: df['position'].isna(),
 }
 
+# Check-digit criteria for the processed frames, kept apart so they can be combined
+# as needed, e.g. {**REJECTION_CRITERIA_FAM, **REJECTION_CRITERIA_CHECK_DIGITS_FAM}.
+# Values that are missing or no number at all are left to the other criteria.
+REJECTION_CRITERIA_CHECK_DIGITS_FAM = {
+    "PZN hat eine ungültige Prüfziffer":
+        lambda df: ~utils.check_pzn_check_digits(df['pzn']).fillna(True),
+
+    "LANR hat eine ungültige Prüfziffer":
+        lambda df: ~utils.check_lanr_check_digits(df['lanr']).fillna(True),
+}
+
+REJECTION_CRITERIA_CHECK_DIGITS_TM = {
+    "PZN hat eine ungültige Prüfziffer":
+        lambda df: ~utils.check_pzn_check_digits(df['pzn']).fillna(True),
+}
+
+def bsnr_kv_mismatches(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flags rows of a raw FAM frame whose BSNR prefix names another KV.
+
+    All rows are checked in one pass of KVResolver.check_bsnr_consistency.
+    The KV mapping is only loaded if at least one row has a BSNR.
+
+    Args:
+        raw_df: The raw FAM DataFrame with bsnr, arzt-plz and kv-bezirk.
+
+    Returns:
+        A DataFrame with the boolean columns district_mismatch and plz_mismatch,
+        False where either KV is unknown.
+
+    Raises:
+        FileNotFoundError: If the KV mapping asset is missing.
+    """
+    if raw_df['bsnr'].isna().all():
+        return pd.DataFrame(False, index=raw_df.index, columns=['district_mismatch', 'plz_mismatch'])
+
+    consistency = get_kv_resolver().check_bsnr_consistency(raw_df['bsnr'], raw_df['arzt-plz'], raw_df['kv-bezirk'])
+
+    return pd.DataFrame({
+        'district_mismatch': ~consistency['district_matches'].fillna(True).astype(bool),
+        'plz_mismatch': ~consistency['plz_matches'].fillna(True).astype(bool),
+    }, index=raw_df.index)
+
+def kv_consistency_criteria(mismatches: pd.DataFrame) -> Dict[str, callable]:
+    """
+    Builds the BSNR/KV consistency criteria from one result of bsnr_kv_mismatches.
+
+    The criteria work on the raw FAM frame (is_raw_criteria=True), where the
+    doctor's postcode is still apart from the pharmacy's. Both read their mask
+    from mismatches, so the frame is checked once, e.g.
+    analyze_rejections(raw_df, processed_df, kv_consistency_criteria(bsnr_kv_mismatches(raw_df)), True).
+
+    Args:
+        mismatches: The result of bsnr_kv_mismatches for the raw FAM frame.
+
+    Returns:
+        The criteria by rejection reason.
+    """
+    return {
+        "BSNR passt nicht zum KV-Bezirk":
+            lambda df: mismatches['district_mismatch'].reindex(df.index, fill_value=False),
+
+        "BSNR passt nicht zur KV der Arzt-PLZ":
+            lambda df: mismatches['plz_mismatch'].reindex(df.index, fill_value=False),
+    }
+
 def analyze_rejections(
     raw_df: pd.DataFrame,
     processed_df: pd.DataFrame,
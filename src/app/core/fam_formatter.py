@@ -1,11 +1,16 @@
 
 from datetime import datetime
 import re
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from nameparser import HumanName
+from nameparser.config import CONSTANTS as HUMAN_NAME_CONSTANTS
 
 from app.model.fam import FAMModel
 from app.core import utils 
+from app.core.normalization_memo import get_normalization_memo
 
 FAM_HEADER_MAPPING = {
     "kasse": "health_insurance_company",
@@ -41,6 +46,81 @@ FAM_HEADER_MAPPING = {
     "vo-id": "vo_id"
 }
 
+# Cleaned prices made of digits and at most one decimal point, parsed in bulk.
+PLAIN_DECIMAL_PATTERN = r"^[+-]?(?:\d+\.?\d*|\.\d+)$"
+
+PHARMACY_NAME_KEYWORDS = [
+    "e.K.", "e. K.", "e.K ", "e. K", "B.V.", "PE", "Filiale", "e.Kfm",
+    "e. Kfm", "e.Kfr.", "Zytostatika", "eK", "OHG", "oHG", "gGmbH", 
+    "GmbH", "Inh.", "Inhaber"
+]
+
+BS_NAME_KEYWORDS = [
+    "gGmbH", "GmbH", "e.V.", "e. V.", "e V", "e.V", "eV", "B.V.", "OHG",
+    "e.Kfm", "SAPV-Team", "e. G.", "gKAöR", "§117 SGBV", "eG", "&Co.KG",
+    "& Co.KG", "mbH", "+ Co.KG", "GbR", "(Entlassungsmanagement 750200598)",
+    "G:", ",Entlassungsmanagement", "Entlassungsmanagement", "UG", "NULL", "#",
+    "N/A", "Pseudo Pseudo-Arzt", "Pseudoarzt KH-Entlassungsmanagement", "#NV",
+    "ungültiger Wert", "et. al."
+]
+
+DOCTOR_SPECIALIZATION_KEYWORDS = [
+    "(Facharzt)", "(Hausarzt)", "Hausarzt", "Facharzt",
+    "Praktischer Arzt / Hausarzt", "F: ", "0", "unbekannt", "keine Angaben",
+    "Zur freien Verfügung für die KVen (Notfallärzte etc.)",
+    "Zur freien Verfügung für die KVen (Notfallärzte etc)",
+    "Zur freien Verfügung für die KVen", "Sonstige Ärzte", "00", "k.A.",
+    "XXX", "NULL", "nicht referenziert",
+    "KV-interne Kennzeichnung, z.B. Notfallärzte",
+    "Nicht zugeordnet", "ungültiger Wert", "zur freien Verfügung",
+    "ungültige Facharztgruppe", "(SP)", "KV-interne Vergabe", " / "
+]
+
+PHARMACY_OWNER_KEYWORDS = [
+    "gGmbH", "GmbH", "e.V.", "e. V.",
+    "e V", "e.V", "eV","B.V.", "OHG", "oHG","e.Kfm",
+    "e. Kfm","e.Kfr.", "#","e.K.","e. K.","e.K",
+    "Inh.","Inhaber"
+]
+
+# Compiled once; the formatters strip with these.
+PHARMACY_NAME_STRIPPER = utils.KeywordStripper(PHARMACY_NAME_KEYWORDS)
+BS_NAME_STRIPPER = utils.KeywordStripper(BS_NAME_KEYWORDS)
+DOCTOR_SPECIALIZATION_STRIPPER = utils.KeywordStripper(DOCTOR_SPECIALIZATION_KEYWORDS)
+PHARMACY_OWNER_STRIPPER = utils.KeywordStripper(PHARMACY_OWNER_KEYWORDS)
+
+ORGANIZATION_KEYWORDS = {
+    'universitäts', 'klinik', 'klinikum', 'zentrum', 'palliativnetz', 
+    'praxis', 'mvz', 'medizinisches', 'versorgungszentrum', 'sapv-team'
+}
+
+TITLE_KEYWORDS = {
+    "dr", "doctor", "mudr", "md", "prof", "professor", "pd",
+    "privatdozent", "priv-doz", "med", "dent", "habil", "univ",
+    "vet", "rer", "nat"
+}
+
+# Name words split without HumanName: letters, optionally joined by hyphens ("Müller-Lüdenscheidt").
+PLAIN_NAME_WORD_PATTERN = re.compile(r"[^\W\d_]{2,}(?:-[^\W\d_]{2,})*")
+
+# Words HumanName treats specially; names containing one of them go through HumanName.
+HUMAN_NAME_WORD_SETS = (
+    HUMAN_NAME_CONSTANTS.titles,
+    HUMAN_NAME_CONSTANTS.first_name_titles,
+    HUMAN_NAME_CONSTANTS.suffix_acronyms,
+    HUMAN_NAME_CONSTANTS.suffix_not_acronyms,
+    HUMAN_NAME_CONSTANTS.prefixes,
+    HUMAN_NAME_CONSTANTS.conjunctions
+)
+
+SPLIT_NAME_COLUMNS = ["title", "first_name", "last_name"]
+# str.split() counts the unit separator as whitespace, so it never appears in a split name.
+SPLIT_NAME_SEPARATOR = "\x1f"
+# Bump when split_full_name changes its output, which drops its memoized results.
+SPLIT_NAME_MEMO_VERSION = 1
+# Bump when validate_doctor_title_column changes its output, which drops its memoized results.
+DOCTOR_TITLE_MEMO_VERSION = 1
+
 def format_fam_data(raw_df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans and formats the raw FAM DataFrame.
@@ -66,70 +146,114 @@ def validate_medicine_name_column(medicine_name: pd.Series) -> pd.Series:
             return None
         
         return str(medicine_name).title()
-    return medicine_name.apply(validate_single_medicine_name)
+    return utils.apply_on_uniques(medicine_name, validate_single_medicine_name)
 
 def validate_prescription_date_column(date_column: pd.Series) -> pd.Series:
     """
     Parses, validates, and formats a column of dates.
-    """
-
-    parsed_dates = pd.to_datetime(date_column, format='%d.%m.%Y', errors='coerce')
 
-    failed_mask = parsed_dates.isna()
-    if failed_mask.any():
-        parsed_dates.loc[failed_mask] = pd.to_datetime(
-            date_column[failed_mask], errors='coerce', dayfirst=True
-        )
+    Dates are read with utils.parse_date_column; dates older than two years
+    or in the future are invalid. Text in a known format that is no real
+    date is invalid as well: "12.13.2025" is not read month first.
+    """
+    parsed_dates = utils.parse_date_column(date_column)
 
     today = pd.Timestamp.now()
     two_years_ago = today - pd.DateOffset(years=2)
-    parsed_dates.loc[(parsed_dates < two_years_ago) | (parsed_dates > today)] = pd.NaT
+    parsed_dates = parsed_dates.where(parsed_dates.between(two_years_ago, today))
 
-    formatted_dates = parsed_dates.dt.strftime('%d.%m.%Y')
-    
-    return formatted_dates.where(pd.notna(formatted_dates), None)
+    return utils.format_date_column(parsed_dates, '%d.%m.%Y')
+
+def validate_billing_date_column(date_column: pd.Series) -> pd.Series:
+    """
+    Parses and formats a column of billing dates like the prescription dates, without a time window.
+    """
+    return utils.format_date_column(utils.parse_date_column(date_column), '%d.%m.%Y')
 
 def validate_medicine_price_column(medicine_price: pd.Series) -> pd.Series:
     """
     Validates a column to ensure all entries are real prices with greater than 0.
+
+    Numeric columns, e.g. parsed with decimal=',' on import, are only checked.
+    Text is cleaned like a German price ("1.234,56 €") and converted in one pass.
     """
+    if medicine_price.empty:
+        return medicine_price.copy()
 
-    def validate_medicine_price(medicine_price):
-        if pd.isna(medicine_price):
-                    return None
+    prices = parse_german_prices(medicine_price)
+    prices = np.where(prices > 0, prices, np.nan)
 
-        price_str = str(medicine_price).replace('€', '').strip()
-        price_str = price_str.replace('.', '').replace(',', '.')
-        
-        try:
-            price_float = float(price_str)
+    if np.isnan(prices).all():
+        return pd.Series([None] * len(prices), index=medicine_price.index, name=medicine_price.name, dtype=object)
 
-            if price_float > 0:
-                return price_float
-            else:
-                return None
-        except (ValueError, TypeError):
-            return None    
-    return medicine_price.apply(validate_medicine_price)
+    return pd.Series(prices, index=medicine_price.index, name=medicine_price.name)
 
-def validate_amount_column(amount: pd.Series) -> pd.Series:
+def parse_german_price(price) -> float:
     """
-    Validates a column to ensure all entries are in greater 0.
+    Converts one price like "1.234,56 €" to a float, NaN if it is no price.
+
+    Numbers are taken as they are, booleans are no price. Text loses the
+    euro sign and the thousands dots, the decimal comma becomes a point.
     """
+    if isinstance(price, (int, float, np.number)) and not isinstance(price, (bool, np.bool_)):
+        return float(price)
+    if pd.isna(price):
+        return np.nan
 
-    def validate_single_amount(amount):
-        if pd.isna(amount):
-            return None
-        try:
-            amount_int = int(float(amount))
-        except (ValueError, TypeError):
-            return None
+    price_str = str(price).replace('€', '').strip()
+    price_str = price_str.replace('.', '').replace(',', '.')
 
-        if amount_int >= 1:
-            return amount_int
-        else:
-            return None
-    return amount.apply(validate_single_amount)
+    try:
+        return float(price_str)
+    except (ValueError, TypeError):
+        return np.nan
+
+def parse_german_prices(prices: pd.Series) -> np.ndarray:
+    """
+    Converts a column of prices like parse_german_price, as a float array.
+
+    Text columns are cleaned with Arrow string kernels and plain decimal
+    numbers are cast in one pass. Everything else, like "1e3", "k.A." or
+    text next to numbers in an object column, goes through
+    parse_german_price once per distinct value.
+    """
+    if pd.api.types.is_numeric_dtype(prices) and not pd.api.types.is_bool_dtype(prices):
+        return prices.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    try:
+        text = pa.array(prices, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return utils.apply_on_uniques(prices, parse_german_price).to_numpy(dtype=np.float64)
+
+    # The ASCII whitespace trimmed here is a subset of what str.strip removes; other
+    # leading or trailing whitespace makes the value non-plain and goes the slow way.
+    cleaned = pc.replace_substring(text, '€', '')
+    cleaned = pc.ascii_trim_whitespace(cleaned)
+    cleaned = pc.replace_substring(cleaned, '.', '')
+    cleaned = pc.replace_substring(cleaned, ',', '.')
+
+    is_plain = pc.fill_null(pc.match_substring_regex(cleaned, PLAIN_DECIMAL_PATTERN), False)
+    is_plain = is_plain.to_numpy(zero_copy_only=False)
+    result = np.full(len(prices), np.nan)
+
+    try:
+        result[is_plain] = pc.cast(cleaned.filter(is_plain), pa.float64()).to_numpy()
+    except pa.ArrowInvalid:
+        # Out-of-range digit strings; float() turns them into inf.
+        is_plain[:] = False
+
+    needs_fallback = ~is_plain & prices.notna().to_numpy()
+    if needs_fallback.any():
+        fallback_prices = utils.apply_on_uniques(prices[needs_fallback], parse_german_price)
+        result[needs_fallback] = fallback_prices.to_numpy(dtype=np.float64)
+
+    return result
+
+def validate_amount_column(amount: pd.Series) -> pd.Series:
+    """
+    Validates a column to ensure all entries are in greater 0.
+    """
+    return utils.parse_integer_column(amount, minimum=1)
 
 def validate_doctor_title_column(doctor_title: pd.Series) -> pd.Series:
     """
@@ -166,51 +290,24 @@ def validate_doctor_title_column(doctor_title: pd.Series) -> pd.Series:
         elif dr_count == 1:
             return "Dr."
         return None
-    return doctor_title.apply(validate_single_doctor_title)
+    return utils.apply_on_uniques(
+        doctor_title,
+        validate_single_doctor_title,
+        memo_name="validate_doctor_title_column",
+        memo_version=DOCTOR_TITLE_MEMO_VERSION
+    )
 
 def format_pharmacy_name_column(name_column: pd.Series) -> pd.Series:
     """Cleans the pharmacy name column by removing business suffixes."""
-    PHARMACY_NAME_KEYWORDS = [
-    "e.K.", "e. K.", "e.K ", "e. K", "B.V.", "PE", "Filiale", "e.Kfm",
-    "e. Kfm", "e.Kfr.", "Zytostatika", "eK", "OHG", "oHG", "gGmbH", 
-    "GmbH", "Inh.", "Inhaber"
-    ]
-
-    return utils.remove_keywords_from_column(name_column, keywords=PHARMACY_NAME_KEYWORDS)
+    return PHARMACY_NAME_STRIPPER.strip_column(name_column)
 
 def format_bs_name_column(name_column: pd.Series) -> pd.Series:
     """Cleans the bs_name column by removing various attachments."""
-
-    BS_NAME_KEYWORDS = [
-    "gGmbH", "GmbH", "e.V.", "e. V.", "e V", "e.V", "eV", "B.V.", "OHG",
-    "e.Kfm", "SAPV-Team", "e. G.", "gKAöR", "§117 SGBV", "eG", "&Co.KG",
-    "& Co.KG", "mbH", "+ Co.KG", "GbR", "(Entlassungsmanagement 750200598)",
-    "G:", ",Entlassungsmanagement", "Entlassungsmanagement", "UG", "NULL", "#",
-    "N/A", "Pseudo Pseudo-Arzt", "Pseudoarzt KH-Entlassungsmanagement", "#NV",
-    "ungültiger Wert", "et. al."
-    ]
-    
-    return utils.remove_keywords_from_column(name_column, keywords=BS_NAME_KEYWORDS)
+    return BS_NAME_STRIPPER.strip_column(name_column)
 
 def format_doctor_specialization_column(doctor_specialization_column: pd.Series) -> pd.Series:
     """Cleans the medical specialty column by removing boilerplate and junk values."""
-
-    DOCTOR_SPECIALIZATION_KEYWORDS = [
-    "(Facharzt)", "(Hausarzt)", "Hausarzt", "Facharzt",
-    "Praktischer Arzt / Hausarzt", "F: ", "0", "unbekannt", "keine Angaben",
-    "Zur freien Verfügung für die KVen (Notfallärzte etc.)",
-    "Zur freien Verfügung für die KVen (Notfallärzte etc)",
-    "Zur freien Verfügung für die KVen", "Sonstige Ärzte", "00", "k.A.",
-    "XXX", "NULL", "nicht referenziert",
-    "KV-interne Kennzeichnung, z.B. Notfallärzte",
-    "Nicht zugeordnet", "ungültiger Wert", "zur freien Verfügung",
-    "ungültige Facharztgruppe", "(SP)", "KV-interne Vergabe", " / "
-    ]
-    
-    cleaned_column = utils.remove_keywords_from_column(
-        doctor_specialization_column, 
-        keywords=DOCTOR_SPECIALIZATION_KEYWORDS
-    )
+    cleaned_column = DOCTOR_SPECIALIZATION_STRIPPER.strip_column(doctor_specialization_column)
 
     return cleaned_column.str.title()
 
@@ -218,37 +315,24 @@ def sync_receipt_and_vo_ids(df: pd.DataFrame) -> pd.DataFrame:
     """
     Synchronizes 'receipt_id' and 'vo_id' for each row.
     If one is missing, it's filled with the value of the other.
-    """
-    def sync_ids_for_single_row(row):
-        receipt_id = row['receipt_id']
-        vo_id = row['vo_id']
 
-        receipt_is_missing = pd.isna(receipt_id)
-        vo_is_missing = pd.isna(vo_id)
+    Both columns are first brought into one text form with
+    utils.normalize_id_column, so an ID read as 123456789.0 is filled in as
+    "123456789". Works on whole columns and returns a copy.
+    """
+    synced_df = df.copy()
 
-        if receipt_is_missing and not vo_is_missing:
-            row['receipt_id'] = vo_id
-        elif not receipt_is_missing and vo_is_missing:
-            row['vo_id'] = receipt_id
+    receipt_ids = utils.normalize_id_column(df['receipt_id']).to_numpy()
+    vo_ids = utils.normalize_id_column(df['vo_id']).to_numpy()
 
-        return row
+    synced_df['receipt_id'] = np.where(pd.isna(receipt_ids), vo_ids, receipt_ids)
+    synced_df['vo_id'] = np.where(pd.isna(vo_ids), receipt_ids, vo_ids)
 
-    return df.apply(sync_ids_for_single_row, axis=1)
+    return synced_df
 
 def format_pharmacy_owner_column(pharmacy_owner_column: pd.Series) -> pd.Series:
     """Cleans the pharmacy owner column by removing boilerplate and junk values."""
-
-    PHARMACY_OWNER_KEYWORDS = [
-    "gGmbH", "GmbH", "e.V.", "e. V.",
-    "e V", "e.V", "eV","B.V.", "OHG", "oHG","e.Kfm",
-    "e. Kfm","e.Kfr.", "#","e.K.","e. K.","e.K",
-    "Inh.","Inhaber"
-    ]
-    
-    cleaned_column = utils.remove_keywords_from_column(
-        pharmacy_owner_column, 
-        keywords=PHARMACY_OWNER_KEYWORDS
-    )
+    cleaned_column = PHARMACY_OWNER_STRIPPER.strip_column(pharmacy_owner_column)
 
     return cleaned_column
 
@@ -256,39 +340,13 @@ def validate_ihpe_units_column(ihpe_units: pd.Series) -> pd.Series:
     """
     Validates a column to ensure that entries are None or whole number.
     """
-
-    def validate_single_ihpe_units(ihpe_units):
-        if pd.isna(ihpe_units):
-            return None
-        try:
-           ihpe_units_int = int(ihpe_units)
-        except (ValueError, TypeError):
-            return None
-
-        if ihpe_units_int >= 0:
-            return ihpe_units_int
-        else:
-            return None
-    return ihpe_units.apply(validate_single_ihpe_units)
+    return utils.parse_integer_column(ihpe_units, minimum=0)
 
 def validate_kv_district_column(kv_district: pd.Series) -> pd.Series:
     """
     Validates a kv_district column to ensure that entries are None or whole number and max 17.
     """
-
-    def validate_single_kv_district(kv_district):
-        if pd.isna(kv_district):
-            return None
-        try:
-           kv_district_int = int(kv_district)
-        except (ValueError, TypeError):
-            return None
-
-        if kv_district_int >= 0 and kv_district_int <= 17:
-            return kv_district_int
-        else:
-            return None
-    return kv_district.apply(validate_single_kv_district)
+    return utils.parse_integer_column(kv_district, minimum=0, maximum=17)
 
 def split_full_name(full_name: str) -> dict:
     """
@@ -296,18 +354,6 @@ def split_full_name(full_name: str) -> dict:
     It first filters out organization names, then extracts complex title blocks
     before parsing the remaining name.
     """
-
-    ORGANIZATION_KEYWORDS = {
-    'universitäts', 'klinik', 'klinikum', 'zentrum', 'palliativnetz', 
-    'praxis', 'mvz', 'medizinisches', 'versorgungszentrum', 'sapv-team'
-    }
-
-    TITLE_KEYWORDS = {
-    "dr", "doctor", "mudr", "md", "prof", "professor", "pd",
-    "privatdozent", "priv-doz", "med", "dent", "habil", "univ",
-    "vet", "rer", "nat"
-    }
-
     result = {"title": "", "first_name": "", "last_name": ""}
     
     if pd.isna(full_name) or not str(full_name).strip():
@@ -347,12 +393,90 @@ def split_full_name(full_name: str) -> dict:
         result["title"] = title
         return result
 
-    name = HumanName(remaining_name)
-    first_and_middle = " ".join([name.first, name.middle]).strip()
+    first_and_middle, last_name = split_plain_name(remaining_name)
     
     result = {
         "title": title,
         "first_name": first_and_middle,
-        "last_name": name.last
+        "last_name": last_name
     }
     return result
+
+def split_plain_name(name_str: str) -> tuple:
+    """
+    Splits a name without title into first names and last name.
+
+    "Nachname, Vorname(n)" and "Vorname(n) Nachname" made of plain words
+    are split directly, the way HumanName splits them. Anything else (name
+    prefixes, initials, suffixes, titles, nicknames, further commas) goes to
+    HumanName.
+
+    Returns:
+        A tuple of first and middle names joined by a space, and the last name.
+    """
+    parts = name_str.split(',')
+
+    if len(parts) <= 2:
+        part_words = [part.split() for part in parts]
+        name_words = [word for words in part_words for word in words]
+
+        if all(part_words) and _has_uniform_case(name_str) and all(_is_plain_name_word(word) for word in name_words):
+            if len(parts) == 2:
+                return " ".join(part_words[1]), " ".join(part_words[0])
+            if len(part_words[0]) >= 2:
+                return " ".join(part_words[0][:-1]), part_words[0][-1]
+
+    name = HumanName(name_str)
+    return " ".join([name.first, name.middle]).strip(), name.last
+
+def _has_uniform_case(name_str: str) -> bool:
+    """
+    True for names written all upper case, all lower case or with capitalized words.
+
+    HumanName reads a single upper-case word after a comma in a mixed-case
+    name as a suffix ("Will Mann, ULRIKE"), so such names are left to it.
+    """
+    return name_str.isupper() or name_str.islower() or name_str == name_str.title()
+
+def _is_plain_name_word(word: str) -> bool:
+    """True for words of letters (optionally joined by hyphens) that HumanName has no special meaning for."""
+    if not PLAIN_NAME_WORD_PATTERN.fullmatch(word):
+        return False
+
+    word_lower = word.lower()
+    return not any(word_lower in word_set for word_set in HUMAN_NAME_WORD_SETS)
+
+def split_full_name_column(full_name_column: pd.Series) -> pd.DataFrame:
+    """
+    Splits a column of full names like split_full_name, once per distinct name.
+
+    Args:
+        full_name_column: The full names.
+
+    Returns:
+        A DataFrame with the index of full_name_column and the columns title,
+        first_name and last_name.
+    """
+    codes, uniques = utils.factorize_by_value_and_type(full_name_column)
+
+    memo = get_normalization_memo()
+    if memo is None:
+        packed_names = [_pack_split_name(split_full_name(name)) for name in uniques]
+    else:
+        packed_names = memo.apply(
+            "split_full_name", SPLIT_NAME_MEMO_VERSION, uniques, lambda name: _pack_split_name(split_full_name(name))
+        )
+
+    # Missing values have code -1 and pick up the appended empty name.
+    unique_parts = np.empty((len(uniques) + 1, len(SPLIT_NAME_COLUMNS)), dtype=object)
+    unique_parts[:] = ""
+    for position, packed_name in enumerate(packed_names):
+        unique_parts[position] = None if packed_name is None else packed_name.split(SPLIT_NAME_SEPARATOR)
+
+    return pd.DataFrame(unique_parts[codes], index=full_name_column.index, columns=SPLIT_NAME_COLUMNS)
+
+def _pack_split_name(split_name: dict) -> str:
+    """Joins the parts of a split name into one memo value; organizations (all None) become None."""
+    if split_name["last_name"] is None:
+        return None
+    return SPLIT_NAME_SEPARATOR.join(split_name[column] for column in SPLIT_NAME_COLUMNS)
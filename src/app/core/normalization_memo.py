@@ -0,0 +1,173 @@
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+DEFAULT_MEMO_PATH = Path.home() / ".cache" / "vodec" / "normalization.sqlite3"
+
+# SQLite limits the number of bound parameters per statement, so lookups go in batches.
+LOOKUP_BATCH_SIZE = 500
+
+def memo_key(value: Any) -> str:
+    """Builds the stored key of a raw value; the type is part of it, so 1, 1.0 and "1" stay apart."""
+    return f"{type(value).__name__}:{value}"
+
+def is_storable_result(result: Any) -> bool:
+    """Returns True for results that come back from SQLite with the same type and value."""
+    if result is None or type(result) is str:
+        return True
+    if type(result) is int:
+        return -2 ** 63 <= result < 2 ** 63
+    return type(result) is float and not math.isnan(result)
+
+class NormalizationMemo:
+    """
+    Persistent store of formatter results across runs, kept in one SQLite file.
+
+    Entries are keyed by formatter name and raw input value. Every formatter
+    is registered with a version; when a formatter is used with another
+    version than the stored one, all of its entries are dropped. Results are
+    stored as plain SQLite values, so only None, text and numbers are
+    memoized; other results are computed on every run.
+    Use it as a context manager so the connection is closed afterwards.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_MEMO_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._versions: Dict[str, str] = {}
+
+        self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS formatters (name TEXT PRIMARY KEY, version TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                "formatter TEXT NOT NULL, raw_value TEXT NOT NULL, result, "
+                "PRIMARY KEY (formatter, raw_value)) WITHOUT ROWID"
+            )
+
+    def __enter__(self) -> "NormalizationMemo":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the database connection."""
+        self._connection.close()
+
+    def _sync_version(self, formatter: str, version: Union[int, str]):
+        """Registers a formatter version and drops the entries of any other version."""
+        version = str(version)
+        if self._versions.get(formatter) == version:
+            return
+
+        row = self._connection.execute("SELECT version FROM formatters WHERE name = ?", (formatter,)).fetchone()
+        if row is None or row[0] != version:
+            with self._connection:
+                self._connection.execute("DELETE FROM memo WHERE formatter = ?", (formatter,))
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO formatters (name, version) VALUES (?, ?)", (formatter, version)
+                )
+
+        self._versions[formatter] = version
+
+    def lookup(self, formatter: str, version: Union[int, str], keys: Iterable[str]) -> Dict[str, Any]:
+        """Returns the stored results for the given keys; keys without an entry are left out."""
+        keys = list(keys)
+        found = {}
+
+        with self._lock:
+            self._sync_version(formatter, version)
+
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + LOOKUP_BATCH_SIZE]
+                rows = self._connection.execute(
+                    f"SELECT raw_value, result FROM memo WHERE formatter = ? "
+                    f"AND raw_value IN ({', '.join('?' * len(batch))})",
+                    [formatter, *batch]
+                )
+                found.update(rows.fetchall())
+
+        return found
+
+    def store(self, formatter: str, version: Union[int, str], results: Dict[str, Any]) -> bool:
+        """
+        Writes results for a formatter version.
+
+        Results that SQLite would not hand back unchanged are skipped. Returns
+        False if the database could not be written, e.g. because another
+        process holds the lock.
+        """
+        rows = [
+            (formatter, key, result) for key, result in results.items()
+            if is_storable_result(result)
+        ]
+
+        try:
+            with self._lock:
+                self._sync_version(formatter, version)
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO memo (formatter, raw_value, result) VALUES (?, ?, ?)", rows
+                    )
+        except sqlite3.Error:
+            print(f"Normalization results of '{formatter}' could not be stored.")
+            return False
+
+        return True
+
+    def apply(
+        self,
+        formatter: str,
+        version: Union[int, str],
+        values: Iterable[Any],
+        function: Callable[[Any], Any]
+    ) -> List[Any]:
+        """
+        Maps distinct values through function, computing only the values not stored yet.
+
+        New results are written back in one transaction.
+        """
+        values = list(values)
+        keys = [memo_key(value) for value in values]
+        found = self.lookup(formatter, version, set(keys))
+
+        new_results = {}
+        results = []
+        for key, value in zip(keys, values):
+            if key in found:
+                results.append(found[key])
+            else:
+                result = new_results[key] = function(value)
+                results.append(result)
+
+        if new_results:
+            self.store(formatter, version, new_results)
+
+        return results
+
+    def clear(self):
+        """Deletes all entries and registered versions."""
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM memo")
+                self._connection.execute("DELETE FROM formatters")
+            self._versions.clear()
+
+_active_memo: Optional[NormalizationMemo] = None
+
+def set_normalization_memo(memo: Optional[NormalizationMemo]):
+    """Makes the formatters consult memo for the rest of the process; None switches it off again."""
+    global _active_memo
+    _active_memo = memo
+
+def get_normalization_memo() -> Optional[NormalizationMemo]:
+    """Returns the memo the formatters consult, or None if none is set."""
+    return _active_memo
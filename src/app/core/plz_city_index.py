@@ -0,0 +1,216 @@
+import threading
+from pathlib import Path
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
+
+from app.core.KVResolver import (
+    DEFAULT_ASSET_PATH,
+    PLZ_SLOTS,
+    asset_content_hash,
+    compiled_mapping_path,
+    load_compiled_mapping,
+    postcodes_to_int,
+    save_compiled_mapping
+)
+
+CITY_INDEX_SUFFIX = ".cities.npz"
+# Bump when the arrays written by PLZCityIndex._compile_index change.
+CITY_INDEX_VERSION = 1
+
+# Sheets of plz_kv_mapping.xlsx: the register lists every place of a PLZ in its own
+# row (PLZ in A, place in B), the place-name sheet one row per PLZ with the main
+# place first ("Großenhain, Ebersbach u.a.").
+REGISTER_SHEET = 0
+PLACE_NAMES_SHEET = "Tabelle1"
+
+# City codes for values that are not a known place, or no value at all.
+UNKNOWN_CITY = -1
+MISSING_CITY = -2
+
+def normalize_city_keys(city_column: pd.Series) -> np.ndarray:
+    """
+    Builds comparison keys for city names: case-folded, whitespace collapsed.
+
+    Returns:
+        An object array aligned with the column, NaN for missing or blank values.
+    """
+    codes, uniques = pd.factorize(city_column)
+    unique_keys = pd.Series(uniques, dtype=object).astype(str).str.casefold().str.split().str.join(" ")
+    unique_keys = unique_keys.where(unique_keys != "")
+
+    # Missing values have code -1 and pick up the appended NaN.
+    return np.append(unique_keys.to_numpy(dtype=object), np.nan)[codes]
+
+def _split_place_names(place_names: pd.Series) -> pd.Series:
+    """Splits "Riesa, Stauchitz u.a." into one place per row, keeping the index."""
+    places = place_names.astype(str).str.replace(r"\s+u\.\s*a\.$", "", regex=True).str.split(",")
+    places = places.explode().str.strip()
+    return places[places != ""]
+
+class PLZCityIndex:
+    """
+    Reference index of the places that belong to each PLZ, built from plz_kv_mapping.xlsx.
+
+    Places are stored as a code table of normalized names. Valid PLZ/place
+    combinations are kept as a sorted array of plz * place_count + place_code,
+    and the main place of every PLZ as a dense array with one slot per
+    postcode, so whole columns are checked or filled with NumPy lookups.
+    """
+
+    def __init__(self, asset_path: Union[str, Path] = DEFAULT_ASSET_PATH, use_compiled: bool = True):
+        """
+        Initializes the index from the mapping workbook, or from its compiled
+        form next to the asset if the asset content has not changed.
+        """
+        try:
+            source_hash = asset_content_hash(asset_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PLZ lookup file not found at: {asset_path}")
+
+        compiled_path = compiled_mapping_path(asset_path, CITY_INDEX_SUFFIX)
+        compiled_index = load_compiled_mapping(compiled_path, source_hash, CITY_INDEX_VERSION) if use_compiled else None
+
+        if compiled_index is None:
+            compiled_index = self._compile_index(asset_path)
+            if use_compiled:
+                save_compiled_mapping(compiled_path, source_hash, compiled_index, CITY_INDEX_VERSION)
+
+        city_keys = compiled_index["city_keys"].tolist()
+        self.city_key_index = pd.Index(city_keys, dtype=object)
+        self.city_labels = np.array([np.nan] + compiled_index["city_labels"].tolist(), dtype=object)
+        self.pair_keys = compiled_index["pair_keys"]
+        self.main_city_index = compiled_index["main_city_index"]
+
+    def _compile_index(self, asset_path: Union[str, Path]) -> Dict[str, np.ndarray]:
+        """
+        Reads the place names of the mapping workbook into the arrays behind the index.
+
+        main_city_index holds, per PLZ, the code of its main place counted from 1;
+        0 means the PLZ is unknown. The main place is the first one of the
+        place-name sheet, or the first register row if the sheet has no entry.
+        """
+        try:
+            sheets = pd.read_excel(asset_path, sheet_name=[REGISTER_SHEET, PLACE_NAMES_SHEET], header=0)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PLZ lookup file not found at: {asset_path}")
+
+        register_df = sheets[REGISTER_SHEET]
+        place_names_df = sheets[PLACE_NAMES_SHEET]
+
+        if register_df.shape[1] < 2 or place_names_df.shape[1] < 2:
+            raise ValueError("The Excel file needs the PLZ in A and the place in B of both place sheets.")
+
+        places = _split_place_names(place_names_df.iloc[:, 1])
+        place_postcodes = postcodes_to_int(place_names_df.iloc[:, 0])[places.index]
+
+        # Register rows first, so they come first among equal PLZ for the main-place fallback.
+        postcodes = np.concatenate([postcodes_to_int(register_df.iloc[:, 0]), place_postcodes])
+        names = pd.concat([register_df.iloc[:, 1], places], ignore_index=True)
+        keys = normalize_city_keys(names)
+
+        valid = (postcodes >= 0) & pd.notna(keys)
+        postcodes, names, keys = postcodes[valid], names[valid].astype(str).str.strip(), keys[valid]
+
+        city_codes, city_keys = pd.factorize(keys)
+        city_labels = names.groupby(city_codes).first()
+
+        pair_keys = np.unique(postcodes * len(city_keys) + city_codes)
+
+        main_city_index = np.zeros(PLZ_SLOTS + 1, dtype=np.int32)
+
+        unique_postcodes, first_rows = np.unique(postcodes, return_index=True)
+        main_city_index[unique_postcodes] = city_codes[first_rows] + 1
+
+        # The first place of the place-name sheet overrides the register order.
+        first_places = places[~places.index.duplicated()]
+        first_place_postcodes = postcodes_to_int(place_names_df.iloc[:, 0])[first_places.index]
+        first_place_codes = pd.Index(city_keys).get_indexer(normalize_city_keys(first_places))
+        main_place = (first_place_postcodes >= 0) & (first_place_codes >= 0)
+        main_city_index[first_place_postcodes[main_place]] = first_place_codes[main_place] + 1
+
+        return {
+            "city_keys": np.array(city_keys, dtype=str),
+            "city_labels": np.array(city_labels.tolist(), dtype=str),
+            "pair_keys": pair_keys,
+            "main_city_index": main_city_index
+        }
+
+    def city_codes(self, city_column: pd.Series) -> np.ndarray:
+        """
+        Looks up the place code of every city of a column.
+
+        Returns:
+            An int64 array aligned with the column with the place code,
+            UNKNOWN_CITY for names not in the reference and MISSING_CITY for
+            missing or blank values.
+        """
+        codes, uniques = pd.factorize(city_column)
+        unique_keys = normalize_city_keys(pd.Series(uniques, dtype=object))
+
+        unique_city_codes = np.where(
+            pd.isna(unique_keys),
+            MISSING_CITY,
+            self.city_key_index.get_indexer(unique_keys)
+        ).astype(np.int64)
+
+        # Missing values have code -1 and pick up the appended MISSING_CITY.
+        return np.append(unique_city_codes, MISSING_CITY)[codes]
+
+    def check_city_plz_pairs(self, plz_column: pd.Series, city_column: pd.Series) -> pd.Series:
+        """
+        Checks whether each city is one of the places of the PLZ in the same row.
+
+        Both columns are matched by position.
+
+        Returns:
+            A boolean Series with the index of city_column: True if the pair is
+            in the reference, False if the PLZ is known but the city is not one
+            of its places, NA if either value is missing or the PLZ is unknown.
+        """
+        postcodes = postcodes_to_int(plz_column)
+        city_codes = self.city_codes(city_column)
+
+        pair_keys = postcodes * len(self.city_key_index) + city_codes
+        positions = np.minimum(np.searchsorted(self.pair_keys, pair_keys), len(self.pair_keys) - 1)
+        agrees = (self.pair_keys[positions] == pair_keys) & (city_codes >= 0) & (postcodes >= 0)
+
+        decidable = (self.main_city_index[postcodes] > 0) & (city_codes != MISSING_CITY)
+
+        result = pd.array(agrees, dtype="boolean")
+        result[~decidable] = pd.NA
+
+        return pd.Series(result, index=city_column.index, name=city_column.name)
+
+    def lookup_cities(self, plz_column: pd.Series) -> pd.Series:
+        """Returns the main place of every PLZ of a column, NaN for unknown postcodes."""
+        cities = self.city_labels[self.main_city_index[postcodes_to_int(plz_column)]]
+        return pd.Series(cities, index=plz_column.index)
+
+    def fill_missing_cities(self, plz_column: pd.Series, city_column: pd.Series) -> pd.Series:
+        """
+        Fills missing or blank cities with the main place of the PLZ in the same row.
+
+        Both columns are matched by position. Cities that are present are kept as they are.
+        """
+        missing = self.city_codes(city_column) == MISSING_CITY
+        cities = self.lookup_cities(plz_column).to_numpy()
+
+        filled = np.where(missing, cities, city_column.to_numpy(dtype=object))
+
+        return pd.Series(filled, index=city_column.index, name=city_column.name)
+
+_indexes: Dict[Path, PLZCityIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_plz_city_index(asset_path: Union[str, Path] = DEFAULT_ASSET_PATH) -> PLZCityIndex:
+    """Returns the process-wide PLZCityIndex for an asset, created on first use."""
+    index_key = Path(asset_path).resolve()
+
+    with _indexes_lock:
+        index = _indexes.get(index_key)
+        if index is None:
+            index = PLZCityIndex(index_key)
+            _indexes[index_key] = index
+
+    return index
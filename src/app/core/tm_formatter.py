@@ -1,6 +1,7 @@
 import pandas as pd
 
 from app.model.tm import TMModel
+from app.core import utils
 
 TM_HEADER_MAPPING = {
     "VO-ID": "vo_id",
@@ -19,6 +20,9 @@ TM_HEADER_MAPPING = {
     "ATC-Bezeichnung": "atc_name"
 }
 
+# TM integers in text: digits without a sign, anything after the first "." is cut off ("3.abc" is 3).
+TM_INTEGER_TEXT_PATTERN = r"(?s)^([0-9]+)(?:\..*)?$"
+
 def format_tm_data(raw_df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans and formats the raw TM DataFrame.
@@ -41,7 +45,7 @@ def validate_tm_medicine_name_column(am_name: pd.Series) -> pd.Series:
             return None
         
         return str(am_name).title()
-    return am_name.apply(validate_single_medicine_name)
+    return utils.apply_on_uniques(am_name, validate_single_medicine_name)
 
 def validate_tm_charge_nr_column(charge_nr: pd.Series) -> pd.Series:
     """Formats charge numbers to proper case."""
@@ -50,34 +54,15 @@ def validate_tm_charge_nr_column(charge_nr: pd.Series) -> pd.Series:
             return None
         
         return str(charge_nr).title()
-    return charge_nr.apply(validate_single_charge_nr)
+    return utils.apply_on_uniques(charge_nr, validate_single_charge_nr)
 
 def validate_tm_position_column(position: pd.Series) -> pd.Series:
     """Validates that the position is a valid integer."""
-    def validate_single_position(pos):
-        if pd.isna(pos):
-            return None
-
-        pos_str = str(pos).split('.')[0] 
-        
-        if pos_str.isdigit():
-            return int(pos_str)
-        return None
-    return position.apply(validate_single_position)
+    return utils.parse_integer_column(position, minimum=0, text_pattern=TM_INTEGER_TEXT_PATTERN)
 
 def validate_tm_factor_indicator_column(factor_indicator: pd.Series) -> pd.Series:
     """Validates that the factor indicator is a valid integer."""
-
-    def validate_single_factor_indicator(indicator):
-        if pd.isna(indicator):
-            return None
-        
-        indicator_str = str(indicator).split('.')[0]
-
-        if indicator_str.isdigit():
-            return int(indicator_str)
-        return None
-    return factor_indicator.apply(validate_single_factor_indicator)
+    return utils.parse_integer_column(factor_indicator, minimum=0, text_pattern=TM_INTEGER_TEXT_PATTERN)
 
 def validate_tm_normalize_quantity_factor_column(quantity_factor_column: pd.Series, promille_threshold: int = 100) -> pd.Series:
     """Normalizes the quantity factor column (handles promille)."""
@@ -90,16 +75,7 @@ def validate_tm_normalize_quantity_factor_column(quantity_factor_column: pd.Seri
 
 def validate_tm_price_indicator_column(price_indicator: pd.Series) -> pd.Series:
     """Validates that the price indicator is a valid integer."""
-    def validate_single_price_indicator(indicator):
-        if pd.isna(indicator):
-            return None
-        
-        indicator_str = str(indicator).split('.')[0]
-
-        if indicator_str.isdigit():
-            return int(indicator_str)
-        return None
-    return price_indicator.apply(validate_single_price_indicator)
+    return utils.parse_integer_column(price_indicator, minimum=0, text_pattern=TM_INTEGER_TEXT_PATTERN)
 
 def validate_tm_partial_quantity_price_column(partial_quantity_price: pd.Series) -> pd.Series:
     """Validates that the price is a valid number and rounds it."""
@@ -112,4 +88,4 @@ def validate_tm_partial_quantity_price_column(partial_quantity_price: pd.Series)
             return round(price_float, 2)
         except (ValueError, TypeError):
             return None
-    return partial_quantity_price.apply(validate_single_partial_quantity_price)
+    return utils.apply_on_uniques(partial_quantity_price, validate_single_partial_quantity_price)
@@ -1,35 +1,261 @@
+import hashlib
 import re
-from typing import List
+import warnings
+from typing import Any, Callable, Dict, List, Optional
 import numpy as np
 import pandas as pd
-from datetime import datetime
+import pyarrow as pa
+import pyarrow.compute as pc
+from datetime import date, datetime
 
+from app.core.normalization_memo import get_normalization_memo
+
+# Whole numbers in text: sign and digits, then an optional decimal part that is cut off.
+INTEGER_TEXT_PATTERN = r"^([+-]?[0-9]+)(?:\.[0-9]*)?$"
+
+# Four or more equal digits in a row. Spelled out, as Arrow's RE2 has no backreferences.
+REPEATED_DIGIT_PATTERN = re.compile("|".join(str(digit) * 4 for digit in range(10)))
+
+# ID text the Arrow checks handle exactly like str.strip and str.isdigit: ASCII digits and whitespace.
+PLAIN_ID_PATTERN = r"^[ \t\n\r\x0b\x0c]*[0-9]+[ \t\n\r\x0b\x0c]*$"
+
+# The whitespace PLAIN_ID_PATTERN allows around an ID.
+ASCII_WHITESPACE = " \t\n\r\x0b\x0c"
+
+# IDs Excel or a CSV export wrote as floats ("123456789.0"); the digits before the point are the ID.
+FLOAT_FORMATTED_ID_PATTERN = r"([0-9]+)\.0*"
+
+# Date formats the date parser recognizes, as a pattern over the stripped text and the
+# format string its group is parsed with. The patterns exclude each other, so the order
+# only decides which group is tried first. Excel serial numbers have no format string.
+DATE_FORMATS = {
+    "dd.mm.yyyy": (r"^[0-9]{1,2}\.[0-9]{1,2}\.[0-9]{4}$", "%d.%m.%Y"),
+    "dd.mm.yy": (r"^[0-9]{1,2}\.[0-9]{1,2}\.[0-9]{2}$", "%d.%m.%y"),
+    "yyyy-mm-dd": (r"^[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}$", "%Y-%m-%d"),
+    "dd-mm-yyyy": (r"^[0-9]{1,2}-[0-9]{1,2}-[0-9]{4}$", "%d-%m-%Y"),
+    "dd-mm-yy": (r"^[0-9]{1,2}-[0-9]{1,2}-[0-9]{2}$", "%d-%m-%y"),
+    "yyyymmdd": (r"^[0-9]{8}$", "%Y%m%d"),
+    "excel serial": (r"^[0-9]{5}(?:\.[0-9]+)?$", None),
+}
+EXCEL_SERIAL_ORIGIN = pd.Timestamp("1899-12-30")
+
+# A time of day after the date ("2024-01-31 12:00:00"); dates are parsed without it.
+DATE_TIME_SUFFIX_PATTERN = r"[ T][0-9]{1,2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]+)?)?$"
+
+# Values sampled to detect the formats of a column, and the share of them a format needs.
+DATE_FORMAT_SAMPLE_SIZE = 1000
+DOMINANT_DATE_FORMAT_SHARE = 0.05
+
+# Check-digit rules: PZN modulo 11 over 8 digits, LANR modulo 10 over 9 digits.
+PZN_DIGITS = 8
+PZN_CHECK_WEIGHTS = np.arange(1, 8)
+LANR_DIGITS = 9
+LANR_CHECK_WEIGHTS = np.array([4, 9, 4, 9, 4, 9])
+
+# Kinds reported by infer_dtype whose values cannot equal a value of another type.
+SINGLE_KIND_DTYPES = {"empty", "string", "bytes", "integer", "floating", "boolean"}
+
+def factorize_by_value_and_type(column: pd.Series):
+    """
+    Factorizes a column like pd.factorize, but keeps values of different types apart.
+
+    pd.factorize treats 1, 1.0 and True as one value, while str() and the
+    formatters do not. Columns holding one kind of value are factorized
+    directly; only object columns that mix kinds take the extra pass over
+    the row types.
+
+    Returns:
+        The codes (-1 for missing values) and the distinct values as an object array.
+    """
+    codes, uniques = pd.factorize(column)
+
+    if column.dtype != object or pd.api.types.infer_dtype(column, skipna=True) in SINGLE_KIND_DTYPES:
+        return codes, np.asarray(uniques, dtype=object)
+
+    values = column.to_numpy()
+    type_codes, type_uniques = pd.factorize(np.fromiter(map(type, values), dtype=object, count=len(values)))
+
+    present = codes >= 0
+    present_codes, _ = pd.factorize(codes[present] * len(type_uniques) + type_codes[present])
+
+    # factorize numbers the values in order of appearance, so the first rows line up with the codes.
+    _, first_rows = np.unique(present_codes, return_index=True)
+
+    codes = np.full(len(values), -1, dtype=np.intp)
+    codes[present] = present_codes
+
+    return codes, values[present][first_rows]
+
+def apply_on_uniques(
+    column: pd.Series,
+    function: Callable[[Any], Any],
+    memo_name: Optional[str] = None,
+    memo_version: int = 1
+) -> pd.Series:
+    """
+    Applies a scalar function to a column like Series.apply, but once per distinct value.
+
+    The column is factorized, the function runs on each distinct value (and
+    once per kind of missing value, so None, NaN, <NA> and NaT keep their own
+    results) and the results are broadcast back through the codes. The result dtype is inferred the same
+    way Series.apply does, so a formatter can switch without changing its
+    output. The function must not depend on anything but its argument.
+    Categorical columns are passed on to Series.apply, which already maps
+    their categories only.
+
+    Args:
+        column: The column to format.
+        function: The per-value formatter.
+        memo_name: Optional name under which the results of function are kept in
+            the active NormalizationMemo, so later runs skip known values.
+        memo_version: Version of function; bump it whenever its output changes,
+            which drops the memoized results.
+
+    Returns:
+        A Series with the index and name of column.
+    """
+    memo = get_normalization_memo() if memo_name else None
+
+    if len(column) == 0:
+        return column.apply(function)
+
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        if memo is None:
+            return column.apply(function)
+
+        categories = column.cat.categories.to_numpy(dtype=object)
+        category_results = dict(zip(categories, memo.apply(memo_name, memo_version, categories, function)))
+        return column.apply(lambda value: category_results[value] if value in category_results else function(value))
+
+    codes, uniques = factorize_by_value_and_type(column)
+
+    # Missing values all have code -1; they are told apart by type and get codes after the uniques.
+    missing_rows = np.flatnonzero(codes < 0)
+    missing_values = column.iloc[missing_rows]
+    missing_codes, missing_types = pd.factorize(
+        np.fromiter(map(type, missing_values), dtype=object, count=len(missing_values))
+    )
+    missing_firsts = missing_values.iloc[np.unique(missing_codes, return_index=True)[1]]
+    codes[missing_rows] = len(uniques) + missing_codes
+
+    unique_results = np.empty(len(uniques) + len(missing_types), dtype=object)
+    if memo is None:
+        unique_results[:len(uniques)] = [function(value) for value in uniques]
+    else:
+        unique_results[:len(uniques)] = memo.apply(memo_name, memo_version, uniques, function)
+    unique_results[len(uniques):] = [function(value) for value in missing_firsts]
+
+    results = pd.Series(unique_results[codes], index=column.index, name=column.name, dtype=object)
+
+    return results.infer_objects()
+
+def parse_integer_column(
+    column: pd.Series,
+    minimum: Optional[int] = None,
+    maximum: Optional[int] = None,
+    text_pattern: str = INTEGER_TEXT_PATTERN
+) -> pd.Series:
+    """
+    Parses a column of whole numbers into a nullable Int64 column.
+
+    Numbers are truncated toward zero. Text is trimmed and read with
+    text_pattern, by default an optional sign and digits, optionally followed
+    by a decimal part that is cut off ("3", " 3 ", "3.0"). Booleans, other
+    text and values outside minimum..maximum become <NA>.
+
+    Args:
+        column: The column to parse.
+        minimum: Optional smallest valid value.
+        maximum: Optional largest valid value.
+        text_pattern: Regular expression for text; its first group is the integer.
+
+    Returns:
+        An Int64 Series with the index and name of column.
+    """
+    if pd.api.types.is_bool_dtype(column):
+        values = np.full(len(column), np.nan)
+    elif pd.api.types.is_numeric_dtype(column):
+        values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        codes, uniques = factorize_by_value_and_type(column)
+        # Missing values have code -1 and pick up the appended NaN.
+        values = np.append(_parse_integer_values(uniques, text_pattern), np.nan)[codes]
+
+    values = np.trunc(values)
+
+    valid = np.isfinite(values) & (np.abs(values) < 2 ** 63)
+    if minimum is not None:
+        valid &= values >= minimum
+    if maximum is not None:
+        valid &= values <= maximum
+
+    integers = pd.arrays.IntegerArray(np.where(valid, values, 0).astype(np.int64), ~valid)
+
+    return pd.Series(integers, index=column.index, name=column.name)
+
+def _parse_integer_values(values: np.ndarray, text_pattern: str) -> np.ndarray:
+    """Reads distinct raw values as floats for parse_integer_column, NaN where they are no number."""
+    parsed = np.full(len(values), np.nan)
+
+    is_bool = np.array([isinstance(value, (bool, np.bool_)) for value in values], dtype=bool)
+    is_number = np.array([isinstance(value, (int, float, np.number)) for value in values], dtype=bool) & ~is_bool
+    parsed[is_number] = values[is_number].astype(np.float64)
+
+    is_text = ~is_number & ~is_bool & pd.notna(values)
+    integer_parts = pd.Series(values[is_text], dtype=object).astype(str).str.strip().str.extract(
+        text_pattern, expand=False
+    )
+    parsed[is_text] = pd.to_numeric(integer_parts, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return parsed
+
+# Bump when clean_single_name changes its output, which drops its memoized results.
+NAME_MEMO_VERSION = 1
 
 def format_and_clean_name_column(name_column: pd.Series) -> pd.Series:
     """Cleans and formats a column of names (first names, last names)."""
-    def clean_single_name(name):
-        if pd.isna(name):
-            return None
+    return apply_on_uniques(
+        name_column, clean_single_name, memo_name="format_and_clean_name_column", memo_version=NAME_MEMO_VERSION
+    )
 
-        name_str = str(name).strip()
+def clean_single_name(name):
+    """Cleans one name: whitespace collapsed, title case, None for blanks and digits."""
+    if pd.isna(name):
+        return None
 
-        name_str = " ".join(name_str.split())
+    name_str = str(name).strip()
 
-        if not name_str:
-            return None
-        if name_str.isdigit():
-            return None
-            
-        return name_str.title()
+    name_str = " ".join(name_str.split())
+
+    if not name_str:
+        return None
+    if name_str.isdigit():
+        return None
         
-    return name_column.apply(clean_single_name)
+    return name_str.title()
 
 def validate_plz_column(plz_column: pd.Series) -> pd.Series:
-    """Validates and cleans a column of German postal codes (for doctors, pharmacies)."""
+    """
+    Validates and cleans a column of German postal codes (for doctors, pharmacies).
+
+    The import schema delivers postcodes as text, which is trimmed and, like
+    an ID, loses a decimal part of zeros ("10115.0"); four digits get their
+    lost leading zero back. Numbers, e.g. from an import without schema, are
+    taken as whole numbers.
+    """
     def validate_single_plz(plz):
-        if pd.isna(plz):
+        if isinstance(plz, (bool, np.bool_)) or pd.isna(plz):
             return None
-        plz_str = str(plz).split('.')[0].strip()
+
+        if isinstance(plz, (int, np.integer, float, np.floating)):
+            if not float(plz).is_integer() or not 1000 <= plz <= 99999:
+                return None
+            return f"{int(plz):05d}"
+
+        plz_str = str(plz).strip()
+        whole_number = re.fullmatch(FLOAT_FORMATTED_ID_PATTERN, plz_str)
+        if whole_number:
+            plz_str = whole_number.group(1)
 
         if len(plz_str) == 4 and plz_str.isdigit():
             plz_str = "0" + plz_str
@@ -39,7 +265,126 @@ def validate_plz_column(plz_column: pd.Series) -> pd.Series:
         
         else:
             return None
-    return plz_column.apply(validate_single_plz)
+    return apply_on_uniques(plz_column, validate_single_plz)
+
+def normalize_id(id_value: Any) -> Optional[str]:
+    """Normalizes a single ID by the rules of normalize_id_column."""
+    if pd.isna(id_value):
+        return None
+
+    if isinstance(id_value, (float, np.floating)) and id_value.is_integer():
+        return str(int(id_value))
+    if not isinstance(id_value, str):
+        return str(id_value)
+
+    id_str = id_value.strip(ASCII_WHITESPACE)
+    whole_number = re.fullmatch(FLOAT_FORMATTED_ID_PATTERN, id_str)
+    if whole_number:
+        return whole_number.group(1)
+
+    return id_str or None
+
+def normalize_id_column(id_column: pd.Series) -> pd.Series:
+    """
+    Brings an ID column into one text form, whatever type the reader gave it.
+
+    - Whole floats lose their decimal part (123456789.0 becomes "123456789"),
+      other numbers become their str().
+    - Text is stripped of ASCII whitespace and digits written as a float
+      ("123456789.0") lose the decimal part.
+    - Missing and blank values become None.
+
+    Whole columns of one type are converted with NumPy and Arrow, mixed
+    columns once per distinct value.
+
+    Returns:
+        An object Series with the index and name of id_column.
+    """
+    if pd.api.types.is_integer_dtype(id_column):
+        ids = np.full(len(id_column), None, dtype=object)
+        present = id_column.notna().to_numpy()
+        ids[present] = id_column[present].astype(str).to_numpy(dtype=object)
+    elif pd.api.types.is_float_dtype(id_column):
+        ids = _normalize_float_ids(id_column.to_numpy(dtype=np.float64, na_value=np.nan))
+    else:
+        # Text IDs are mostly distinct, so all-text columns skip the factorization.
+        ids = None
+        if pd.api.types.infer_dtype(id_column, skipna=True) == "string":
+            ids = _normalize_text_ids(id_column.to_numpy(dtype=object))
+
+        if ids is None:
+            codes, uniques = factorize_by_value_and_type(id_column)
+            # Missing values have code -1 and pick up the appended None.
+            ids = np.append(_normalize_id_values(uniques), None)[codes]
+
+    return pd.Series(ids, index=id_column.index, name=id_column.name, dtype=object)
+
+def _normalize_id_values(values: np.ndarray) -> np.ndarray:
+    """Normalizes distinct IDs of any type: floats with NumPy, text with Arrow, the rest one by one."""
+    ids = np.empty(len(values), dtype=object)
+    type_codes, types = pd.factorize(np.fromiter(map(type, values), dtype=object, count=len(values)))
+
+    is_float = np.isin(type_codes, [code for code, kind in enumerate(types) if kind in (float, np.float64)])
+    ids[is_float] = _normalize_float_ids(values[is_float].astype(np.float64))
+
+    is_text = np.isin(type_codes, [code for code, kind in enumerate(types) if kind is str])
+    text_ids = _normalize_text_ids(values[is_text])
+    if text_ids is None:
+        is_text[:] = False
+    else:
+        ids[is_text] = text_ids
+
+    other_rows = np.flatnonzero(~is_float & ~is_text)
+    ids[other_rows] = [normalize_id(value) for value in values[other_rows]]
+
+    return ids
+
+def _normalize_text_ids(values: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Normalizes text IDs with Arrow; missing values become None.
+
+    Returns None if the text cannot be encoded, e.g. because of lone surrogates.
+    """
+    try:
+        text = pa.array(values, type=pa.string(), from_pandas=True)
+    except UnicodeEncodeError:
+        return None
+
+    text = pc.replace_substring_regex(pc.ascii_trim_whitespace(text), f"^{FLOAT_FORMATTED_ID_PATTERN}$", r"\1")
+    text = pc.if_else(pc.equal(text, ""), pa.scalar(None, pa.string()), text)
+
+    return text.to_numpy(zero_copy_only=False)
+
+def _normalize_float_ids(numbers: np.ndarray) -> np.ndarray:
+    """Normalizes float IDs: whole numbers as integer text, NaN as None, the rest by str()."""
+    ids = np.full(len(numbers), None, dtype=object)
+
+    with np.errstate(invalid="ignore"):
+        whole = np.isfinite(numbers) & (np.abs(numbers) < 2 ** 63) & (numbers == np.trunc(numbers))
+    ids[whole] = pc.cast(pa.array(numbers[whole].astype(np.int64)), pa.string()).to_numpy(zero_copy_only=False)
+
+    other_rows = np.flatnonzero(~whole & ~np.isnan(numbers))
+    ids[other_rows] = [normalize_id(number) for number in numbers[other_rows]]
+
+    return ids
+
+def validate_id_number(id_value: Any, required_length: int) -> Optional[str]:
+    """Validates a single ID number by the rules of validate_id_number_column."""
+    if pd.isna(id_value):
+        return None
+
+    id_str = str(id_value).split('.')[0].strip()
+
+    if not id_str.isdigit():
+        return None
+
+    if len(id_str) < required_length:
+        return None
+
+    if re.search(r'(\d)\1{3,}', id_str):
+        return None
+
+    return id_str
 
 def validate_id_number_column(id_column: pd.Series, required_length: int) -> pd.Series:
     """
@@ -50,125 +395,603 @@ def validate_id_number_column(id_column: pd.Series, required_length: int) -> pd.
     - Must not contain the same digit repeated four or more times.
     - Invalid or empty entries are converted to None.
     """
-    
-    def validate_single_id(id_value):
+    validated_df = validate_id_number_columns(id_column.to_frame(name=0), {0: required_length})
+    return validated_df[0].rename(id_column.name)
 
-        if pd.isna(id_value):
-            return None
+def validate_id_number_columns(df: pd.DataFrame, required_lengths: Dict[Any, int]) -> pd.DataFrame:
+    """
+    Validates several ID columns in one pass, each like validate_id_number_column.
 
-        id_str = str(id_value).split('.')[0].strip()
-        
-        if not id_str.isdigit():
-            return None
+    Every column is factorized and its distinct values are reduced to the
+    text in front of the first '.', from numbers without going through
+    str(). Text made of ASCII digits and whitespace is then checked for
+    length and repeated digits for all columns at once with Arrow kernels;
+    other text goes through validate_id_number.
 
-        if len(id_str) < required_length:
-            return None
+    Args:
+        df: The DataFrame holding the ID columns.
+        required_lengths: Mapping of column name to the minimum ID length.
 
-        if re.search(r'(\d)\1{3,}', id_str):
-            return None
+    Returns:
+        A copy of df with the given columns validated.
+    """
+    columns = list(required_lengths)
+    validated_df = df.copy()
 
-        return id_str
-            
-    return id_column.apply(validate_single_id)
+    if not columns or df.empty:
+        return validated_df
+
+    codes, candidates, fallbacks = zip(*(
+        _id_number_candidates(df[column], required_lengths[column]) for column in columns
+    ))
+
+    ids = pa.concat_arrays(candidates)
+    lengths = pa.array(np.repeat(
+        [required_lengths[column] for column in columns],
+        [len(column_candidates) for column_candidates in candidates]
+    ))
+
+    valid = pc.and_(
+        pc.greater_equal(pc.utf8_length(ids), lengths),
+        pc.invert(pc.match_substring_regex(ids, REPEATED_DIGIT_PATTERN.pattern))
+    )
+    ids = pc.if_else(pc.fill_null(valid, False), ids, None).to_numpy(zero_copy_only=False)
+
+    offsets = np.cumsum([0] + [len(column_candidates) for column_candidates in candidates])
+
+    for position, column in enumerate(columns):
+        unique_ids = ids[offsets[position]:offsets[position + 1]]
+
+        fallback_uniques, fallback_ids = fallbacks[position]
+        unique_ids[fallback_uniques] = fallback_ids
+
+        # Missing values have code -1 and pick up the appended None.
+        column_ids = np.append(unique_ids, None)[codes[position]]
+
+        validated_df[column] = pd.Series(column_ids, index=df.index, name=column, dtype=object)
+
+    return validated_df
+
+def _id_number_candidates(id_column: pd.Series, required_length: int):
+    """
+    Factorizes an ID column and prepares its distinct values for the Arrow checks.
+
+    Returns:
+        The codes of the rows (-1 for missing values); a string array with,
+        per distinct value, str(value).split('.')[0] without surrounding
+        whitespace where that is made of ASCII digits, else null; and the
+        positions and validated IDs of the distinct values that went through
+        validate_id_number instead.
+    """
+    no_fallback = (np.array([], dtype=np.intp), np.array([], dtype=object))
+
+    if pd.api.types.is_bool_dtype(id_column):
+        return np.full(len(id_column), -1, dtype=np.intp), pa.array([], type=pa.string()), no_fallback
+
+    if pd.api.types.is_integer_dtype(id_column):
+        codes, uniques = pd.factorize(id_column)
+        numbers = pa.array(np.asarray(uniques))
+        ids = pc.if_else(pc.less(numbers, pa.scalar(0, numbers.type)), None, pc.cast(numbers, pa.string()))
+        return codes, ids, no_fallback
+
+    if pd.api.types.is_float_dtype(id_column):
+        # Factorized on the bit patterns, so 0.0 and -0.0 ("0" and "-0") stay apart.
+        bits = np.ascontiguousarray(id_column.to_numpy(dtype=np.float64, na_value=np.nan)).view(np.int64)
+        codes, unique_bits = pd.factorize(bits)
+        numbers = unique_bits.view(np.float64)
+
+        unsigned = np.isfinite(numbers) & ~np.signbit(numbers)
+        with np.errstate(invalid="ignore"):
+            # str() writes these floats positionally, so the text in front of '.'
+            # is the truncated number. Others get an exponent and are rare enough
+            # to go through validate_id_number.
+            positional = unsigned & (numbers < 1e16) & ((numbers == 0) | (numbers >= 1e-4))
+
+        integers = pa.array(np.trunc(numbers, where=positional, out=np.zeros_like(numbers)).astype(np.int64))
+        ids = pc.if_else(pa.array(positional), pc.cast(integers, pa.string()), None)
+
+        fallback_uniques = np.flatnonzero(unsigned & ~positional)
+        fallback_ids = np.array(
+            [validate_id_number(number, required_length) for number in numbers[fallback_uniques]],
+            dtype=object
+        )
+        return codes, ids, (fallback_uniques, fallback_ids)
+
+    codes, uniques = factorize_by_value_and_type(id_column)
+    unique_texts = [value if type(value) is str else str(value) for value in uniques]
+
+    try:
+        heads = pc.replace_substring_regex(pa.array(unique_texts, type=pa.string()), r"(?s)\..*", "")
+        is_plain = pc.fill_null(pc.match_substring_regex(heads, PLAIN_ID_PATTERN), False)
+        ids = pc.if_else(is_plain, pc.ascii_trim_whitespace(heads), None)
+        is_plain = is_plain.to_numpy(zero_copy_only=False)
+    except (pa.ArrowException, UnicodeEncodeError):
+        ids = pa.nulls(len(uniques), type=pa.string())
+        is_plain = np.zeros(len(uniques), dtype=bool)
+
+    fallback_uniques = np.flatnonzero(~is_plain)
+    fallback_ids = np.array(
+        [validate_id_number(value, required_length) for value in uniques[fallback_uniques]],
+        dtype=object
+    )
+    return codes, ids, (fallback_uniques, fallback_ids)
+
+def check_pzn_check_digits(pzn_column: pd.Series) -> pd.Series:
+    """
+    Checks the modulo-11 check digit of a column of PZNs.
+
+    The first seven digits of a PZN-8 are weighted 1 to 7; the sum modulo
+    11 is the eighth digit, and a remainder of 10 is never assigned. Old
+    seven-digit PZNs and PZNs read as numbers are padded with leading
+    zeros, which keeps their check digit valid.
+
+    Returns:
+        A boolean Series with the index of pzn_column, NA for missing values
+        and values that are not a number of at most eight digits.
+    """
+    def check(digits: np.ndarray, numbers: np.ndarray) -> np.ndarray:
+        remainder = digits[:, :7] @ PZN_CHECK_WEIGHTS % 11
+        return (remainder != 10) & (remainder == digits[:, 7]) & (numbers > 0)
+
+    return _check_digit_column(pzn_column, PZN_DIGITS, check)
+
+def check_lanr_check_digits(lanr_column: pd.Series) -> pd.Series:
+    """
+    Checks the check digit of a column of LANRs (lifelong doctor numbers).
+
+    The first six digits are weighted alternately 4 and 9; the check digit
+    at position 7 is 10 minus the sum modulo 10, or 0 for a remainder of 0.
+
+    Returns:
+        A boolean Series with the index of lanr_column, NA for missing values
+        and values that are not a number of at most nine digits.
+    """
+    def check(digits: np.ndarray, numbers: np.ndarray) -> np.ndarray:
+        return (10 - digits[:, :6] @ LANR_CHECK_WEIGHTS % 10) % 10 == digits[:, 6]
+
+    return _check_digit_column(lanr_column, LANR_DIGITS, check)
+
+def id_numbers_to_int(id_column: pd.Series, width: int) -> np.ndarray:
+    """
+    Converts a column of IDs into integers, e.g. to read the digits of a BSNR.
+
+    Values count like for the check-digit checks: whole non-negative numbers
+    and ASCII digit text of at most width digits. The conversion runs once
+    per distinct value.
+
+    Returns:
+        An int64 array aligned with the column, with -1 for missing or invalid values.
+    """
+    codes, uniques = pd.factorize(id_column)
+    numbers, is_number = _id_numbers(np.asarray(uniques, dtype=object), width)
+
+    # Missing values have code -1 and pick up the appended -1.
+    return np.append(np.where(is_number, numbers, -1), -1)[codes]
+
+def _check_digit_column(
+    id_column: pd.Series,
+    width: int,
+    check: Callable[[np.ndarray, np.ndarray], np.ndarray]
+) -> pd.Series:
+    """
+    Runs a check-digit rule on the distinct IDs of a column.
+
+    The IDs are read as numbers of at most width digits and expanded into a
+    matrix with one column per digit, padded with leading zeros. check gets
+    that matrix and the numbers and returns True for valid IDs.
+    """
+    codes, uniques = pd.factorize(id_column)
+    numbers, is_number = _id_numbers(np.asarray(uniques, dtype=object), width)
+
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    digits = numbers[:, None] // powers % 10
+
+    # Missing values have code -1 and pick up the appended NA.
+    unique_results = pd.array(np.append(check(digits, numbers), False), dtype="boolean")
+    unique_results[np.append(~is_number, True)] = pd.NA
+
+    return pd.Series(unique_results[codes], index=id_column.index, name=id_column.name)
+
+def _id_numbers(values: np.ndarray, width: int):
+    """
+    Reads distinct IDs as int64 numbers of at most width digits.
+
+    Numbers must be whole and non-negative; text must be ASCII digits, with
+    surrounding whitespace allowed.
+
+    Returns:
+        The numbers (0 where a value is no such number) and a mask of the values that are.
+    """
+    numbers = np.zeros(len(values), dtype=np.int64)
+    is_number = np.zeros(len(values), dtype=bool)
+
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        is_numeric = np.zeros(len(values), dtype=bool)
+        is_text = np.ones(len(values), dtype=bool)
+    else:
+        is_bool = np.array([isinstance(value, (bool, np.bool_)) for value in values], dtype=bool)
+        is_numeric = np.array([isinstance(value, (int, float, np.number)) for value in values], dtype=bool) & ~is_bool
+        is_text = np.array([isinstance(value, str) for value in values], dtype=bool)
+
+    numeric = values[is_numeric].astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        whole = np.isfinite(numeric) & (numeric >= 0) & (numeric < 10 ** width) & (numeric == np.trunc(numeric))
+    numbers[np.flatnonzero(is_numeric)[whole]] = numeric[whole].astype(np.int64)
+    is_number[np.flatnonzero(is_numeric)[whole]] = True
+
+    try:
+        text = pa.array(values[is_text].tolist(), type=pa.string())
+    except UnicodeEncodeError:
+        # Lone surrogates do not encode as UTF-8; text with other characters cannot be ASCII digits anyway.
+        is_text &= np.array([isinstance(value, str) and value.isascii() for value in values], dtype=bool)
+        text = pa.array(values[is_text].tolist(), type=pa.string())
+
+    text = pc.ascii_trim_whitespace(text)
+    is_digit_text = pc.match_substring_regex(text, f"^[0-9]{{1,{width}}}$").to_numpy(zero_copy_only=False)
+    digit_rows = np.flatnonzero(is_text)[is_digit_text]
+    numbers[digit_rows] = pc.cast(text.filter(is_digit_text), pa.int64()).to_numpy()
+    is_number[digit_rows] = True
+
+    return numbers, is_number
+
+# Bump when validate_single_street changes its output, which drops its memoized results.
+STREET_MEMO_VERSION = 1
 
 def validate_street_column(street_column: pd.Series) -> pd.Series:
     """Validates and cleans a column of street names (for doctors, pharmacies)."""
-    def validate_single_plz(street):
-        if pd.isna(street) or not str(street).strip():
-            return None
+    return apply_on_uniques(
+        street_column, validate_single_street, memo_name="validate_street_column", memo_version=STREET_MEMO_VERSION
+    )
 
-        street_str = " ".join(str(street).split())
-        
-        if street_str.isdigit():
-            return None
-        
-        street_str = re.sub(r'(strasse|straße|trasse)\b', 'str.', street_str, flags=re.IGNORECASE)
-        
-        titled_street = street_str.title()
-        
-        # function to ensure that street ads like 1b and 25a are not missleading converted (It stays 1b and not 1B)
-        corrected_street = re.sub(r'(\d)([A-Z])', 
-            lambda m: m.group(1) + m.group(2).lower(), 
-            titled_street
-        )
-        
-        return corrected_street
+def validate_single_street(street):
+    """Cleans one street: whitespace collapsed, "strasse" shortened, title case with house number letters kept."""
+    if pd.isna(street) or not str(street).strip():
+        return None
 
-    return street_column.apply(validate_single_plz)
+    street_str = " ".join(str(street).split())
+    
+    if street_str.isdigit():
+        return None
+    
+    street_str = re.sub(r'(strasse|straße|trasse)\b', 'str.', street_str, flags=re.IGNORECASE)
+    
+    titled_street = street_str.title()
+    
+    # function to ensure that street ads like 1b and 25a are not missleading converted (It stays 1b and not 1B)
+    corrected_street = re.sub(r'(\d)([A-Z])', 
+        lambda m: m.group(1) + m.group(2).lower(), 
+        titled_street
+    )
+    
+    return corrected_street
+
+# Bump when validate_single_city changes its output, which drops its memoized results.
+CITY_MEMO_VERSION = 1
 
 def validate_city_column(city_column: pd.Series) -> pd.Series:
     """Validates and cleans a column of city names (for doctors, pharmacies)."""
-    def validate_single_plz(city):
-        if pd.isna(city) or not str(city).strip():
-            return None
+    return apply_on_uniques(
+        city_column, validate_single_city, memo_name="validate_city_column", memo_version=CITY_MEMO_VERSION
+    )
+
+def validate_single_city(city):
+    """Cleans one city: stripped, title case, None for blanks and digits."""
+    if pd.isna(city) or not str(city).strip():
+        return None
+
+    city_str = str(city).strip()
 
-        city_str = str(city).strip()
+    if city_str.isdigit():
+        return None
 
-        if city_str.isdigit():
+    return city_str.title()
+
+# Per kind of text: the function for one value, its name and its version in the normalization memo.
+TEXT_NORMALIZERS = {
+    "name": (clean_single_name, "format_and_clean_name_column", NAME_MEMO_VERSION),
+    "street": (validate_single_street, "validate_street_column", STREET_MEMO_VERSION),
+    "city": (validate_single_city, "validate_city_column", CITY_MEMO_VERSION),
+}
+
+def normalize_text_columns(df: pd.DataFrame, kinds: Dict[Any, str]) -> pd.DataFrame:
+    """
+    Normalizes several text columns in one call, e.g. the doctor and pharmacy addresses.
+
+    Each column is mapped through the per-value function of its kind in
+    TEXT_NORMALIZERS, once per distinct value (see apply_on_uniques).
+
+    Args:
+        df: The DataFrame holding the columns; column names must be unique.
+        kinds: Mapping of column name to "name", "street" or "city".
+
+    Returns:
+        A DataFrame with the index of df and the normalized columns.
+
+    Raises:
+        ValueError: If a kind is unknown.
+    """
+    unknown_kinds = set(kinds.values()) - set(TEXT_NORMALIZERS)
+    if unknown_kinds:
+        raise ValueError(f"Unknown text kinds: {sorted(unknown_kinds)}")
+
+    results = []
+    for column, kind in kinds.items():
+        function, memo_name, memo_version = TEXT_NORMALIZERS[kind]
+        results.append(apply_on_uniques(df[column], function, memo_name=memo_name, memo_version=memo_version))
+
+    return pd.concat(results, axis=1, keys=list(kinds))
+
+def parse_date_column(date_column: pd.Series) -> pd.Series:
+    """
+    Parses a column of dates given as text, numbers or date objects.
+
+    The column is factorized and its distinct values are grouped by the
+    DATE_FORMATS they are written in. Each group is parsed in one call with
+    the explicit format string of its format, the formats most frequent in a
+    sample of the values first. Only text in no known format is parsed one
+    value at a time with day-first inference, like "2024/01/31". Numbers are
+    read through their digits, so 20240131 is a yyyymmdd date and 45322 an
+    Excel serial number. The time of day is dropped.
+
+    Args:
+        date_column: The column to parse.
+
+    Returns:
+        A datetime64 Series with the index and name of date_column; NaT where
+        no date could be read.
+    """
+    if pd.api.types.is_datetime64_any_dtype(date_column):
+        return date_column.dt.normalize()
+
+    codes, uniques = factorize_by_value_and_type(date_column)
+
+    dates = np.full(len(uniques) + 1, np.datetime64("NaT"), dtype="datetime64[ns]")
+    if len(uniques):
+        dates[:-1] = _parse_date_texts(_date_texts(uniques))
+
+    return pd.Series(dates[codes], index=date_column.index, name=date_column.name)
+
+def detect_date_formats(date_column: pd.Series, sample_size: int = DATE_FORMAT_SAMPLE_SIZE) -> List[str]:
+    """
+    Detects the dominant DATE_FORMATS of a column from an evenly spread sample of its values.
+
+    Args:
+        date_column: The column to inspect.
+        sample_size: The number of non-missing values looked at.
+
+    Returns:
+        The names of the formats found in at least DOMINANT_DATE_FORMAT_SHARE of
+        the sample, the most frequent first; empty if none is.
+    """
+    values = date_column.dropna().to_numpy(dtype=object)
+    if len(values) > sample_size:
+        values = values[np.linspace(0, len(values) - 1, sample_size).astype(np.intp)]
+
+    counts = _date_format_counts(_date_texts(values))
+
+    return [
+        name for name, count in sorted(counts.items(), key=lambda item: -item[1])
+        if count and count >= DOMINANT_DATE_FORMAT_SHARE * len(values)
+    ]
+
+def format_date_column(date_column: pd.Series, date_format: str = "%d.%m.%Y") -> pd.Series:
+    """
+    Formats a datetime64 column as text, once per distinct date.
+
+    Returns:
+        An object Series with the index and name of date_column; None for NaT.
+    """
+    codes, uniques = pd.factorize(date_column)
+
+    texts = np.empty(len(uniques) + 1, dtype=object)
+    texts[:-1] = uniques.strftime(date_format)
+
+    return pd.Series(texts[codes], index=date_column.index, name=date_column.name)
+
+def _date_text(value: Any) -> Optional[str]:
+    """Returns the text a raw date is parsed from, or None for values that cannot be a date."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return None
+    if isinstance(value, (int, np.integer)):
+        return str(value)
+    if isinstance(value, (float, np.floating)):
+        if not np.isfinite(value):
             return None
+        return str(int(value)) if float(value).is_integer() else str(value)
+    if isinstance(value, (date, np.datetime64)):
+        return str(value)
+    return None
 
-        return city_str.title()
-    return city_column.apply(validate_single_plz)
+def _date_texts(values: np.ndarray) -> pa.Array:
+    """Returns the stripped texts of raw dates without their time of day."""
+    if pd.api.types.infer_dtype(values, skipna=False) != "string":
+        values = np.array([_date_text(value) for value in values], dtype=object)
 
-def remove_keywords_from_column(name_column: pd.Series, keywords: list[str]) -> pd.Series:
+    text = pc.utf8_trim_whitespace(pa.array(values, type=pa.string()))
+    return pc.replace_substring_regex(text, DATE_TIME_SUFFIX_PATTERN, "")
+
+def _date_format_counts(date_text: pa.Array) -> Dict[str, int]:
+    """Counts the texts written in each of the DATE_FORMATS."""
+    return {
+        name: pc.sum(pc.match_substring_regex(date_text, pattern)).as_py() or 0
+        for name, (pattern, _) in DATE_FORMATS.items()
+    }
+
+def _parse_date_texts(date_text: pa.Array) -> np.ndarray:
+    """Parses date texts group by group, see parse_date_column."""
+    dates = np.full(len(date_text), np.datetime64("NaT"), dtype="datetime64[ns]")
+    pending = pc.is_valid(date_text).to_numpy(zero_copy_only=False)
+
+    counts = _date_format_counts(date_text[:DATE_FORMAT_SAMPLE_SIZE])
+
+    for name in sorted(counts, key=lambda name: -counts[name]):
+        if not pending.any():
+            break
+
+        pattern, format_string = DATE_FORMATS[name]
+        matches = pc.fill_null(pc.match_substring_regex(date_text, pattern), False).to_numpy(zero_copy_only=False)
+        rows = np.flatnonzero(pending & matches)
+        if not len(rows):
+            continue
+
+        group = date_text.take(rows).to_pandas()
+        if format_string is None:
+            parsed = pd.to_datetime(pd.to_numeric(group), unit="D", origin=EXCEL_SERIAL_ORIGIN)
+        else:
+            parsed = pd.to_datetime(group, format=format_string, errors="coerce")
+
+        dates[rows] = parsed.dt.normalize().to_numpy()
+        pending[rows] = False
+
+    for row in np.flatnonzero(pending):
+        dates[row] = _infer_single_date(date_text[row].as_py())
+
+    return dates
+
+def _infer_single_date(text: str) -> np.datetime64:
+    """Parses a date in no known format with day-first inference; NaT if it is none."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        timestamp = pd.to_datetime(text, errors="coerce", dayfirst=True)
+
+    if pd.isna(timestamp):
+        return np.datetime64("NaT")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+
+    return timestamp.normalize().to_datetime64()
+
+# Bump when KeywordStripper.strip changes its output, which drops its memoized results.
+KEYWORD_STRIP_MEMO_VERSION = 1
+
+class KeywordStripper:
     """
-    Generic utility to remove a list of specified keywords from a Series of strings.
+    Removes a fixed list of keywords from text, compiled once per list.
+
+    The keywords are merged into a trie and written out as one regular
+    expression, so a value is scanned once however long the list is, and at
+    every position the longest matching keyword wins ("#NV" before "#").
+    Matching ignores case.
     """
-    pattern = '|'.join(re.escape(kw) for kw in keywords)
 
-    def clean_single_entry(name):
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(keywords)
+        self.pattern = re.compile(_keyword_trie_pattern(self.keywords), flags=re.IGNORECASE)
+
+        # The keywords are part of the result, so every keyword list is memoized on its own.
+        pattern_digest = hashlib.sha256(self.pattern.pattern.encode("utf-8")).hexdigest()[:16]
+        self.memo_name = f"remove_keywords_from_column:{pattern_digest}"
+
+    def strip(self, name: Any) -> Optional[str]:
+        """Removes the keywords from one value and tidies the rest; None for missing values and numbers."""
         if pd.isna(name):
             return None
 
         if str(name).strip().isdigit(): 
            return None
 
-        cleaned_name = re.sub(pattern, '', str(name), flags=re.IGNORECASE)
+        cleaned_name = self.pattern.sub('', str(name))
 
         cleaned_name = " ".join(cleaned_name.split())
         cleaned_name = cleaned_name.strip(' ,-')
         
         return cleaned_name
-            
-    return name_column.apply(clean_single_entry)
+
+    def strip_column(self, name_column: pd.Series) -> pd.Series:
+        """Applies strip to a column, once per distinct value."""
+        return apply_on_uniques(
+            name_column, self.strip, memo_name=self.memo_name, memo_version=KEYWORD_STRIP_MEMO_VERSION
+        )
+
+def _keyword_trie_pattern(keywords: List[str]) -> str:
+    """
+    Builds a regular expression matching the longest of the keywords at a position.
+
+    Characters are merged by their lower-case form, so the branches of a
+    node never match the same text under re.IGNORECASE and the greedy
+    match of a branch is the longest keyword.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword:
+            key = char.lower() if len(char.lower()) == 1 else char
+            node = node.setdefault(key, {})
+        node[""] = {}
+
+    def node_pattern(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + node_pattern(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            # The keyword may end here; a longer one is tried first.
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    # An empty list matches nothing.
+    return node_pattern(trie) if trie else "(?!)"
+
+_keyword_strippers: Dict[tuple, KeywordStripper] = {}
+
+def get_keyword_stripper(keywords: List[str]) -> KeywordStripper:
+    """Returns the KeywordStripper of a keyword list, compiled on first use."""
+    key = tuple(keywords)
+
+    stripper = _keyword_strippers.get(key)
+    if stripper is None:
+        stripper = _keyword_strippers[key] = KeywordStripper(keywords)
+
+    return stripper
+
+def remove_keywords_from_column(name_column: pd.Series, keywords: list[str]) -> pd.Series:
+    """
+    Generic utility to remove a list of specified keywords from a Series of strings.
+    """
+    return get_keyword_stripper(keywords).strip_column(name_column)
 
 def process_charges_and_positions(tm_df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculates chargen and position numbers using the correct
     order of operations to handle both patterns and duplicates.
+
+    A vo_id group is split into blocks that end where the first PZN of the
+    group repeats; the n-th block is chargen number n. All groups are
+    handled at once on the rows sorted by vo_id: the first repeat of each
+    group is found by comparing each match with the one before it.
     """
-    def _calculate_charges_for_group(group: pd.DataFrame) -> pd.DataFrame:
-        """Helper function to determine chargen numbers for a single vo_id group."""
-        pzn_list = group['pzn'].tolist()
-        block_length = 0
+    group_codes, _ = pd.factorize(tm_df['vo_id'], sort=True)
 
-        if len(pzn_list) < 2:
-            block_length = 1
-        else:
-            first_pzn = pzn_list[0]
-            try:
+    present_rows = np.flatnonzero(group_codes >= 0)
+    if not len(present_rows):
+        return pd.DataFrame(columns=tm_df.columns)
 
-                next_occurrence_index = pzn_list[1:].index(first_pzn)
-                block_length = next_occurrence_index + 1
-            except ValueError:
+    # Sorted by vo_id like groupby, keeping the row order within a group.
+    order = present_rows[np.argsort(group_codes[present_rows], kind="stable")]
+    df = tm_df.take(order)
+    group_codes = group_codes[order]
 
-                block_length = len(pzn_list)
+    group_sizes = np.bincount(group_codes)
+    group_starts = np.cumsum(group_sizes) - group_sizes
+    row_starts = np.repeat(group_starts, group_sizes)
+    indices = np.arange(len(df)) - row_starts
 
-        indices = np.arange(len(group))
-        group['charge_nr'] = (indices // block_length) + 1
-        return group
+    pzn_codes, _ = pd.factorize(df['pzn'], use_na_sentinel=False)
+    repeat_rows = np.flatnonzero((pzn_codes == pzn_codes[row_starts]) & (indices > 0))
 
-    df = tm_df.copy()
+    first_repeats = np.ones(len(repeat_rows), dtype=bool)
+    first_repeats[1:] = group_codes[repeat_rows[1:]] != group_codes[repeat_rows[:-1]]
+    first_repeat_rows = repeat_rows[first_repeats]
 
-    processed_groups = []
-    for name, group in df.groupby('vo_id'):
-        processed_group = _calculate_charges_for_group(group.copy())
-        processed_groups.append(processed_group)
+    block_lengths = group_sizes.copy()
+    block_lengths[group_codes[first_repeat_rows]] = indices[first_repeat_rows]
 
-    if not processed_groups:
-        return pd.DataFrame(columns=df.columns)
-        
-    df = pd.concat(processed_groups)
+    df['charge_nr'] = (indices // block_lengths[group_codes]).astype(np.int64) + 1
 
     df.drop_duplicates(subset=['vo_id', 'charge_nr', 'pzn'], keep='first', inplace=True)
 
@@ -213,16 +1036,16 @@ def add_validation_column(df: pd.DataFrame) -> pd.DataFrame:
 
 def update_medicine_name_for_specific_pzn(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Finds rows where the PZN is '9999100' and updates the medicine name
-    for those rows to 'Par. Ernährung (reg.)'.
+    Finds rows where the PZN is '9999100' (or '09999100' with leading zero)
+    and updates the medicine name for those rows to 'Par. Ernährung (reg.)'.
     """
 
     df_processed = df.copy()
 
-    target_pzn = "9999100"
+    target_pzns = ["9999100", "09999100"]
     new_name = "Par. Ernährung (reg.)"
 
-    mask = (df_processed['pzn'] == target_pzn)
+    mask = df_processed['pzn'].isin(target_pzns)
 
     df_processed.loc[mask, 'medicine_name'] = new_name
     
@@ -238,10 +1061,47 @@ def check_placeholder_or_incorrect_input_characters(df: pd.DataFrame, placeholde
 
         placeholder = ['?', 'N/A', 'NA', 'NULL', '-', 'Not a Number', '??', '#','##', '#NV', 'XXX', '00', 'Pseudo P', 'Pseudo' , 'Pseudo-Arzt']
 
-    df_processed = df_processed.map(lambda x: x.strip() if isinstance(x, str) else x)
-
     placeholder = placeholder + ['']
 
+    # Categorical columns are cleaned on their categories, once per distinct value.
+    categorical_columns = [
+        column for column in df_processed.columns
+        if isinstance(df_processed[column].dtype, pd.CategoricalDtype)
+    ]
+    cleaned_categoricals = {
+        column: remove_placeholder_categories(df_processed[column], placeholder)
+        for column in categorical_columns
+    }
+    df_processed = df_processed.drop(columns=categorical_columns)
+
+    df_processed = df_processed.map(lambda x: x.strip() if isinstance(x, str) else x)
+
     df_processed.replace(to_replace=placeholder, value=None, inplace=True)
+
+    for column, cleaned_column in cleaned_categoricals.items():
+        df_processed[column] = cleaned_column
     
-    return df_processed
+    return df_processed[df.columns]
+
+def remove_placeholder_categories(column: pd.Series, placeholder: List[str]) -> pd.Series:
+    """
+    Strips the categories of a categorical column and turns placeholder categories into NaN.
+
+    Categories that become equal after stripping are merged, the codes are remapped
+    without touching the individual cells.
+    """
+    categories = pd.Series(column.cat.categories, dtype=object)
+    categories = categories.map(lambda x: x.strip() if isinstance(x, str) else x)
+    categories = categories.where(~categories.isin(placeholder))
+
+    new_categories = pd.Index(categories.dropna().unique(), dtype=object)
+    code_map = new_categories.get_indexer(categories)
+
+    # Missing cells have code -1 and pick up the appended -1.
+    new_codes = np.append(code_map, -1)[column.cat.codes.to_numpy()]
+
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, categories=new_categories),
+        index=column.index,
+        name=column.name
+    )
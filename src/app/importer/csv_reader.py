@@ -0,0 +1,149 @@
+import codecs
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+
+from app.importer import sheet_reader
+
+DELIMITED_FILE_SUFFIXES = {".csv", ".tsv", ".txt"}
+
+ENCODING_BLOCK_SIZE = 1024 * 1024
+
+def is_delimited_file(file_path: str) -> bool:
+    """Returns True for CSV/TSV deliveries, judged by the file extension."""
+    return Path(file_path).suffix.lower() in DELIMITED_FILE_SUFFIXES
+
+def detect_encoding(file_path: str) -> str:
+    """
+    Detects whether a delivery is UTF-8 (with or without BOM) or cp1252.
+
+    Exports from German Windows installations are usually cp1252, which is
+    not valid UTF-8 as soon as it contains an umlaut. The first umlaut can
+    come late in the file, so the whole file is decoded, block by block.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    with open(file_path, "rb") as file:
+        block = file.read(ENCODING_BLOCK_SIZE)
+        if block.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+
+        try:
+            while block:
+                # The decoder keeps a multibyte character cut off at the end of a block for the next one.
+                decoder.decode(block, final=False)
+                block = file.read(ENCODING_BLOCK_SIZE)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return "cp1252"
+
+    return "utf-8"
+
+def detect_separator(file_path: str, encoding: str) -> str:
+    """Detects semicolon or tab as separator from the header line."""
+    if Path(file_path).suffix.lower() == ".tsv":
+        return "\t"
+
+    with open(file_path, "r", encoding=encoding, newline="") as file:
+        header_line = file.readline()
+
+    return "\t" if header_line.count("\t") > header_line.count(";") else ";"
+
+def _read_csv(
+    file_path: str,
+    usecols: Optional[List[str]],
+    schema: Optional[Dict[str, str]],
+    categorical_columns: Optional[Iterable[str]] = None,
+    **kwargs
+):
+    """Runs pd.read_csv with detected encoding and separator, or returns None for an empty file."""
+    encoding = detect_encoding(file_path)
+    separator = detect_separator(file_path, encoding)
+
+    try:
+        header = pd.read_csv(file_path, sep=separator, encoding=encoding, nrows=0).columns.tolist()
+    except pd.errors.EmptyDataError:
+        return None
+
+    if usecols is not None:
+        missing_columns = [column for column in usecols if column not in header]
+        if missing_columns:
+            raise ValueError(
+                f"File '{Path(file_path).name}' is missing required columns: {', '.join(missing_columns)}"
+            )
+
+    column_types = {
+        column: str for column, kind in (schema or {}).items()
+        if kind == sheet_reader.TEXT and column in header
+    }
+    # The parser builds categories straight from its tokens, always as strings.
+    column_types.update({column: "category" for column in categorical_columns or [] if column in header})
+
+    return pd.read_csv(
+        file_path,
+        sep=separator,
+        encoding=encoding,
+        decimal=',',
+        usecols=usecols,
+        dtype=column_types or None,
+        skip_blank_lines=False,
+        **kwargs
+    )
+
+def iter_delimited_chunks(
+    file_path: str,
+    chunk_size: int = sheet_reader.DEFAULT_CHUNK_SIZE,
+    usecols: Optional[Iterable[str]] = None,
+    schema: Optional[Dict[str, str]] = None,
+    categorical_columns: Optional[Iterable[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a semicolon- or tab-separated delivery as DataFrame chunks.
+
+    The chunks follow the same raw contract as the Excel reader: original
+    headers, German decimal commas parsed, empty cells as NaN and the
+    optional usecols projection, import schema and categorical columns
+    applied.
+
+    Raises:
+        ValueError: If a column of usecols is missing in the header line.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    if usecols is not None:
+        usecols = list(usecols)
+
+    reader = _read_csv(file_path, usecols, schema, categorical_columns, chunksize=chunk_size)
+    if reader is None:
+        return
+
+    with reader:
+        for chunk_df in reader:
+            if schema:
+                chunk_df = sheet_reader.apply_schema(chunk_df, schema)
+            yield chunk_df
+
+def read_delimited(
+    file_path: str,
+    usecols: Optional[Iterable[str]] = None,
+    schema: Optional[Dict[str, str]] = None,
+    categorical_columns: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
+    """
+    Reads a whole semicolon- or tab-separated delivery into one DataFrame.
+
+    Raises:
+        ValueError: If a column of usecols is missing in the header line.
+    """
+    if usecols is not None:
+        usecols = list(usecols)
+
+    delimited_df = _read_csv(file_path, usecols, schema, categorical_columns)
+    if delimited_df is None:
+        return pd.DataFrame()
+
+    if schema:
+        delimited_df = sheet_reader.apply_schema(delimited_df, schema)
+
+    return delimited_df
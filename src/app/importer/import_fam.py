@@ -1,23 +1,110 @@
+from typing import Dict, Iterable, Iterator, List, Optional
 import pandas as pd
 
+from app.importer import csv_reader, sheet_reader
+from app.importer.sheet_cache import SheetCache
+from app.importer.workbook_session import WorkbookSession
+
 SHEET_NAME = "FAM ihpE aufbereitet"
 
-def import_fam_sheet(file_path: str) -> pd.DataFrame:
+# ID-like columns are read as text (keeping leading zeros), prices and amounts as numbers.
+FAM_IMPORT_SCHEMA: Dict[str, str] = {
+    "patnr": sheet_reader.TEXT,
+    "pzn": sheet_reader.TEXT,
+    "lanr": sheet_reader.TEXT,
+    "arzt-plz": sheet_reader.TEXT,
+    "apo-plz": sheet_reader.TEXT,
+    "bsnr": sheet_reader.TEXT,
+    "arzt-tel": sheet_reader.TEXT,
+    "lanrtmp": sheet_reader.TEXT,
+    "belegnr": sheet_reader.TEXT,
+    "arzt-id": sheet_reader.TEXT,
+    "vo-id": sheet_reader.TEXT,
+    "avk": sheet_reader.NUMERIC,
+    "anzahl": sheet_reader.NUMERIC,
+    "applikationsfertige Einheiten": sheet_reader.NUMERIC
+}
+
+# Repetitive, low-cardinality text columns that can be read as Categorical.
+FAM_CATEGORICAL_COLUMNS: List[str] = [
+    "kasse",
+    "am-name",
+    "arzt-titel",
+    "arzt-ort",
+    "apo-name",
+    "apo-ort",
+    "FA-Bezeichnung",
+    "rolle"
+]
+
+def import_fam_sheet(
+    file_path: str,
+    cache: Optional[SheetCache] = None,
+    usecols: Optional[Iterable[str]] = None,
+    schema: Optional[Dict[str, str]] = FAM_IMPORT_SCHEMA,
+    categorical_columns: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
     """
     Finds and reads the specified FAM sheet from an Excel file.
+
+    Semicolon- or tab-separated deliveries (.csv, .tsv, .txt) are read
+    directly and return the same raw DataFrame.
     
     Args:
-        file_path: The path to the input Excel file.
+        file_path: The path to the input Excel or CSV/TSV file.
+        cache: Optional sheet cache to reuse a previous import of the same Excel file.
+        usecols: Optional header names to keep, e.g. FAM_HEADER_MAPPING. All other
+            columns are skipped while parsing.
+        schema: Column types to read the sheet with instead of inferring
+            them per cell, FAM_IMPORT_SCHEMA by default. The raw frame then differs
+            from pd.read_excel: ID columns hold text ("01067", not 1067.0).
+            Pass None to infer all columns like pd.read_excel.
+        categorical_columns: Optional header names to read as pandas Categorical,
+            e.g. FAM_CATEGORICAL_COLUMNS.
         
     Returns:
         A pandas DataFrame with the raw data from the sheet.
         
     Raises:
-        ValueError: If the specified sheet cannot be found in the file.
+        ValueError: If the specified sheet cannot be found in the file,
+            or a column of usecols is missing in its header.
     """
-    try:
-        raw_df = pd.read_excel(file_path, sheet_name=SHEET_NAME, decimal=',')
-        return raw_df
-    except ValueError:
-        raise ValueError(f"Sheet '{SHEET_NAME}' could not be found in the Excel file.")
-    
\ No newline at end of file
+    if csv_reader.is_delimited_file(file_path):
+        return csv_reader.read_delimited(
+            file_path, usecols=usecols, schema=schema, categorical_columns=categorical_columns
+        )
+
+    with WorkbookSession(file_path, cache=cache) as session:
+        return session.read_sheet(
+            SHEET_NAME, usecols=usecols, schema=schema, categorical_columns=categorical_columns
+        )
+
+def iter_fam_sheet_chunks(
+    file_path: str,
+    chunk_size: int = sheet_reader.DEFAULT_CHUNK_SIZE,
+    usecols: Optional[Iterable[str]] = None,
+    schema: Optional[Dict[str, str]] = FAM_IMPORT_SCHEMA,
+    categorical_columns: Optional[Iterable[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the FAM sheet of an Excel file, or a CSV/TSV delivery, as
+    DataFrame chunks of at most chunk_size rows.
+
+    Raises:
+        ValueError: If the specified sheet cannot be found in the file,
+            or a column of usecols is missing in its header.
+    """
+    if csv_reader.is_delimited_file(file_path):
+        yield from csv_reader.iter_delimited_chunks(
+            file_path, chunk_size, usecols=usecols, schema=schema, categorical_columns=categorical_columns
+        )
+        return
+
+    with WorkbookSession(file_path) as session:
+        yield from session.iter_sheet_chunks(
+            SHEET_NAME,
+            chunk_size=chunk_size,
+            usecols=usecols,
+            schema=schema,
+            categorical_columns=categorical_columns
+        )
@@ -1,23 +1,99 @@
+from typing import Dict, Iterable, Iterator, List, Optional
 import pandas as pd
 
+from app.importer import csv_reader, sheet_reader
+from app.importer.sheet_cache import SheetCache
+from app.importer.workbook_session import WorkbookSession
+
 SHEET_NAME = "TM aufbereitet"
 
-def import_tm_sheet(file_path: str) -> pd.DataFrame:
+# ID-like columns are read as text (keeping leading zeros), prices and amounts as numbers.
+TM_IMPORT_SCHEMA: Dict[str, str] = {
+    "VO-ID": sheet_reader.TEXT,
+    "Chargen-Nr.": sheet_reader.TEXT,
+    "PZN": sheet_reader.TEXT,
+    "ATC-Code": sheet_reader.TEXT,
+    "Position/laufende Nr.": sheet_reader.NUMERIC,
+    "Mengenfaktor": sheet_reader.NUMERIC,
+    "Teilmengenpreis": sheet_reader.NUMERIC
+}
+
+# Repetitive, low-cardinality text columns that can be read as Categorical.
+TM_CATEGORICAL_COLUMNS: List[str] = [
+    "Bezeichnung",
+    "Mengeneinheit",
+    "Darreichungsform",
+    "ATC-Bezeichnung"
+]
+
+def import_tm_sheet(
+    file_path: str,
+    cache: Optional[SheetCache] = None,
+    usecols: Optional[Iterable[str]] = None,
+    schema: Optional[Dict[str, str]] = TM_IMPORT_SCHEMA,
+    categorical_columns: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
     """
-    Finds and reads the specified FAM sheet from an Excel file.
+    Finds and reads the specified TM sheet from an Excel file.
+
+    Semicolon- or tab-separated deliveries (.csv, .tsv, .txt) are read
+    directly and return the same raw DataFrame.
     
     Args:
-        file_path: The path to the input Excel file.
+        file_path: The path to the input Excel or CSV/TSV file.
+        cache: Optional sheet cache to reuse a previous import of the same Excel file.
+        usecols: Optional header names to keep, e.g. TM_HEADER_MAPPING. All other
+            columns are skipped while parsing.
+        schema: Column types to read the sheet with instead of inferring
+            them per cell, TM_IMPORT_SCHEMA by default. The raw frame then differs
+            from pd.read_excel: ID columns hold text ("01067", not 1067.0).
+            Pass None to infer all columns like pd.read_excel.
+        categorical_columns: Optional header names to read as pandas Categorical,
+            e.g. TM_CATEGORICAL_COLUMNS.
         
     Returns:
         A pandas DataFrame with the raw data from the sheet.
         
     Raises:
-        ValueError: If the specified sheet cannot be found in the file.
+        ValueError: If the specified sheet cannot be found in the file,
+            or a column of usecols is missing in its header.
     """
-    try:
-        raw_df = pd.read_excel(file_path, sheet_name=SHEET_NAME, decimal=',')
-        return raw_df
-    except ValueError:
-        raise ValueError(f"Sheet '{SHEET_NAME}' could not be found in the Excel file.")
-    
\ No newline at end of file
+    if csv_reader.is_delimited_file(file_path):
+        return csv_reader.read_delimited(
+            file_path, usecols=usecols, schema=schema, categorical_columns=categorical_columns
+        )
+
+    with WorkbookSession(file_path, cache=cache) as session:
+        return session.read_sheet(
+            SHEET_NAME, usecols=usecols, schema=schema, categorical_columns=categorical_columns
+        )
+
+def iter_tm_sheet_chunks(
+    file_path: str,
+    chunk_size: int = sheet_reader.DEFAULT_CHUNK_SIZE,
+    usecols: Optional[Iterable[str]] = None,
+    schema: Optional[Dict[str, str]] = TM_IMPORT_SCHEMA,
+    categorical_columns: Optional[Iterable[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the TM sheet of an Excel file, or a CSV/TSV delivery, as
+    DataFrame chunks of at most chunk_size rows.
+
+    Raises:
+        ValueError: If the specified sheet cannot be found in the file,
+            or a column of usecols is missing in its header.
+    """
+    if csv_reader.is_delimited_file(file_path):
+        yield from csv_reader.iter_delimited_chunks(
+            file_path, chunk_size, usecols=usecols, schema=schema, categorical_columns=categorical_columns
+        )
+        return
+
+    with WorkbookSession(file_path) as session:
+        yield from session.iter_sheet_chunks(
+            SHEET_NAME,
+            chunk_size=chunk_size,
+            usecols=usecols,
+            schema=schema,
+            categorical_columns=categorical_columns
+        )
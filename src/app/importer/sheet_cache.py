@@ -0,0 +1,119 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "vodec" / "sheets"
+DEFAULT_MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+CACHE_FILE_SUFFIX = ".arrow"
+# Bump when sheet_reader changes how cells are typed, trimmed or coded, which drops the cached sheets.
+SHEET_CACHE_VERSION = 1
+
+def file_content_hash(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """Returns the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class SheetCache:
+    """
+    Content-addressed on-disk cache for raw imported sheets.
+
+    Entries are keyed by the SHA-256 of the input file, the sheet name, the
+    import options and SHEET_CACHE_VERSION and are stored as uncompressed
+    Arrow IPC files. A hit reads the file memory-mapped and converts it to
+    pandas, which copies the columns once but skips parsing the workbook XML.
+    The least recently used entries are evicted once the cache grows beyond
+    max_bytes.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, content_hash: str, sheet_name: str, variant: str = "") -> Path:
+        entry_key = hashlib.sha256(
+            f"{SHEET_CACHE_VERSION}\0{content_hash}\0{sheet_name}\0{variant}".encode("utf-8")
+        ).hexdigest()
+        return self.cache_dir / f"{entry_key}{CACHE_FILE_SUFFIX}"
+
+    def load(self, content_hash: str, sheet_name: str, variant: str = "") -> Optional[pd.DataFrame]:
+        """
+        Returns the cached frame or None if there is no entry.
+
+        variant distinguishes different import options for the same sheet.
+        """
+        entry_path = self._entry_path(content_hash, sheet_name, variant)
+
+        try:
+            table = feather.read_table(entry_path, memory_map=True)
+        except FileNotFoundError:
+            return None
+
+        # The modification time doubles as "last used" for the LRU eviction.
+        os.utime(entry_path)
+
+        # to_pandas copies the columns out of the mapped file, so the frame outlives it.
+        cached_df = table.to_pandas()
+
+        # Arrow hands back missing strings as None, read_excel uses NaN.
+        for column in cached_df.columns[cached_df.dtypes == object]:
+            cached_df[column] = cached_df[column].where(cached_df[column].notna(), np.nan)
+
+        return cached_df
+
+    def store(self, content_hash: str, sheet_name: str, sheet_df: pd.DataFrame, variant: str = "") -> bool:
+        """
+        Writes a frame to the cache and evicts old entries if needed.
+
+        Returns False without caching if the frame cannot be stored losslessly,
+        e.g. because a column mixes numbers and text or has a non-text header.
+        """
+        if not all(isinstance(column, str) for column in sheet_df.columns):
+            return False
+
+        entry_path = self._entry_path(content_hash, sheet_name, variant)
+        temp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+
+        try:
+            feather.write_feather(sheet_df, temp_path, compression="uncompressed")
+        except (pa.ArrowException, TypeError, ValueError):
+            temp_path.unlink(missing_ok=True)
+            print(f"Sheet '{sheet_name}' could not be cached.")
+            return False
+
+        os.replace(temp_path, entry_path)
+        self.evict()
+
+        return True
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache fits into max_bytes."""
+        entries = []
+        for entry_path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+            try:
+                entry_stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+
+        for _, size, entry_path in sorted(entries, key=lambda entry: entry[0]):
+            if total_bytes <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
+
+    def clear(self):
+        """Deletes all entries."""
+        for entry_path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+            entry_path.unlink(missing_ok=True)
@@ -0,0 +1,439 @@
+import re
+import sys
+import zipfile
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from xml.etree.ElementTree import fromstring
+import numpy as np
+import pandas as pd
+from openpyxl.packaging.manifest import Manifest
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
+from openpyxl.reader.strings import read_string_table
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.xml.constants import ARC_CONTENT_TYPES, ARC_ROOT_RELS, REL_NS, SHARED_STRINGS, SHEET_MAIN_NS
+from pandas._libs.parsers import STR_NA_VALUES
+from pandas.io.parsers import TextParser
+
+DEFAULT_CHUNK_SIZE = 50_000
+WHOLE_SHEET = sys.maxsize
+
+SHEET_TAG = f"{{{SHEET_MAIN_NS}}}sheet"
+RELATIONSHIP_ID_ATTRIBUTE = f"{{{REL_NS}}}id"
+OFFICE_DOCUMENT_TYPE = f"{REL_NS}/officeDocument"
+
+# Column kinds of an import schema.
+TEXT = "text"
+NUMERIC = "numeric"
+
+# Error cells come out of the read-only iterator as their literal code.
+EXCEL_ERROR_VALUES = {'#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'}
+
+class UsedRange(NamedTuple):
+    """Real data extent of a sheet and the empty rows/columns around it."""
+    max_row: int
+    max_column: int
+    skipped_rows: int
+    skipped_columns: int
+
+SCAN_BLOCK_SIZE = 1024 * 1024
+# Longest stretch of sheet XML the scan holds without finding a row start; longer ones are unsupported.
+SCAN_WINDOW_LIMIT = 16 * SCAN_BLOCK_SIZE
+
+# Cells as written by Excel, LibreOffice, openpyxl and xlsxwriter: un-prefixed
+# tags with the coordinate as first attribute. A cell holds a value if it has a
+# non-empty <v> (optionally after its formula) or an inline string.
+CELL_COLUMN_PATTERN = re.compile(rb'<c r="([A-Z]+)\d')
+VALUE_CELL_PATTERN = re.compile(
+    rb'<c r="([A-Z]+)(\d+)"[^>]*(?<!/)>(?:<f\b[^>]*(?:/>|>[^<]*</f>))?<(?:v>[^<]|is>)'
+)
+ROW_NUMBER_PATTERN = re.compile(rb'<row r="(\d+)"')
+
+class _UnsupportedSheetLayout(Exception):
+    """Raised by the fast scan if the sheet XML is not in the common layout."""
+
+def _column_index(letters: bytes) -> int:
+    return column_index_from_string(letters.decode("ascii"))
+
+def _scan_used_range_fast(source) -> UsedRange:
+    max_row = last_row = 0
+    value_columns = set()
+    cell_columns = set()
+    tail = b""
+
+    while True:
+        data = source.read(SCAN_BLOCK_SIZE)
+        if b":row" in data:
+            raise _UnsupportedSheetLayout()
+        block = tail + data
+
+        # Only scan up to the start of the last row, so no cell is cut in half. Rows
+        # that only carry a style are self-closing and have no end tag to cut at.
+        # An empty read is the end of the stream; the rest is scanned as a whole.
+        if data:
+            cut = block.rfind(b"<row ")
+            if cut <= 0:
+                if len(block) > SCAN_WINDOW_LIMIT:
+                    raise _UnsupportedSheetLayout()
+                tail = block
+                continue
+            block, tail = block[:cut], block[cut:]
+
+        cell_count = block.count(b"<c ") + block.count(b"<c>") + block.count(b"<c/>")
+        if cell_count != block.count(b'<c r="') or b":row" in block:
+            raise _UnsupportedSheetLayout()
+
+        columns = VALUE_CELL_PATTERN.findall(block)
+        if columns:
+            value_columns.update(column for column, _ in columns)
+            max_row = int(columns[-1][1])
+        cell_columns.update(CELL_COLUMN_PATTERN.findall(block))
+
+        row_numbers = ROW_NUMBER_PATTERN.findall(block[block.rfind(b"<row "):])
+        if row_numbers:
+            last_row = max(last_row, int(row_numbers[-1]))
+
+        if not data:
+            break
+
+    max_column = max((_column_index(column) for column in value_columns), default=0)
+    last_column = max((_column_index(column) for column in cell_columns), default=0)
+
+    return UsedRange(
+        max_row=max_row,
+        max_column=max_column,
+        skipped_rows=max(last_row - max_row, 0),
+        skipped_columns=max(last_column - max_column, 0)
+    )
+
+def sheet_xml_paths(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Maps the sheet names of an .xlsx archive to the archive members holding their XML."""
+    package_rels = get_dependents(archive, ARC_ROOT_RELS)
+    workbook_part = next(rel.target for rel in package_rels.find(OFFICE_DOCUMENT_TYPE))
+
+    targets = {rel.Id: rel.target for rel in get_dependents(archive, get_rels_path(workbook_part))}
+    workbook = fromstring(archive.read(workbook_part))
+
+    return {
+        sheet.get("name"): targets[sheet.get(RELATIONSHIP_ID_ATTRIBUTE)]
+        for sheet in workbook.iter(SHEET_TAG)
+        if sheet.get(RELATIONSHIP_ID_ATTRIBUTE) in targets
+    }
+
+def read_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """
+    Reads the shared-strings table of an .xlsx archive, in the order the cells refer to it.
+
+    The table is found through the package manifest, as openpyxl does.
+
+    Returns:
+        The strings, or an empty list if the workbook has none, e.g. because
+        its writer stores text inline like openpyxl.
+    """
+    manifest = Manifest.from_tree(fromstring(archive.read(ARC_CONTENT_TYPES)))
+    shared_strings_part = manifest.find(SHARED_STRINGS)
+    if shared_strings_part is None:
+        return []
+
+    with archive.open(shared_strings_part.PartName.lstrip("/")) as shared_strings_xml:
+        return read_string_table(shared_strings_xml)
+
+def detect_used_range(sheet_xml: BinaryIO) -> Optional[UsedRange]:
+    """
+    Finds the last row and column of a sheet that hold a value.
+
+    The extent is taken from the cell contents instead of the dimension tag,
+    so rows and columns that only carry formatting (e.g. styles applied down
+    to row 1,048,576) are counted as skipped. The sheet XML is scanned as raw
+    bytes without building any cell objects.
+
+    Args:
+        sheet_xml: The sheet's XML member of the archive, opened for reading,
+            see sheet_xml_paths.
+
+    Returns:
+        The used range, or None for sheets in an unusual layout (namespace
+        prefixes, cells without coordinates, rows without attributes). Those
+        are read within the bounds of their dimension tag instead.
+    """
+    try:
+        return _scan_used_range_fast(sheet_xml)
+    except _UnsupportedSheetLayout:
+        return None
+
+def _convert_cell(value):
+    """Converts a raw cell value the same way pandas' openpyxl reader does."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, float):
+        int_value = int(value)
+        return int_value if int_value == value else value
+    if isinstance(value, str) and value in EXCEL_ERROR_VALUES:
+        return np.nan
+    return value
+
+def _convert_row(row: tuple) -> list:
+    """Converts all cells of a row and drops trailing empty cells."""
+    converted_row = [_convert_cell(value) for value in row]
+    while converted_row and converted_row[-1] == "":
+        converted_row.pop()
+    return converted_row
+
+def _resolve_columns(header_row: list) -> pd.Index:
+    """Builds the column labels exactly like read_excel (unnamed and duplicate headers)."""
+    return TextParser([header_row], header=0, decimal=',').read().columns
+
+def _is_empty_row(row: tuple) -> bool:
+    return all(value is None or value == "" for value in row)
+
+class _CategoryCoder:
+    """
+    Assigns integer codes to the cells of categorical columns.
+
+    A text cell's code is its index in the workbook's shared-strings table
+    (see read_shared_strings), so no per-cell value has to be kept. Values
+    outside the table (numbers, inline strings) are appended after it; empty
+    cells and the strings the parser reads as NaN get -1.
+    """
+
+    def __init__(self, shared_strings: List[str]):
+        self.categories = list(shared_strings)
+        self._codes = {}
+        for index, value in enumerate(self.categories):
+            self._codes.setdefault(value, index)
+        for na_value in STR_NA_VALUES:
+            self._codes[na_value] = -1
+
+    def code(self, value, as_text: bool = False) -> int:
+        if not isinstance(value, str):
+            if value != value:
+                return -1
+            if as_text:
+                value = str(value)
+
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self._codes[value] = code
+        return code
+
+def _categorical_from_codes(codes: List[int], categories: list) -> pd.Categorical:
+    """Builds a Categorical with only the categories that occur in codes."""
+    used_codes, compact_codes = np.unique(np.asarray(codes, dtype=np.int64), return_inverse=True)
+    if len(used_codes) and used_codes[0] < 0:
+        used_codes = used_codes[1:]
+        compact_codes = compact_codes - 1
+
+    return pd.Categorical.from_codes(
+        compact_codes.reshape(-1),
+        categories=pd.Index([categories[code] for code in used_codes], dtype=object)
+    )
+
+def apply_schema(chunk_df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """
+    Casts the columns of a parsed chunk to the kinds declared in the schema.
+
+    TEXT columns arrive untyped from the parser and are turned into strings,
+    so text keeps its leading zeros and numeric cells become their integer
+    digits ("1234" rather than 1234.0). NUMERIC columns are converted to
+    numbers if every value parses; columns with free text such as "12,50 €"
+    are left as they are for the formatters. Categorical columns are left
+    untouched.
+    """
+    for column, kind in schema.items():
+        if column not in chunk_df.columns:
+            continue
+
+        values = chunk_df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+
+        if kind == TEXT:
+            chunk_df[column] = values.astype(str).where(values.notna(), np.nan)
+
+        elif kind == NUMERIC and values.dtype == object:
+            numeric_values = pd.to_numeric(values, errors='coerce')
+            if numeric_values.notna().sum() == values.notna().sum():
+                chunk_df[column] = numeric_values
+
+    return chunk_df
+
+def _rows_to_frame(
+    rows: List[list],
+    columns: List[str],
+    start: int,
+    schema: Optional[Dict[str, str]] = None,
+    categoricals: Optional[Dict[str, pd.Categorical]] = None
+) -> pd.DataFrame:
+    """Runs the type inference of read_excel on one block of rows."""
+    width = len(columns)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+
+    # TEXT columns skip the parser's number inference and decimal replacement.
+    text_columns = {column: object for column, kind in (schema or {}).items() if kind == TEXT and column in columns}
+
+    chunk_df = TextParser(
+        rows,
+        names=columns,
+        header=None,
+        skip_blank_lines=False,
+        decimal=',',
+        dtype=text_columns or None
+    ).read()
+    chunk_df.index = pd.RangeIndex(start, start + len(chunk_df))
+
+    for column, categorical in (categoricals or {}).items():
+        chunk_df[column] = categorical
+
+    if schema:
+        chunk_df = apply_schema(chunk_df, schema)
+
+    return chunk_df
+
+def _block_to_frame(
+    rows: List[list],
+    header_row: list,
+    start: int,
+    schema: Optional[Dict[str, str]] = None,
+    categoricals: Optional[Dict[str, pd.Categorical]] = None
+) -> pd.DataFrame:
+    """Builds a chunk with all sheet columns, adding unnamed columns for rows wider than the header."""
+    width = max([len(header_row)] + [len(row) for row in rows])
+    columns = _resolve_columns(header_row + [""] * (width - len(header_row)))
+
+    return _rows_to_frame(rows, list(columns), start, schema, categoricals)
+
+def iter_worksheet_chunks(
+    worksheet,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    usecols: Optional[Iterable[str]] = None,
+    schema: Optional[Dict[str, str]] = None,
+    categorical_columns: Optional[Iterable[str]] = None,
+    used_range: Optional[UsedRange] = None,
+    shared_strings: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams an openpyxl read-only worksheet as DataFrame chunks.
+
+    The first row is used as header. Empty rows inside the data are kept,
+    trailing empty rows are dropped, just like pd.read_excel does. Types are
+    inferred per chunk, so a column may come out with a different dtype in
+    two chunks if its values differ in kind.
+
+    With a used_range, only that range of the sheet is parsed, see
+    detect_used_range; otherwise openpyxl reads up to the dimension tag.
+
+    Args:
+        worksheet: A worksheet of a workbook opened with read_only=True.
+        chunk_size: The maximum number of data rows per yielded DataFrame.
+        usecols: Optional header names to keep, e.g. the keys of a header
+            mapping. Cells of all other columns are never converted or typed.
+            Rows that only hold values in such columns still count as data
+            rows and come back as all-NaN rows, like pd.read_excel(usecols=...).
+        schema: Optional mapping of header name to TEXT or NUMERIC. Declared
+            columns are not type-inferred, see apply_schema.
+        categorical_columns: Optional header names to return as pandas
+            Categorical. Their cells are turned into shared-string codes while
+            reading and never pass through the type inference; columns that
+            are TEXT in the schema get string categories. Each chunk only
+            carries the categories it uses, so combine chunks with
+            pd.api.types.union_categoricals. Names not in the sheet (or not
+            in usecols) are ignored.
+        used_range: Optional extent of the sheet's values from detect_used_range.
+        shared_strings: The workbook's shared-strings table from
+            read_shared_strings, which numbers the categories of
+            categorical_columns. Without it, they are numbered in order of
+            appearance.
+
+    Raises:
+        ValueError: If a column of usecols is not in the header row. This is
+            checked before any data row is parsed.
+    """
+    max_row = max_column = None
+    if used_range is not None:
+        if not used_range.max_row:
+            return
+        max_row, max_column = used_range.max_row, used_range.max_column
+
+    header_row = None
+    for row in worksheet.iter_rows(min_row=1, max_row=1, max_col=max_column, values_only=True):
+        header_row = _convert_row(row)
+
+    if not header_row:
+        return
+
+    positions = None
+    columns = list(_resolve_columns(header_row))
+
+    if usecols is not None:
+        wanted_columns = set(usecols)
+
+        missing_columns = [column for column in usecols if column not in columns]
+        if missing_columns:
+            raise ValueError(
+                f"Sheet '{worksheet.title}' is missing required columns: {', '.join(missing_columns)}"
+            )
+
+        positions = [index for index, column in enumerate(columns) if column in wanted_columns]
+        columns = [columns[index] for index in positions]
+
+    categorical_positions = {
+        column: columns.index(column) for column in (categorical_columns or []) if column in columns
+    }
+    text_columns = {column for column, kind in (schema or {}).items() if kind == TEXT}
+    coder = _CategoryCoder(shared_strings or []) if categorical_positions else None
+
+    rows = worksheet.iter_rows(
+        min_row=2,
+        max_row=max_row,
+        min_col=1,
+        max_col=max_column,
+        values_only=True
+    )
+
+    def build_chunk(block_rows: List[list], block_start: int) -> pd.DataFrame:
+        categoricals = {}
+        for column, index in categorical_positions.items():
+            as_text = column in text_columns
+            codes = []
+            for row in block_rows:
+                if index < len(row):
+                    codes.append(coder.code(row[index], as_text))
+                    # The parser only sees an empty cell; the column is replaced by the Categorical.
+                    row[index] = ""
+                else:
+                    codes.append(-1)
+            categoricals[column] = _categorical_from_codes(codes, coder.categories)
+
+        if positions is None:
+            return _block_to_frame(block_rows, header_row, block_start, schema, categoricals)
+        return _rows_to_frame(block_rows, columns, block_start, schema, categoricals)
+
+    block: List[list] = []
+    pending_empty_rows = 0
+    start = 0
+
+    for row in rows:
+        if positions is None:
+            converted_row = _convert_row(row)
+        elif _is_empty_row(row):
+            converted_row = []
+        else:
+            converted_row = [_convert_cell(row[index]) for index in positions]
+
+        if not converted_row:
+            pending_empty_rows += 1
+            continue
+
+        block.extend([[]] * pending_empty_rows)
+        pending_empty_rows = 0
+        block.append(converted_row)
+
+        while len(block) >= chunk_size:
+            yield build_chunk(block[:chunk_size], start)
+            start += chunk_size
+            block = block[chunk_size:]
+
+    if block or start == 0:
+        yield build_chunk(block, start)
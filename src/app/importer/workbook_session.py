@@ -0,0 +1,253 @@
+import logging
+import threading
+import zipfile
+from typing import Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.importer import sheet_reader
+from app.importer.sheet_cache import SheetCache, file_content_hash
+
+logger = logging.getLogger(__name__)
+
+def _cache_variant(
+    usecols: Optional[List[str]],
+    schema: Optional[Dict[str, str]],
+    categorical_columns: Optional[List[str]] = None
+) -> str:
+    """Describes the import options that change the shape or types of a cached sheet."""
+    parts = []
+    if usecols is not None:
+        parts.append("usecols=" + "\x1f".join(sorted(usecols)))
+    if schema:
+        parts.append("schema=" + "\x1f".join(f"{column}:{kind}" for column, kind in sorted(schema.items())))
+    if categorical_columns:
+        parts.append("categorical=" + "\x1f".join(sorted(categorical_columns)))
+    return "\x1e".join(parts)
+
+class WorkbookSession:
+    """
+    Keeps an input workbook open for reading several sheets.
+
+    The file is open twice: as openpyxl's read-only workbook, whose styles
+    are loaded once and reused for every sheet handed out, and as a zip
+    archive for the sheet XML and shared-strings table that sheet_reader
+    scans itself. Use it as a context manager so both are closed afterwards.
+
+    With a SheetCache, whole-sheet reads are served from the cache when the
+    same file content was imported before, and the workbook is only opened
+    if a sheet actually has to be parsed.
+    """
+
+    def __init__(self, file_path: str, cache: Optional[SheetCache] = None):
+        self.file_path = file_path
+        self.cache = cache
+        self._workbook = None
+        self._archive = None
+        self._sheet_xml_paths = None
+        self._shared_strings = None
+        self._used_ranges: Dict[str, Optional[sheet_reader.UsedRange]] = {}
+        self._content_hash = None
+        self._open_lock = threading.Lock()
+
+        if not cache:
+            self._open_workbook()
+
+    def _open_workbook(self):
+        with self._open_lock:
+            if self._workbook is None:
+                archive = zipfile.ZipFile(self.file_path)
+                try:
+                    self._sheet_xml_paths = sheet_reader.sheet_xml_paths(archive)
+                    self._workbook = load_workbook(self.file_path, read_only=True, data_only=True, keep_links=False)
+                except Exception:
+                    archive.close()
+                    raise
+                self._archive = archive
+        return self._workbook
+
+    @property
+    def workbook(self):
+        return self._open_workbook()
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            self._content_hash = file_content_hash(self.file_path)
+        return self._content_hash
+
+    def __enter__(self) -> "WorkbookSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the workbook and the archive; the archive also if closing the workbook fails."""
+        workbook, archive = self._workbook, self._archive
+        self._workbook = None
+        self._archive = None
+
+        try:
+            if workbook is not None:
+                workbook.close()
+        finally:
+            if archive is not None:
+                archive.close()
+
+    @property
+    def shared_strings(self) -> List[str]:
+        """The workbook's shared-strings table, read once per session."""
+        self._open_workbook()
+        if self._shared_strings is None:
+            self._shared_strings = sheet_reader.read_shared_strings(self._archive)
+        return self._shared_strings
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return self.workbook.sheetnames
+
+    def _get_worksheet(self, sheet_name: str):
+        if sheet_name not in self.workbook.sheetnames:
+            raise ValueError(f"Sheet '{sheet_name}' could not be found in the Excel file.")
+
+        return self.workbook[sheet_name]
+
+    def used_range(self, sheet_name: str) -> Optional[sheet_reader.UsedRange]:
+        """
+        Returns the real data extent of a sheet and how many empty rows and
+        columns beyond it are skipped when the sheet is parsed.
+
+        The sheet is scanned once per session; reading it afterwards reuses
+        the result. Returns None for sheets in an unusual XML layout, see
+        sheet_reader.detect_used_range.
+
+        Raises:
+            ValueError: If the specified sheet cannot be found in the file.
+        """
+        self._get_worksheet(sheet_name)
+
+        if sheet_name not in self._used_ranges:
+            with self._archive.open(self._sheet_xml_paths[sheet_name]) as sheet_xml:
+                used_range = sheet_reader.detect_used_range(sheet_xml)
+
+            if used_range and (used_range.skipped_rows or used_range.skipped_columns):
+                logger.info(
+                    "Sheet '%s': skipped %d empty rows and %d empty columns.",
+                    sheet_name, used_range.skipped_rows, used_range.skipped_columns
+                )
+            self._used_ranges[sheet_name] = used_range
+
+        return self._used_ranges[sheet_name]
+
+    def iter_sheet_chunks(
+        self,
+        sheet_name: str,
+        chunk_size: int = sheet_reader.DEFAULT_CHUNK_SIZE,
+        usecols: Optional[Iterable[str]] = None,
+        schema: Optional[Dict[str, str]] = None,
+        categorical_columns: Optional[Iterable[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a sheet as DataFrame chunks of at most chunk_size rows.
+
+        Raises:
+            ValueError: If the specified sheet cannot be found in the file,
+                or a column of usecols is missing in its header.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+
+        if categorical_columns is not None:
+            categorical_columns = list(categorical_columns)
+
+        worksheet = self._get_worksheet(sheet_name)
+
+        return sheet_reader.iter_worksheet_chunks(
+            worksheet,
+            chunk_size,
+            usecols=usecols,
+            schema=schema,
+            categorical_columns=categorical_columns,
+            used_range=self.used_range(sheet_name),
+            shared_strings=self.shared_strings if categorical_columns else None
+        )
+
+    def read_sheet(
+        self,
+        sheet_name: str,
+        usecols: Optional[Iterable[str]] = None,
+        schema: Optional[Dict[str, str]] = None,
+        categorical_columns: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Reads a whole sheet into one DataFrame, equivalent to pd.read_excel(decimal=',').
+
+        Args:
+            sheet_name: The name of the sheet to read.
+            usecols: Optional header names to keep, e.g. the keys of a header mapping.
+            schema: Optional mapping of header name to sheet_reader.TEXT or NUMERIC.
+            categorical_columns: Optional header names to read as pandas Categorical
+                straight from the shared-strings table.
+
+        Raises:
+            ValueError: If the specified sheet cannot be found in the file,
+                or a column of usecols is missing in its header.
+        """
+        if usecols is not None:
+            usecols = list(usecols)
+        if categorical_columns is not None:
+            categorical_columns = list(categorical_columns)
+        cache_variant = _cache_variant(usecols, schema, categorical_columns)
+
+        if self.cache:
+            cached_df = self.cache.load(self.content_hash, sheet_name, cache_variant)
+            if cached_df is not None:
+                return cached_df
+
+        worksheet = self._get_worksheet(sheet_name)
+
+        sheet_df = pd.DataFrame()
+        for sheet_df in sheet_reader.iter_worksheet_chunks(
+            worksheet,
+            sheet_reader.WHOLE_SHEET,
+            usecols=usecols,
+            schema=schema,
+            categorical_columns=categorical_columns,
+            used_range=self.used_range(sheet_name),
+            shared_strings=self.shared_strings if categorical_columns else None
+        ):
+            break
+
+        if self.cache:
+            self.cache.store(self.content_hash, sheet_name, sheet_df, cache_variant)
+
+        return sheet_df
+
+    def read_sheets(
+        self,
+        sheet_names: List[str],
+        usecols: Optional[Dict[str, Iterable[str]]] = None,
+        schemas: Optional[Dict[str, Dict[str, str]]] = None,
+        categorical_columns: Optional[Dict[str, Iterable[str]]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Reads several sheets from the open workbook, one after the other.
+
+        usecols, schemas and categorical_columns map a sheet name to the
+        header names to keep, the import schema and the columns to read as
+        Categorical for that sheet.
+        """
+        usecols = usecols or {}
+        schemas = schemas or {}
+        categorical_columns = categorical_columns or {}
+
+        return {
+            sheet_name: self.read_sheet(
+                sheet_name,
+                usecols=usecols.get(sheet_name),
+                schema=schemas.get(sheet_name),
+                categorical_columns=categorical_columns.get(sheet_name)
+            )
+            for sheet_name in sheet_names
+        }
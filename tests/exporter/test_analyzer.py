@@ -5,9 +5,11 @@ from app.core.data_analyzer import (
     determine_price_type,
     calculate_total_avk_sum,
     check_void_tm_consistency,
+    count_bsnr_kv_mismatches,
     detect_date_format,
     generate_analysis_notes
 )
+from app.core import data_rejection
 
 @pytest.fixture
 def sample_fam_df():
@@ -67,6 +69,12 @@ def test_detect_date_format():
     df3 = pd.DataFrame({'vo-datum': ['20240101']})
     assert detect_date_format(df3) == "yyyymmdd"
 
+    df4 = pd.DataFrame({'vo-datum': ['20240101', '01.01.2024', '02.01.2024', 45292, None]})
+    assert detect_date_format(df4) == "dd.mm.yyyy / yyyymmdd / excel serial"
+
+    df5 = pd.DataFrame({'vo-datum': ['unbekannt']})
+    assert detect_date_format(df5) == "Unknown"
+
 def test_check_void_tm_consistency(sample_fam_df, sample_tm_df):
     """Tests the VO-ID consistency check, which should now pass."""
 
@@ -91,3 +99,41 @@ def test_generate_analysis_notes(sample_fam_df, sample_tm_df):
     assert "Anzahl Zeilen FAM original:" in notes
     assert notes["Anzahl Zeilen FAM aufbereitet:"] == 5
     assert notes["VO-ID & TM stimmig?"] == "No"
+    assert notes["BSNR/KV-Bezirk Abweichungen:"] == "N/A - Required columns missing"
+
+    raw_fam['bsnr'] = ['721234500'] * 8 + ['381234500', None]
+    raw_fam['arzt-plz'] = '10115'
+    raw_fam['kv-bezirk'] = 'Berlin'
+
+    notes = generate_analysis_notes(raw_fam, sample_fam_df, raw_tm, sample_tm_df)
+
+    assert notes["BSNR/KV-Bezirk Abweichungen:"] == 1
+    assert notes["BSNR/Arzt-PLZ Abweichungen:"] == 1
+
+def test_bsnr_notes_without_kv_mapping(monkeypatch):
+    """Tests that a missing KV mapping asset only turns the BSNR notes into N/A."""
+    def missing_mapping():
+        raise FileNotFoundError("KV lookup file not found")
+
+    monkeypatch.setattr(data_rejection, "get_kv_resolver", missing_mapping)
+    raw_fam = pd.DataFrame({'bsnr': ['721234500'], 'arzt-plz': ['10115'], 'kv-bezirk': ['Berlin']})
+
+    assert count_bsnr_kv_mismatches(raw_fam) == {
+        'district': "N/A - KV mapping not found",
+        'plz': "N/A - KV mapping not found"
+    }
+
+def test_bsnr_notes_without_bsnr_values_skip_kv_mapping(monkeypatch):
+    """Tests that the KV mapping is neither loaded for empty BSNRs nor for a check done before."""
+    def unexpected_mapping():
+        raise AssertionError("KV mapping loaded")
+
+    monkeypatch.setattr(data_rejection, "get_kv_resolver", unexpected_mapping)
+    raw_fam = pd.DataFrame({'bsnr': [None, None], 'arzt-plz': ['10115', None], 'kv-bezirk': ['Berlin', None]})
+
+    assert count_bsnr_kv_mismatches(raw_fam) == {'district': 0, 'plz': 0}
+
+    raw_fam['bsnr'] = '381234500'
+    mismatches = pd.DataFrame({'district_mismatch': [True, False], 'plz_mismatch': [True, True]})
+
+    assert count_bsnr_kv_mismatches(raw_fam, mismatches) == {'district': 1, 'plz': 2}
@@ -1,6 +1,13 @@
 import pandas as pd
 import pytest
-from app.core.data_rejection import analyze_rejections, REJECTION_CRITERIA_FAM, REJECTION_CRITERIA_TM
+from app.core.data_rejection import (
+    analyze_rejections,
+    REJECTION_CRITERIA_FAM,
+    REJECTION_CRITERIA_TM,
+    REJECTION_CRITERIA_CHECK_DIGITS_FAM,
+    bsnr_kv_mismatches,
+    kv_consistency_criteria
+)
 
 @pytest.fixture
 def sample_data_for_rejection():
@@ -70,3 +77,66 @@ def test_analyze_tm_rejections_raw_criteria():
     assert len(active_df) == 2
     assert "Botendienst-PZN (06461110)" in rejected_dict
     assert rejected_dict["Botendienst-PZN (06461110)"].iloc[0]['PZN'] == '6461110'
+
+def test_botendienst_criteria_matches_pzn_with_leading_zero():
+    """
+    Tests that the Botendienst PZN is found when it was imported as text with leading zero.
+    """
+    raw_tm_df = pd.DataFrame({'PZN': ['06461110', '6461110', '00123']})
+
+    rejection_mask = REJECTION_CRITERIA_TM["Botendienst-PZN (06461110)"](raw_tm_df)
+
+    assert rejection_mask.tolist() == [True, True, False]
+
+def test_check_digit_criteria_reject_wrong_pzn_and_lanr():
+    """
+    Tests that PZNs and LANRs with a wrong check digit are rejected, while missing values are left alone.
+    """
+    processed_df = pd.DataFrame({
+        'pzn': ['06461110', '06461111', '2758089', None],
+        'lanr': ['123456601', '123456601', '123456701', None]
+    })
+
+    active_df, rejected_dict = analyze_rejections(
+        raw_df=processed_df,
+        processed_df=processed_df,
+        criteria=REJECTION_CRITERIA_CHECK_DIGITS_FAM
+    )
+
+    assert active_df.index.tolist() == [0, 3]
+    assert rejected_dict["PZN hat eine ungültige Prüfziffer"].index.tolist() == [1]
+    assert rejected_dict["LANR hat eine ungültige Prüfziffer"].index.tolist() == [2]
+
+def test_kv_consistency_criteria_reject_bsnr_of_other_kv():
+    """
+    Tests that a BSNR of another KV is rejected on the raw FAM frame, while unknown KVs are left alone.
+    """
+    raw_df = pd.DataFrame({
+        'bsnr': ['721234500', '381234500', '721234500', None],
+        'arzt-plz': ['10115', '10115', '80331', '10115'],
+        'kv-bezirk': ['16', '16', 'Berlin', None]
+    })
+
+    active_df, rejected_dict = analyze_rejections(
+        raw_df=raw_df,
+        processed_df=raw_df,
+        criteria=kv_consistency_criteria(bsnr_kv_mismatches(raw_df)),
+        is_raw_criteria=True
+    )
+
+    assert active_df.index.tolist() == [0, 3]
+    assert rejected_dict["BSNR passt nicht zum KV-Bezirk"].index.tolist() == [1]
+    # Raw criteria all look at the full raw frame, so row 1 is listed under both.
+    assert rejected_dict["BSNR passt nicht zur KV der Arzt-PLZ"].index.tolist() == [1, 2]
+
+def test_bsnr_kv_mismatches_follow_changes_in_place():
+    """
+    Tests that a frame changed in place is checked again, not answered from an earlier check.
+    """
+    raw_df = pd.DataFrame({'bsnr': ['721234500'], 'arzt-plz': ['10115'], 'kv-bezirk': ['Berlin']})
+
+    assert not bsnr_kv_mismatches(raw_df)['district_mismatch'].any()
+
+    raw_df['kv-bezirk'] = 'Bayern'
+
+    assert bsnr_kv_mismatches(raw_df)['district_mismatch'].all()
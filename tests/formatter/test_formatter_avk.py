@@ -34,3 +34,24 @@ def test_format_avk_column_with_valid_avk_with_currency():
     result_series = fam_formatter.validate_medicine_price_column(input_series)
 
     assert result_series[0] is None
+
+def test_format_avk_column_with_thousands_separator_and_junk():
+
+    input_series = pd.Series([" 1.234,56 € ", "k.A.", None, "1,5", "1,5"])
+
+    result_series = fam_formatter.validate_medicine_price_column(input_series)
+
+    assert result_series[0] == 1234.56
+    assert pd.isna(result_series[1])
+    assert pd.isna(result_series[2])
+    assert result_series[3] == 1.5 and result_series[4] == 1.5
+
+def test_format_avk_column_with_numeric_column():
+
+    input_series = pd.Series([100.9, 0.0, None, 12.5])
+
+    result_series = fam_formatter.validate_medicine_price_column(input_series)
+
+    assert result_series[0] == 100.9
+    assert pd.isna(result_series[1]) and pd.isna(result_series[2])
+    assert result_series[3] == 12.5
@@ -26,3 +26,18 @@ def test_sync_receipt_and_vo_ids():
     assert pd.isna(result_df.loc[3, 'vo_id'])
 
     assert result_df.loc[2, 'other_col'] == 3
+
+#-- test -- void blgnr sync with ids from excel -- #
+def test_sync_receipt_and_vo_ids_normalizes_float_ids():
+
+    input_df = pd.DataFrame({
+        'receipt_id': [123456789.0, None, ' 555 ', '777.0', float('nan')],
+        'vo_id':      [None, 987654321.0, None, 'V4', ''],
+    }, index=[10, 11, 12, 13, 14], dtype=object)
+
+    result_df = fam_formatter.sync_receipt_and_vo_ids(input_df)
+
+    assert result_df['receipt_id'].tolist() == ['123456789', '987654321', '555', '777', None]
+    assert result_df['vo_id'].tolist() == ['123456789', '987654321', '555', 'V4', None]
+    assert result_df.index.tolist() == [10, 11, 12, 13, 14]
+    assert input_df.loc[10, 'receipt_id'] == 123456789.0
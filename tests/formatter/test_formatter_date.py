@@ -1,5 +1,5 @@
 import pandas as pd
-from app.core import fam_formatter
+from app.core import fam_formatter, utils
 from datetime import datetime, timedelta
 
 def test_date_with_valid_ddmmyyyy_format():
@@ -61,3 +61,44 @@ def test_date_with_invalid_and_empty_formats():
     assert result_series[1] is None
     assert result_series[2] is None
     assert result_series[3] is None
+
+def test_date_with_month_and_day_swapped_is_invalid():
+
+    # A recent date with a day above 12, written month first: "12.13.2025" is no longer read as 13.12.2025.
+    recent_day = datetime.now() - timedelta(days=60)
+    recent_day = recent_day.replace(day=max(recent_day.day, 13))
+    date_str = recent_day.strftime("%m.%d.%Y")
+
+    input_series = pd.Series([date_str, "12.13.2025"])
+
+    assert fam_formatter.validate_prescription_date_column(input_series)[0] is None
+    assert utils.parse_date_column(input_series).isna().all()
+
+def test_parse_date_column_reads_each_format_group():
+
+    input_series = pd.Series(
+        ["08.09.2025", "8.9.25", "2025-09-08 12:30:00", "08-09-2025", "20250908", 45908, "45908", 20250908.0,
+         pd.Timestamp("2025-09-08 07:00"), "08/09/2025", "31.02.2025", "not a date", None, True],
+        index=range(10, 24), name="prescription_date"
+    )
+
+    result_series = utils.parse_date_column(input_series)
+
+    expected = [pd.Timestamp("2025-09-08")] * 10 + [pd.NaT] * 4
+    assert result_series.tolist() == expected
+    assert result_series.index.equals(input_series.index)
+    assert result_series.name == "prescription_date"
+
+def test_detect_date_formats_lists_dominant_formats_first():
+
+    input_series = pd.Series(["20240131"] * 30 + ["31.01.2024"] * 70 + ["unbekannt"] * 2 + [None])
+
+    assert utils.detect_date_formats(input_series) == ["dd.mm.yyyy", "yyyymmdd"]
+
+def test_billing_date_has_no_time_window():
+
+    input_series = pd.Series(["2010-05-01", "01.05.2010", None])
+
+    result_series = fam_formatter.validate_billing_date_column(input_series)
+
+    assert result_series.tolist() == ["01.05.2010", "01.05.2010", None]
@@ -0,0 +1,60 @@
+import pandas as pd
+from app.core import fam_formatter, tm_formatter
+
+#-- test -- amount formatter -- #
+def test_amount_column_keeps_counts_from_one():
+
+    input_series = pd.Series(["3", " 2 ", "1.0", "0", "-1", "abc", None, 4.9])
+
+    result_series = fam_formatter.validate_amount_column(input_series)
+
+    assert str(result_series.dtype) == "Int64"
+    assert result_series.tolist() == [3, 2, 1, pd.NA, pd.NA, pd.NA, pd.NA, 4]
+
+#-- test -- kv district formatter -- #
+def test_kv_district_column_checks_range():
+
+    input_series = pd.Series([0.0, 17.0, 18.0, None, -2.0])
+
+    result_series = fam_formatter.validate_kv_district_column(input_series)
+
+    assert result_series.tolist() == [0, 17, pd.NA, pd.NA, pd.NA]
+
+#-- test -- ihpe units formatter -- #
+def test_ihpe_units_column_accepts_zero():
+
+    input_series = pd.Series([0, 5, -3])
+
+    result_series = fam_formatter.validate_ihpe_units_column(input_series)
+
+    assert result_series.tolist() == [0, 5, pd.NA]
+
+#-- test -- tm integer formatters -- #
+def test_tm_integer_columns_cut_off_decimal_part():
+
+    input_series = pd.Series(["1.0", "2", "x", True, None], index=[10, 11, 12, 13, 14], name="position")
+
+    for formatter in (
+        tm_formatter.validate_tm_position_column,
+        tm_formatter.validate_tm_factor_indicator_column,
+        tm_formatter.validate_tm_price_indicator_column
+    ):
+        result_series = formatter(input_series)
+
+        assert result_series.index.tolist() == [10, 11, 12, 13, 14]
+        assert result_series.name == "position"
+        assert result_series.tolist() == [1, 2, pd.NA, pd.NA, pd.NA]
+
+#-- test -- tm integer formatters keep their text rules -- #
+def test_tm_integer_columns_read_digits_before_the_point():
+
+    input_series = pd.Series(["3.abc", "4.", "+3", "-3", " 5 ", "1e3", 3.7])
+
+    for formatter in (
+        tm_formatter.validate_tm_position_column,
+        tm_formatter.validate_tm_factor_indicator_column,
+        tm_formatter.validate_tm_price_indicator_column
+    ):
+        result_series = formatter(input_series)
+
+        assert result_series.tolist() == [3, 4, pd.NA, pd.NA, 5, pd.NA, 3]
@@ -1,5 +1,8 @@
+import shutil
 from pathlib import Path
 import pandas as pd
+import pytest
+from app.core import KVResolver as kv_resolver_module
 from app.core.KVResolver import KVResolver 
 
 #-- test -- kv formatter -- #
@@ -32,3 +35,107 @@ def test_kv_formatter():
     assert main_df.loc[3, 'kv_code_cleaned'] == '2'
 
     assert main_df.loc[4, 'kv_code_cleaned'] == '3'
+
+#-- test -- kv formatter plz fallback -- #
+def test_kv_formatter_resolves_postcodes_via_index():
+    current_file = Path(__file__)
+
+    project_root = current_file.parent.parent.parent
+
+    asset_file_path = project_root / "assets" / "plz_kv_mapping.xlsx"
+
+    kv_resolver = KVResolver(asset_path=asset_file_path)
+
+    postcodes = pd.Series(['01067', '1067', 10115, ' 80331 ', '1e4', '99999', None, 10115.5, '123456'])
+    kv_districts = pd.Series([None] * len(postcodes), index=range(10, 10 + len(postcodes)), name='kv_district')
+
+    result_series = kv_resolver.resolve_kv_column(arzt_postcode_column=postcodes, kv_district_column=kv_districts)
+
+    assert result_series.index.equals(kv_districts.index)
+    assert result_series.name == 'kv_district'
+    assert result_series.iloc[:4].tolist() == ['10', '10', '16', '6']
+    assert result_series.iloc[4:].isna().all()
+
+    dict_series = postcodes.astype(str).map(kv_resolver.plz_to_kv_code_map)
+    matched = dict_series.notna().to_numpy()
+    assert (result_series[matched].to_numpy() == dict_series[matched].to_numpy()).all()
+
+#-- test -- kv formatter compiled mapping -- #
+def test_kv_resolver_reuses_compiled_mapping(tmp_path, monkeypatch):
+    current_file = Path(__file__)
+
+    project_root = current_file.parent.parent.parent
+
+    asset_file_path = tmp_path / "plz_kv_mapping.xlsx"
+    shutil.copy(project_root / "assets" / "plz_kv_mapping.xlsx", asset_file_path)
+
+    parsed_resolver = KVResolver(asset_path=asset_file_path)
+    compiled_path = kv_resolver_module.compiled_mapping_path(asset_file_path)
+
+    assert compiled_path.exists()
+
+    def fail_compile(self, asset_path):
+        pytest.fail("The workbook should not be parsed again.")
+
+    monkeypatch.setattr(KVResolver, "_compile_mapping", fail_compile)
+
+    loaded_resolver = KVResolver(asset_path=asset_file_path)
+
+    assert loaded_resolver.plz_to_kv_code_map == parsed_resolver.plz_to_kv_code_map
+    assert (loaded_resolver.plz_kv_index == parsed_resolver.plz_kv_index).all()
+    assert kv_resolver_module.load_compiled_mapping(compiled_path, "changed asset") is None
+
+#-- test -- kv formatter singleton -- #
+def test_get_kv_resolver_returns_shared_instance():
+    current_file = Path(__file__)
+
+    project_root = current_file.parent.parent.parent
+
+    asset_file_path = project_root / "assets" / "plz_kv_mapping.xlsx"
+
+    assert kv_resolver_module.get_kv_resolver(asset_file_path) is kv_resolver_module.get_kv_resolver()
+
+#-- test -- kv formatter prefix fallback -- #
+def test_kv_formatter_prefix_fallback_reports_depth():
+    current_file = Path(__file__)
+
+    project_root = current_file.parent.parent.parent
+
+    asset_file_path = project_root / "assets" / "plz_kv_mapping.xlsx"
+
+    kv_resolver = KVResolver(asset_path=asset_file_path)
+
+    postcodes = pd.Series(['10115', '10116', '80331', 'abc'])
+    kv_districts = pd.Series([None, None, 'Berlin', None])
+
+    assert pd.isna(kv_resolver.resolve_kv_column(postcodes, kv_districts).iloc[1])
+
+    details_df = kv_resolver.resolve_kv_details(postcodes, kv_districts)
+
+    assert details_df['kv_code'].iloc[:3].tolist() == ['16', '16', '16']
+    assert details_df['kv_source'].tolist() == ['plz', 'plz_prefix', 'name', None]
+    assert details_df['prefix_depth'].iloc[1] == 4
+    assert details_df['prefix_depth'].drop(index=1).isna().all()
+    pd.testing.assert_series_equal(
+        kv_resolver.resolve_kv_column(postcodes, kv_districts, prefix_fallback=True),
+        details_df['kv_code'],
+        check_names=False
+    )
+
+#-- test -- bsnr kv consistency -- #
+def test_check_bsnr_consistency_compares_prefix_district_and_postcode():
+    kv_resolver = kv_resolver_module.get_kv_resolver()
+
+    bs_nrs = pd.Series(['721234500', 721234500.0, '381234500', '12345678', None, '991234500'], index=range(5, 11))
+    postcodes = pd.Series(['10115', '10115', '80331', '24103', '10115', '10115'])
+    kv_districts = pd.Series(['Berlin', 16, '6', 13.0, 'Berlin', 'Berlin'])
+
+    result_df = kv_resolver.check_bsnr_consistency(bs_nrs, postcodes, kv_districts)
+
+    assert result_df.index.equals(bs_nrs.index)
+    # Prefix 01 of the eight-digit BSNR is Schleswig-Holstein, 99 is no KV.
+    assert result_df['bsnr_kv_code'].iloc[:4].tolist() == ['16', '16', '17', '13']
+    assert result_df['bsnr_kv_code'].iloc[4:].isna().all()
+    assert result_df['district_kv_code'].tolist() == ['16', '16', '6', '13', '16', '16']
+    assert result_df['district_matches'].tolist() == [True, True, False, True, pd.NA, pd.NA]
+    assert result_df['plz_matches'].tolist() == [True, True, False, True, pd.NA, pd.NA]
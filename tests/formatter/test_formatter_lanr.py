@@ -59,3 +59,42 @@ def test_format_lanr_column_with_normal_lanr():
     result_series = utils.validate_id_number_column(input_series,6)
 
     assert result_series[0] == "123456"
+
+def test_format_lanr_column_with_numbers_from_import():
+
+    input_series = pd.Series([123456789.0, None, 111123456.0, 12345.0])
+
+    result_series = utils.validate_id_number_column(input_series,9)
+
+    assert result_series.tolist() == ["123456789", None, None, None]
+
+def test_format_several_id_columns_in_one_call():
+
+    input_df = pd.DataFrame({
+        "lanr": ["123456789", " 987654321 ", "١٢٣٤٥٦٧٨٩", None],
+        "bs_nr": [123456789, -123456789, 22222222, 987654321],
+        "pzn": ["1234567.0", "12", "abc", "7654321"]
+    }, index=[4, 5, 6, 7])
+
+    result_df = utils.validate_id_number_columns(input_df, {"lanr": 9, "bs_nr": 9, "pzn": 7})
+
+    assert result_df["lanr"].tolist() == ["123456789", "987654321", "١٢٣٤٥٦٧٨٩", None]
+    assert result_df["bs_nr"].tolist() == ["123456789", None, None, "987654321"]
+    assert result_df["pzn"].tolist() == ["1234567", None, None, "7654321"]
+    assert result_df.index.tolist() == [4, 5, 6, 7]
+
+def test_lanr_check_digit():
+
+    input_series = pd.Series(["123456601", "123456701", 123456601, None, "abc"])
+
+    result_series = utils.check_lanr_check_digits(input_series)
+
+    assert result_series.tolist() == [True, False, True, pd.NA, pd.NA]
+
+def test_pzn_check_digit_with_and_without_leading_zero():
+
+    input_series = pd.Series(["06461110", "6461110", 6461110, "06461111", "27580899", "p1"])
+
+    result_series = utils.check_pzn_check_digits(input_series)
+
+    assert result_series.tolist() == [True, True, True, False, True, pd.NA]
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+from app.core import utils
+from app.core.fam_formatter import split_full_name_column, validate_doctor_title_column
+from app.core.normalization_memo import NormalizationMemo, memo_key, set_normalization_memo
+
+@pytest.fixture
+def memo(tmp_path):
+    memo = NormalizationMemo(tmp_path / "memo.sqlite3")
+    set_normalization_memo(memo)
+    yield memo
+    set_normalization_memo(None)
+    memo.close()
+
+#-- test -- memo reuses results across runs -- #
+def test_memo_reuses_results_across_runs(memo, tmp_path):
+    column = pd.Series(["a", "b", "a", None, 1, 1.0])
+    calls = []
+
+    def upper(value):
+        calls.append(value)
+        return None if pd.isna(value) else str(value).upper()
+
+    first = utils.apply_on_uniques(column, upper, memo_name="upper")
+    assert first.tolist() == ["A", "B", "A", None, "1", "1.0"]
+
+    # A new memo on the same file stands for the next run.
+    memo.close()
+    next_run_memo = NormalizationMemo(tmp_path / "memo.sqlite3")
+    set_normalization_memo(next_run_memo)
+
+    calls.clear()
+    second = utils.apply_on_uniques(column, upper, memo_name="upper")
+    next_run_memo.close()
+
+    pd.testing.assert_series_equal(second, first)
+    # Only the missing value is computed again, it is never stored.
+    assert len(calls) == 1 and pd.isna(calls[0])
+
+#-- test -- memo invalidated by version -- #
+def test_memo_drops_results_of_old_version(memo):
+    column = pd.Series(["x", "y"])
+
+    utils.apply_on_uniques(column, lambda value: value + "1", memo_name="suffix", memo_version=1)
+    cached = utils.apply_on_uniques(column, lambda value: value + "2", memo_name="suffix", memo_version=1)
+    bumped = utils.apply_on_uniques(column, lambda value: value + "2", memo_name="suffix", memo_version=2)
+
+    assert cached.tolist() == ["x1", "y1"]
+    assert bumped.tolist() == ["x2", "y2"]
+
+#-- test -- memoized formatter keeps its output -- #
+def test_memoized_formatter_matches_plain_run(memo):
+    titles = pd.Series(["Dr. med.", "Prof. Dr.", None, "dr dr", "Dr. med."])
+    categorical_titles = titles.astype("category")
+
+    set_normalization_memo(None)
+    expected = validate_doctor_title_column(titles)
+    expected_categorical = validate_doctor_title_column(categorical_titles)
+
+    set_normalization_memo(memo)
+    for _ in range(2):
+        pd.testing.assert_series_equal(validate_doctor_title_column(titles), expected)
+        pd.testing.assert_series_equal(validate_doctor_title_column(categorical_titles), expected_categorical)
+
+#-- test -- memoized name splitter keeps its output -- #
+def test_memoized_name_splitter_matches_plain_run(memo):
+    full_names = pd.Series(["Dr. Erika Mustermann", "Klinikum Nord", None, "Zech Ulrike", "Dr. Erika Mustermann"])
+
+    set_normalization_memo(None)
+    expected = split_full_name_column(full_names)
+
+    set_normalization_memo(memo)
+    for _ in range(2):
+        pd.testing.assert_frame_equal(split_full_name_column(full_names), expected)
+
+#-- test -- memoized street formatter keeps its output -- #
+def test_memoized_street_formatter_matches_plain_run(memo):
+    streets = pd.Series(["hauptstrasse 1b", None, "Maßweg 3", "ßtraße 1", "hauptstrasse 1b", 12])
+
+    set_normalization_memo(None)
+    expected = utils.validate_street_column(streets)
+
+    set_normalization_memo(memo)
+    for _ in range(2):
+        pd.testing.assert_series_equal(utils.validate_street_column(streets), expected)
+
+#-- test -- text normalizers memoize under their version -- #
+def test_text_normalizers_share_memo_version_with_wrappers(memo):
+    df = pd.DataFrame({"street": ["hauptstrasse 1b"], "city": [" berlin "]})
+
+    utils.normalize_text_columns(df, {"street": "street", "city": "city"})
+
+    key = memo_key("hauptstrasse 1b")
+    assert memo.lookup("validate_street_column", utils.STREET_MEMO_VERSION, [key]) == {key: "Hauptstr. 1b"}
+    # The column wrapper finds the results stored by normalize_text_columns.
+    assert utils.validate_city_column(df["city"]).tolist() == ["Berlin"]
+    assert memo.lookup("validate_city_column", utils.CITY_MEMO_VERSION, [memo_key(" berlin ")])
@@ -133,4 +133,27 @@ def test_full_name_processing_pipeline_live_example3():
     assert df.loc[0, 'title'] is None
     assert df.loc[0, 'first_name'] == "Ulrike"
     assert df.loc[0, 'last_name'] == "Zech"
-    
\ No newline at end of file
+
+#-- test -- name splitter column -- #
+def test_split_full_name_column_matches_split_full_name():
+    full_names = pd.Series(
+        ["Dr. Erika Mustermann", "Mustermann, Max", "Zech Ulrike", "Jan de Vries", None, "   ",
+         "Palliativnetz Ludwigslust-Parchim GmbH", "Will Mann, ULRIKE", "MÜLLER-LÜDENSCHEIDT, HANS PETER",
+         "Prof. Dr.", "Mustermann, Max", 1234],
+        index=range(100, 112)
+    )
+
+    result_df = fam_formatter.split_full_name_column(full_names)
+
+    expected_df = full_names.apply(fam_formatter.split_full_name).apply(pd.Series)
+
+    assert result_df.columns.tolist() == ["title", "first_name", "last_name"]
+    pd.testing.assert_frame_equal(result_df, expected_df[result_df.columns].astype(object))
+
+def test_split_plain_name_matches_human_name():
+    for name_str in ["Mustermann, Max", "Müller Lüdenscheidt, Hans", "Anna Maria Schmidt", "ULRIKE ZECH",
+                     "zech, ulrike", "Will Mann, ULRIKE", "Ng, A", "Jan de Vries", "Peter Pan"]:
+        name = fam_formatter.HumanName(name_str)
+        expected = (" ".join([name.first, name.middle]).strip(), name.last)
+
+        assert fam_formatter.split_plain_name(name_str) == expected
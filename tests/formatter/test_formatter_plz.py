@@ -49,4 +49,20 @@ def test_format_plz_column_with_alphanumeric_input():
     result_series = utils.validate_plz_column(input_series)
 
     assert result_series[0] is None
-    assert result_series[1] is None
\ No newline at end of file
+    assert result_series[1] is None
+
+def test_format_plz_column_with_numbers():
+
+    input_series = pd.Series([6618, 10115.0, 979789, 1234.5, True, None], dtype=object)
+
+    result_series = utils.validate_plz_column(input_series)
+
+    assert result_series.tolist() == ["06618", "10115", None, None, None, None]
+
+def test_format_plz_column_with_float_formatted_text():
+
+    input_series = pd.Series(["10115.0", " 10115\t", "6618.00", "10115.5", "10115."])
+
+    result_series = utils.validate_plz_column(input_series)
+
+    assert result_series.tolist() == ["10115", "10115", "06618", None, "10115"]
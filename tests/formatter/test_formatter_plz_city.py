@@ -0,0 +1,39 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from app.core.plz_city_index import PLZCityIndex
+
+@pytest.fixture(scope="module")
+def plz_city_index():
+    current_file = Path(__file__)
+
+    project_root = current_file.parent.parent.parent
+
+    asset_file_path = project_root / "assets" / "plz_kv_mapping.xlsx"
+
+    return PLZCityIndex(asset_path=asset_file_path)
+
+#-- test -- plz city check -- #
+def test_check_city_plz_pairs(plz_city_index):
+
+    plz_column = pd.Series(['01067', 1594, '01594', '01067', '99999', None, '80331'])
+    city_column = pd.Series(['Dresden', 'riesa', 'Stauchitz', 'Leipzig', 'Dresden', 'Berlin', ' '], name='city')
+
+    result_series = plz_city_index.check_city_plz_pairs(plz_column, city_column)
+
+    assert result_series.name == 'city'
+    assert result_series.iloc[:4].tolist() == [True, True, True, False]
+    assert result_series.iloc[4:].isna().all()
+
+#-- test -- plz city fill -- #
+def test_fill_missing_cities(plz_city_index):
+
+    plz_column = pd.Series(['01067', '01594', '01561', '99999', '80331'])
+    city_column = pd.Series(['Dresden', None, ' ', None, 'München'], index=[5, 6, 7, 8, 9])
+
+    result_series = plz_city_index.fill_missing_cities(plz_column, city_column)
+
+    assert result_series.index.equals(city_column.index)
+    assert result_series.iloc[:3].tolist() == ['Dresden', 'Riesa', 'Großenhain']
+    assert pd.isna(result_series.iloc[3])
+    assert result_series.iloc[4] == 'München'
@@ -66,3 +66,23 @@ def test_format_street_column_with_whitespace():
     result_series = utils.validate_street_column(input_series)
 
     assert result_series[0] == "Weg 1b"
+
+#-- test -- address columns in one call -- #
+def test_normalize_text_columns_matches_per_value_functions():
+    df = pd.DataFrame({
+        'doctor_street': ["hauptstrasse 1b", "  Lange   Straße 25A ", "Maßweg 3", None, "12345", "Dorfstraße"],
+        'pharmacy_street': ["Dorfstraße", "ßtraße 1", "am markt 2c", "İnönü Cad. 5", "", 7],
+        'doctor_city': ["  münchen ", "bad ﬁlbel", None, "123", "frankfurt am main", "münchen"],
+        'doctor_last_name': ["müller-lüdenscheidt", "o'neil", "  van   der  berg ", "ǆuro", None, "42"],
+    }, index=[5, 5, 6, 7, 8, 9])
+
+    kinds = {'doctor_street': 'street', 'pharmacy_street': 'street', 'doctor_city': 'city', 'doctor_last_name': 'name'}
+
+    result_df = utils.normalize_text_columns(df, kinds)
+
+    assert result_df.index.equals(df.index)
+    pd.testing.assert_series_equal(result_df['doctor_street'], df['doctor_street'].apply(utils.validate_single_street))
+    pd.testing.assert_series_equal(result_df['pharmacy_street'], df['pharmacy_street'].apply(utils.validate_single_street))
+    pd.testing.assert_series_equal(result_df['doctor_city'], df['doctor_city'].apply(utils.validate_single_city))
+    pd.testing.assert_series_equal(result_df['doctor_last_name'], df['doctor_last_name'].apply(utils.clean_single_name))
+    assert result_df['doctor_street'].tolist()[:3] == ["Hauptstr. 1b", "Lange Str. 25a", "Maßweg 3"]
@@ -0,0 +1,71 @@
+import openpyxl
+import pandas as pd
+import pytest
+from app.importer import csv_reader
+from app.importer import import_fam
+from app.importer import import_tm
+
+FAM_CSV_CONTENT = "kasse;pzn;avk;anzahl;arzt-ort\nAOK;01234567;10,50;2;Düsseldorf\nTK;7654321;3,20;;Köln\n"
+
+def test_detect_encoding_and_separator(tmp_path):
+
+    cp1252_file = tmp_path / "fam.csv"
+    cp1252_file.write_bytes(FAM_CSV_CONTENT.encode("cp1252"))
+    utf8_file = tmp_path / "fam.tsv"
+    utf8_file.write_bytes(FAM_CSV_CONTENT.replace(";", "\t").encode("utf-8-sig"))
+
+    assert csv_reader.detect_encoding(cp1252_file) == "cp1252"
+    assert csv_reader.detect_separator(cp1252_file, "cp1252") == ";"
+    assert csv_reader.detect_encoding(utf8_file) == "utf-8-sig"
+    assert csv_reader.detect_separator(utf8_file, "utf-8-sig") == "\t"
+
+def test_detect_encoding_reads_past_the_first_block(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(csv_reader, "ENCODING_BLOCK_SIZE", 21)
+    late_umlaut_file = tmp_path / "late.csv"
+    late_umlaut_file.write_bytes(("kasse;arzt-ort\n" + "AOK;Berlin\n" * 20 + "TK;Köln\n").encode("cp1252"))
+    utf8_file = tmp_path / "utf8.csv"
+    utf8_file.write_bytes("kasse;arzt-ort\nAOK;Düsseldorf\n".encode("utf-8"))
+
+    assert csv_reader.detect_encoding(late_umlaut_file) == "cp1252"
+    assert csv_reader.read_delimited(late_umlaut_file)["arzt-ort"].iloc[-1] == "Köln"
+    # The "ü" is split across the first two blocks and still valid UTF-8.
+    assert csv_reader.detect_encoding(utf8_file) == "utf-8"
+
+def test_import_fam_csv_matches_excel_import(tmp_path):
+
+    csv_file = tmp_path / "fam.csv"
+    csv_file.write_bytes(FAM_CSV_CONTENT.encode("cp1252"))
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "pzn", "avk", "anzahl", "arzt-ort"])
+    worksheet.append(["AOK", "01234567", "10,50", 2, "Düsseldorf"])
+    worksheet.append(["TK", 7654321, "3,20", None, "Köln"])
+    excel_file = tmp_path / "fam.xlsx"
+    workbook.save(excel_file)
+
+    pd.testing.assert_frame_equal(import_fam.import_fam_sheet(csv_file), import_fam.import_fam_sheet(excel_file))
+
+    categorical_columns = ["kasse", "arzt-ort"]
+    pd.testing.assert_frame_equal(
+        import_fam.import_fam_sheet(csv_file, categorical_columns=categorical_columns),
+        import_fam.import_fam_sheet(excel_file, categorical_columns=categorical_columns),
+        check_categorical=False
+    )
+
+def test_iter_tm_csv_chunks_and_missing_columns(tmp_path):
+
+    csv_file = tmp_path / "tm.csv"
+    csv_file.write_text("VO-ID;PZN;Teilmengenpreis\n" + "".join(f"{nr};123;1,5\n" for nr in range(5)), encoding="utf-8")
+
+    chunks = list(import_tm.iter_tm_sheet_chunks(csv_file, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[2].index.tolist() == [4]
+    assert chunks[0].loc[0, 'Teilmengenpreis'] == 1.5
+    assert chunks[0].loc[1, 'VO-ID'] == "1"
+
+    with pytest.raises(ValueError, match="ATC-Code"):
+        import_tm.import_tm_sheet(csv_file, usecols=["VO-ID", "ATC-Code"])
@@ -1,8 +1,10 @@
 from pathlib import Path
 import pandas as pd
 import pytest
+import openpyxl
 from app.importer import import_fam
 from app.importer import import_tm
+from app.core.fam_formatter import FAM_HEADER_MAPPING
 
 def test_import_fam_succeeds_when_file_and_sheet_exist():
 
@@ -31,3 +33,104 @@ def test_import_tm_succeeds_when_file_and_sheet_exist():
         
     except Exception as e:
         pytest.fail(f"Function raised an unexpected exception: {e}")
+
+def _write_fam_workbook(file_path, row_count):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "pzn", "avk", "anzahl"])
+    for row_nr in range(row_count):
+        worksheet.append(["AOK", 1234567 + row_nr, "10,50", 1])
+    workbook.save(file_path)
+
+def test_import_fam_matches_read_excel(tmp_path):
+
+    file_path = tmp_path / "fam.xlsx"
+    _write_fam_workbook(file_path, 5)
+
+    result_df = import_fam.import_fam_sheet(file_path, schema=None)
+    expected_df = pd.read_excel(file_path, sheet_name=import_fam.SHEET_NAME, decimal=',')
+
+    pd.testing.assert_frame_equal(result_df, expected_df)
+
+def test_iter_fam_sheet_chunks_yields_bounded_chunks(tmp_path):
+
+    file_path = tmp_path / "fam.xlsx"
+    _write_fam_workbook(file_path, 5)
+
+    chunks = list(import_fam.iter_fam_sheet_chunks(file_path, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[2].index.tolist() == [4]
+    assert chunks[0].loc[0, 'avk'] == 10.5
+
+def test_import_tm_raises_for_missing_sheet(tmp_path):
+
+    file_path = tmp_path / "fam.xlsx"
+    _write_fam_workbook(file_path, 1)
+
+    with pytest.raises(ValueError, match="TM aufbereitet"):
+        import_tm.import_tm_sheet(file_path)
+
+def test_import_fam_with_usecols_skips_other_columns(tmp_path):
+
+    file_path = tmp_path / "fam.xlsx"
+    _write_fam_workbook(file_path, 3)
+
+    result_df = import_fam.import_fam_sheet(file_path, usecols=["pzn", "avk"], schema=None)
+
+    assert result_df.columns.tolist() == ["pzn", "avk"]
+    pd.testing.assert_frame_equal(
+        result_df,
+        pd.read_excel(file_path, sheet_name=import_fam.SHEET_NAME, decimal=',', usecols=["pzn", "avk"])
+    )
+
+def test_import_fam_with_usecols_keeps_rows_with_values_in_other_columns(tmp_path):
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "pzn", "avk"])
+    worksheet.append(["AOK", 1234567, 3])
+    worksheet.append(["TK", None, None])
+    worksheet.append([None, None, 5])
+    file_path = tmp_path / "fam.xlsx"
+    workbook.save(file_path)
+
+    for usecols in (["kasse"], ["pzn"], ["avk"]):
+        result_df = import_fam.import_fam_sheet(file_path, usecols=usecols, schema=None)
+
+        # Trailing rows with values only in skipped columns come back as all-NaN rows.
+        assert len(result_df) == 3
+        pd.testing.assert_frame_equal(
+            result_df,
+            pd.read_excel(file_path, sheet_name=import_fam.SHEET_NAME, decimal=',', usecols=usecols)
+        )
+
+def test_import_fam_with_header_mapping_reports_missing_headers(tmp_path):
+
+    file_path = tmp_path / "fam.xlsx"
+    _write_fam_workbook(file_path, 3)
+
+    with pytest.raises(ValueError, match="patnr") as error:
+        import_fam.import_fam_sheet(file_path, usecols=FAM_HEADER_MAPPING)
+
+    assert "kasse" not in str(error.value)
+
+def test_import_fam_schema_keeps_ids_as_text_and_prices_numeric(tmp_path):
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["pzn", "arzt-plz", "avk", "anzahl"])
+    worksheet.append(["01234567", 1067, "10,50", 2])
+    worksheet.append([7654321, "01067", 3.2, None])
+    file_path = tmp_path / "fam.xlsx"
+    workbook.save(file_path)
+
+    result_df = import_fam.import_fam_sheet(file_path)
+
+    assert result_df['pzn'].tolist() == ["01234567", "7654321"]
+    assert result_df['arzt-plz'].tolist() == ["1067", "01067"]
+    assert result_df['avk'].tolist() == [10.5, 3.2]
+    assert pd.api.types.is_numeric_dtype(result_df['anzahl'])
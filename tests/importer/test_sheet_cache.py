@@ -0,0 +1,76 @@
+import os
+import openpyxl
+import pandas as pd
+import pytest
+from app.importer import import_fam, sheet_cache
+from app.importer.sheet_cache import SheetCache, file_content_hash
+
+@pytest.fixture
+def fam_file(tmp_path):
+    """Writes a small workbook with a FAM sheet."""
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "pzn", "avk", "apo-name"])
+    worksheet.append(["AOK", 1234567, "10,50", "Adler Apotheke"])
+    worksheet.append(["TK", 7654321, "3,20", None])
+
+    file_path = tmp_path / "fam.xlsx"
+    workbook.save(file_path)
+    return file_path
+
+def test_cached_import_matches_parsed_import(fam_file, tmp_path):
+
+    cache = SheetCache(tmp_path / "cache")
+
+    first_df = import_fam.import_fam_sheet(fam_file, cache=cache, schema=None)
+    cached_df = cache.load(file_content_hash(fam_file), import_fam.SHEET_NAME)
+
+    assert cached_df is not None
+    pd.testing.assert_frame_equal(cached_df, first_df)
+    pd.testing.assert_frame_equal(import_fam.import_fam_sheet(fam_file, cache=cache, schema=None), first_df)
+
+def test_cache_keeps_categorical_columns(fam_file, tmp_path):
+
+    cache = SheetCache(tmp_path / "cache")
+    categorical_columns = ["kasse", "apo-name"]
+
+    first_df = import_fam.import_fam_sheet(fam_file, cache=cache, categorical_columns=categorical_columns)
+    cached_df = import_fam.import_fam_sheet(fam_file, cache=cache, categorical_columns=categorical_columns)
+
+    assert isinstance(cached_df["kasse"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(cached_df, first_df)
+    assert import_fam.import_fam_sheet(fam_file, cache=cache)["kasse"].dtype == object
+
+def test_cache_does_not_store_mixed_type_columns(tmp_path):
+
+    cache = SheetCache(tmp_path / "cache")
+    mixed_df = pd.DataFrame({'pzn': [1234567, 'unbekannt']})
+
+    assert cache.store("hash", "sheet", mixed_df) is False
+    assert cache.load("hash", "sheet") is None
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+
+    cache = SheetCache(tmp_path / "cache")
+    sheet_df = pd.DataFrame({'value': range(1000)})
+
+    cache.store("old", "sheet", sheet_df)
+    cache.store("new", "sheet", sheet_df)
+    old_entry = cache._entry_path("old", "sheet")
+    os.utime(old_entry, (0, 0))
+
+    cache.max_bytes = old_entry.stat().st_size
+    cache.evict()
+
+    assert cache.load("old", "sheet") is None
+    assert cache.load("new", "sheet") is not None
+
+def test_cache_misses_entries_of_another_version(tmp_path, monkeypatch):
+
+    cache = SheetCache(tmp_path / "cache")
+    cache.store("hash", "sheet", pd.DataFrame({'value': [1, 2]}))
+
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_VERSION", sheet_cache.SHEET_CACHE_VERSION + 1)
+
+    assert cache.load("hash", "sheet") is None
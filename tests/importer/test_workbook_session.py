@@ -0,0 +1,210 @@
+import io
+import logging
+import os
+import re
+import zipfile
+import openpyxl
+import pandas as pd
+import pytest
+from app.importer import import_fam
+from app.importer import import_tm
+from app.importer.workbook_session import WorkbookSession
+
+@pytest.fixture
+def delivery_file(tmp_path):
+    """Writes a small delivery workbook with a FAM and a TM sheet."""
+    workbook = openpyxl.Workbook()
+    fam_sheet = workbook.active
+    fam_sheet.title = import_fam.SHEET_NAME
+    fam_sheet.append(["kasse", "pzn", "avk"])
+    fam_sheet.append(["AOK", 1234567, "10,50"])
+    fam_sheet.append(["TK", 7654321, "3,20"])
+
+    tm_sheet = workbook.create_sheet(import_tm.SHEET_NAME)
+    tm_sheet.append(["VO-ID", "PZN", "Teilmengenpreis"])
+    tm_sheet.append([111, 1234567, 1.5])
+
+    file_path = tmp_path / "delivery.xlsx"
+    workbook.save(file_path)
+    return file_path
+
+def test_session_reads_both_sheets_like_read_excel(delivery_file):
+
+    with WorkbookSession(delivery_file) as session:
+        fam_df = session.read_sheet(import_fam.SHEET_NAME)
+        tm_df = session.read_sheet(import_tm.SHEET_NAME)
+
+    pd.testing.assert_frame_equal(fam_df, pd.read_excel(delivery_file, sheet_name=import_fam.SHEET_NAME, decimal=','))
+    pd.testing.assert_frame_equal(tm_df, pd.read_excel(delivery_file, sheet_name=import_tm.SHEET_NAME, decimal=','))
+
+def test_session_read_sheets_matches_single_reads(delivery_file):
+
+    sheet_names = [import_fam.SHEET_NAME, import_tm.SHEET_NAME]
+
+    with WorkbookSession(delivery_file) as session:
+        frames = session.read_sheets(sheet_names)
+        single_frames = {sheet_name: session.read_sheet(sheet_name) for sheet_name in sheet_names}
+
+    assert list(frames) == sheet_names
+    for sheet_name in sheet_names:
+        pd.testing.assert_frame_equal(frames[sheet_name], single_frames[sheet_name])
+
+def test_session_raises_for_missing_sheet(delivery_file):
+
+    with WorkbookSession(delivery_file) as session:
+        with pytest.raises(ValueError, match="Unbekannt"):
+            session.read_sheets([import_fam.SHEET_NAME, "Unbekannt"])
+
+def _open_handles(file_path) -> int:
+    """Counts this process's open file descriptors on file_path."""
+    fd_dir = "/proc/self/fd"
+    return sum(os.path.realpath(os.path.join(fd_dir, fd)) == str(file_path.resolve()) for fd in os.listdir(fd_dir))
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to count open files")
+def test_session_closes_both_handles_after_an_error(delivery_file):
+
+    with pytest.raises(RuntimeError):
+        with WorkbookSession(delivery_file) as session:
+            session.read_sheet(import_fam.SHEET_NAME)
+            assert _open_handles(delivery_file) == 2
+            raise RuntimeError("import failed")
+
+    assert _open_handles(delivery_file) == 0
+
+def test_session_skips_formatted_empty_rows_and_columns(tmp_path):
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "pzn"])
+    worksheet.append(["AOK", 1234567])
+    for row_nr in range(1, 501):
+        worksheet.cell(row=row_nr, column=12).font = openpyxl.styles.Font(bold=True)
+
+    file_path = tmp_path / "phantom.xlsx"
+    workbook.save(file_path)
+
+    with WorkbookSession(file_path) as session:
+        used_range = session.used_range(import_fam.SHEET_NAME)
+        fam_df = session.read_sheet(import_fam.SHEET_NAME)
+
+    assert (used_range.max_row, used_range.max_column) == (2, 2)
+    assert (used_range.skipped_rows, used_range.skipped_columns) == (498, 10)
+    pd.testing.assert_frame_equal(fam_df, pd.read_excel(file_path, sheet_name=import_fam.SHEET_NAME, decimal=','))
+
+def test_session_skips_self_closing_phantom_rows(tmp_path, monkeypatch, caplog):
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "pzn"])
+    worksheet.append(["AOK", 1234567])
+    workbook.save(tmp_path / "plain.xlsx")
+
+    # Rows that only carry a style, written the way Excel does: self-closing, without cells.
+    phantom_rows = "".join(f'<row r="{row_nr}" s="3" customFormat="1"/>' for row_nr in range(3, 3003))
+    file_path = tmp_path / "phantom.xlsx"
+    with zipfile.ZipFile(tmp_path / "plain.xlsx") as source, zipfile.ZipFile(file_path, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = data.replace(b"</sheetData>", phantom_rows.encode() + b"</sheetData>")
+            target.writestr(item, data)
+
+    # Small scan blocks, so rows are cut across many of them.
+    monkeypatch.setattr(import_fam.sheet_reader, "SCAN_BLOCK_SIZE", 1000)
+
+    with caplog.at_level(logging.INFO, logger="app.importer.workbook_session"):
+        with WorkbookSession(file_path) as session:
+            used_range = session.used_range(import_fam.SHEET_NAME)
+            fam_df = session.read_sheet(import_fam.SHEET_NAME)
+
+    assert used_range == (2, 2, 3000, 0)
+    assert caplog.messages == [f"Sheet '{import_fam.SHEET_NAME}': skipped 3000 empty rows and 0 empty columns."]
+    pd.testing.assert_frame_equal(fam_df, pd.read_excel(file_path, sheet_name=import_fam.SHEET_NAME, decimal=','))
+
+def test_used_range_scan_ends_on_empty_and_unmarked_sheet_xml(monkeypatch):
+
+    monkeypatch.setattr(import_fam.sheet_reader, "SCAN_BLOCK_SIZE", 100)
+    monkeypatch.setattr(import_fam.sheet_reader, "SCAN_WINDOW_LIMIT", 1000)
+    # Rows without attributes never give the scan a row start to cut at.
+    unmarked_rows = b"<sheetData>" + b'<row><c r="A1"><v>1</v></c></row>' * 100 + b"</sheetData>"
+
+    assert import_fam.sheet_reader.detect_used_range(io.BytesIO(b"")) == (0, 0, 0, 0)
+    assert import_fam.sheet_reader.detect_used_range(io.BytesIO(unmarked_rows)) is None
+
+def test_session_reads_categorical_columns_from_shared_strings(tmp_path):
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "apo-ort", "pzn"])
+    worksheet.append(["AOK", "Berlin", "0123456"])
+    worksheet.append(["TK", "NA", 1234567])
+    worksheet.append([None, "Berlin", None])
+    worksheet.append(["AOK", 10115, "0123456"])
+
+    file_path = tmp_path / "categorical.xlsx"
+    workbook.save(file_path)
+
+    schema = {"pzn": import_fam.sheet_reader.TEXT}
+    with WorkbookSession(file_path) as session:
+        plain_df = session.read_sheet(import_fam.SHEET_NAME, schema=schema)
+        categorical_df = session.read_sheet(
+            import_fam.SHEET_NAME, schema=schema, categorical_columns=["kasse", "apo-ort", "pzn", "rolle"]
+        )
+        chunks = list(session.iter_sheet_chunks(import_fam.SHEET_NAME, chunk_size=2, categorical_columns=["kasse"]))
+
+    for column in ["kasse", "apo-ort", "pzn"]:
+        assert isinstance(categorical_df[column].dtype, pd.CategoricalDtype)
+        pd.testing.assert_series_equal(categorical_df[column].astype(object), plain_df[column], check_dtype=False)
+
+    assert sorted(categorical_df["pzn"].cat.categories) == ["0123456", "1234567"]
+    assert [chunk["kasse"].cat.categories.tolist() for chunk in chunks] == [["AOK", "TK"], ["AOK"]]
+
+def _store_text_as_shared_strings(file_path, shared_strings):
+    """Rewrites the inline text cells openpyxl writes into references to a shared-strings table, like Excel saves them."""
+    with zipfile.ZipFile(file_path) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+
+    def shared_string_cell(match):
+        return f't="s"><v>{shared_strings.index(match.group(1))}</v>'
+
+    sheet_xml = members["xl/worksheets/sheet1.xml"].decode("utf-8")
+    members["xl/worksheets/sheet1.xml"] = re.sub(r't="inlineStr"><is><t>(.*?)</t></is>', shared_string_cell, sheet_xml)
+    members["xl/sharedStrings.xml"] = (
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        + "".join(f"<si><t>{text}</t></si>" for text in shared_strings)
+        + "</sst>"
+    )
+    members["[Content_Types].xml"] = members["[Content_Types].xml"].decode("utf-8").replace(
+        "</Types>",
+        '<Override PartName="/xl/sharedStrings.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>'
+    )
+
+    with zipfile.ZipFile(file_path, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+def test_session_numbers_categories_by_shared_strings_table(tmp_path):
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = import_fam.SHEET_NAME
+    worksheet.append(["kasse", "pzn"])
+    worksheet.append(["AOK", 1234567])
+    worksheet.append(["TK", 7654321])
+    worksheet.append(["AOK", None])
+
+    file_path = tmp_path / "shared_strings.xlsx"
+    workbook.save(file_path)
+    _store_text_as_shared_strings(file_path, ["TK", "kasse", "pzn", "AOK"])
+
+    with WorkbookSession(file_path) as session:
+        shared_strings = session.shared_strings
+        kasse = session.read_sheet(import_fam.SHEET_NAME, categorical_columns=["kasse"])["kasse"]
+
+    assert shared_strings == ["TK", "kasse", "pzn", "AOK"]
+    assert kasse.cat.categories.tolist() == ["TK", "AOK"]
+    assert kasse.astype(object).tolist() == ["AOK", "TK", "AOK"]
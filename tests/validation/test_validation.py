@@ -1,6 +1,8 @@
 import pandas as pd
+import numpy as np
 import pytest
-from app.core.utils import process_charges_and_positions, add_validation_column, update_medicine_name_for_specific_pzn
+from app.core.utils import process_charges_and_positions, add_validation_column, update_medicine_name_for_specific_pzn, apply_on_uniques
+from app.core.utils import KeywordStripper, remove_keywords_from_column
 
 def test_charge_position_with_real_data_scenario():
     """
@@ -72,6 +74,24 @@ def test_charge_position_with_three_batches():
 
     assert result_df['position'].tolist() == [1, 2, 1, 2, 1, 2]
 
+def test_charge_position_with_interleaved_vo_ids():
+    """
+    Test 5: Rows of several vo_ids are mixed, one vo_id is missing.
+    Each vo_id is numbered on its own and the result is sorted by vo_id.
+    """
+
+    input_data = {
+        'vo_id': ['V6', 'V5', 'V6', None, 'V5', 'V6', 'V5', 'V6'],
+        'pzn':   ['A', 'C', 'B', 'A', 'D', 'A', 'C', 'B']
+    }
+    input_df = pd.DataFrame(input_data)
+
+    result_df = process_charges_and_positions(input_df)
+
+    assert result_df.index.tolist() == [1, 4, 6, 0, 2, 5, 7]
+    assert result_df['charge_nr'].tolist() == [1, 1, 2, 1, 1, 2, 2]
+    assert result_df['position'].tolist() == [1, 2, 1, 1, 2, 1, 2]
+
 def test_update_medicine_name_for_specific_pzn():
     """Tests the normal case where a matching PZN is found and updated."""
 
@@ -111,3 +131,39 @@ def test_add_validation_column_scenarios():
     assert result_df.loc[4, 'valid'] == False
     assert result_df.loc[5, 'valid'] == False
     assert result_df.loc[6, 'valid'] == False
+
+def test_apply_on_uniques_matches_series_apply():
+    """
+    Tests that apply_on_uniques gives the result of Series.apply and keeps 1, 1.0 and True apart.
+    """
+    column = pd.Series([1, 1.0, True, "1", None, 1, "1", None], index=list("abcdefgh"), name="mixed", dtype=object)
+
+    result = apply_on_uniques(column, str)
+
+    pd.testing.assert_series_equal(result, column.apply(str))
+    assert result.tolist() == ["1", "1.0", "True", "1", "None", "1", "1", "None"]
+
+    numbers = pd.Series([3, 1, 3, None, 2], name="amount")
+    pd.testing.assert_series_equal(apply_on_uniques(numbers, lambda x: x * 2), numbers.apply(lambda x: x * 2))
+
+def test_apply_on_uniques_keeps_missing_values_apart():
+    """
+    Tests that None, NaN, <NA> and NaT each get their own result, as with Series.apply.
+    """
+    column = pd.Series(["a", None, np.nan, pd.NA, pd.NaT, None, "a"], dtype=object)
+
+    result = apply_on_uniques(column, str)
+
+    pd.testing.assert_series_equal(result, column.apply(str))
+    assert result.tolist() == ["a", "None", "nan", "<NA>", "NaT", "None", "a"]
+
+def test_keyword_stripper_prefers_longest_keyword():
+    """
+    Tests that the longest keyword at a position is removed, whatever the list order and case.
+    """
+    stripper = KeywordStripper(["#", "e. K", "#NV", "e. Kfm", "OHG", "oHG", "Inh."])
+
+    column = pd.Series(["#NV", "Apotheke am Markt e. Kfm", "Stern Apotheke OHG, Inh. Muster", "12345", None, "#nv"])
+
+    assert stripper.strip_column(column).tolist() == ["", "Apotheke am Markt", "Stern Apotheke , Muster", None, None, ""]
+    pd.testing.assert_series_equal(remove_keywords_from_column(column, stripper.keywords), stripper.strip_column(column))
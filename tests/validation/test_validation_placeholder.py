@@ -55,3 +55,20 @@ def test_placeholder_with_real_data_scenario_placeholder_in_names():
     expected_df = pd.DataFrame(expected_data)
 
     pd.testing.assert_frame_equal(result_df, expected_df)
+
+def test_placeholder_in_categorical_column():
+    """
+    test to check if placeholders are removed from categorical columns without losing the categorical dtype
+    """
+    input_df = pd.DataFrame({
+        'Kasse': pd.Categorical(['AOK', ' AOK', '?', None, 'TK ', 'NULL']),
+        'Status': ['Aktiv', 'Inaktiv', 'Aktiv', 'Aktiv', '?', '']
+    })
+
+    result_df = check_placeholder_or_incorrect_input_characters(input_df)
+
+    assert list(result_df.columns) == ['Kasse', 'Status']
+    assert isinstance(result_df['Kasse'].dtype, pd.CategoricalDtype)
+    assert list(result_df['Kasse'].cat.categories) == ['AOK', 'TK']
+    assert result_df['Kasse'].astype(object).where(result_df['Kasse'].notna(), None).tolist() == ['AOK', 'AOK', None, None, 'TK', None]
+    assert result_df['Status'].tolist() == ['Aktiv', 'Inaktiv', 'Aktiv', 'Aktiv', None, None]